@@ -0,0 +1,42 @@
+"""add file blobs
+
+Revision ID: b81d5e3c0a27
+Revises: 4c7e2a91d3f0
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d5e3c0a27'
+down_revision: Union[str, None] = '4c7e2a91d3f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('file_blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('uploads', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_seen_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+    op.add_column('cvs', sa.Column('blob_sha256', sa.String(length=64), nullable=True))
+    op.create_foreign_key('fk_cvs_blob_sha256', 'cvs', 'file_blobs', ['blob_sha256'], ['sha256'])
+    op.add_column('import_jobs', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('import_jobs', 'content_sha256')
+    op.drop_constraint('fk_cvs_blob_sha256', 'cvs', type_='foreignkey')
+    op.drop_column('cvs', 'blob_sha256')
+    op.drop_table('file_blobs')
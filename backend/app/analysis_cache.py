@@ -0,0 +1,157 @@
+"""
+Cache des analyses NLP adressé par contenu.
+
+La clé est l'empreinte SHA-256 du texte normalisé et de la version de
+l'analyseur : un CV inchangé n'est jamais réanalysé, et changer
+ANALYZER_VERSION invalide toutes les entrées existantes.
+
+Deux niveaux :
+- un cache LRU en mémoire, borné en nombre d'entrées ;
+- un niveau persistant sur la ligne CV (colonnes skills et evaluation).
+"""
+import hashlib
+import json
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.config import settings
+from app import models
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise le texte avant hachage et analyse (Unicode NFC, fins de ligne, espaces en bordure).
+    """
+    text = unicodedata.normalize("NFC", text)
+    return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def make_key(text: str, version: Optional[str] = None) -> str:
+    """
+    Clé de cache : SHA-256 de la version de l'analyseur et du texte normalisé.
+    """
+    version = version or settings.ANALYZER_VERSION
+    digest = hashlib.sha256()
+    digest.update(version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """
+    Cache LRU thread-safe borné en nombre d'entrées.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.stats = Counter()
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                self.stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats["hits"] += 1
+            return self._data[key]
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.stats["hits"],
+                "misses": self.stats["misses"],
+                "evictions": self.stats["evictions"],
+            }
+
+
+cache = LRUCache(settings.ANALYSIS_CACHE_SIZE)
+
+# Origine des résultats servis : mémoire, base de données ou calcul
+sources = Counter()
+
+
+def load_from_cv(cv: models.CV, key: str) -> Optional[Dict[str, Any]]:
+    """
+    Retourne l'analyse enregistrée sur la ligne CV si elle correspond à la clé.
+    """
+    if not cv.evaluation:
+        return None
+    try:
+        stored = json.loads(cv.evaluation)
+    except ValueError:
+        return None
+    if not isinstance(stored, dict) or stored.get("cache_key") != key:
+        return None
+    return stored.get("analysis")
+
+
+def store_on_cv(cv: models.CV, key: str, analysis: Dict[str, Any]) -> None:
+    """
+    Écrit l'analyse sur la ligne CV (la validation de la transaction reste à l'appelant).
+    """
+    cv.skills = json.dumps(analysis.get("skills", []), ensure_ascii=False)
+    cv.evaluation = json.dumps({
+        "score": analysis.get("evaluation", {}).get("score"),
+        "cache_key": key,
+        "analyzer_version": settings.ANALYZER_VERSION,
+        "analysis": analysis,
+    }, ensure_ascii=False)
+
+
+async def get_analysis(
+    text: str,
+    compute: Callable[[str], Awaitable[Dict[str, Any]]],
+    cv: Optional[models.CV] = None,
+) -> Dict[str, Any]:
+    """
+    Retourne l'analyse du texte depuis le cache mémoire, puis la ligne CV, et ne
+    la calcule (via compute) qu'en dernier recours. Si une ligne CV est fournie,
+    elle est mise à jour lorsqu'elle ne contient pas encore ce résultat.
+    """
+    key = make_key(text)
+    analysis = cache.get(key)
+    stored = load_from_cv(cv, key) if cv is not None else None
+    if analysis is not None:
+        sources["memory"] += 1
+    elif stored is not None:
+        analysis = stored
+        cache.put(key, analysis)
+        sources["database"] += 1
+    else:
+        analysis = await compute(normalize_text(text))
+        cache.put(key, analysis)
+        sources["computed"] += 1
+
+    if cv is not None and stored is None:
+        store_on_cv(cv, key, analysis)
+    return analysis
+
+
+def metrics() -> Dict[str, Any]:
+    return {
+        "analyzer_version": settings.ANALYZER_VERSION,
+        "memory": cache.metrics(),
+        "sources": dict(sources),
+    }
@@ -0,0 +1,299 @@
+"""
+Import en masse de CV depuis une archive ZIP.
+
+L'archive reçue reste sur disque : seul son répertoire central est lu par le
+processus de l'application. Chaque fichier PDF/DOCX de l'archive est extrait
+par un pool de processus (un fichier par tâche, le worker ouvre l'archive par
+son chemin) ; au plus quelques tâches par worker sont en cours, la mémoire
+utilisée ne dépend donc pas de la taille de l'archive. Les CV sont créés par
+lots (une transaction par lot) et le résultat est détaillé fichier par
+fichier. Chaque fichier est relié à son blob (empreinte SHA-256, voir
+file_blobs) : l'empreinte est calculée avant l'extraction, un contenu déjà
+importé (ou déjà présent plus haut dans l'archive) n'est pas extrait à
+nouveau, son texte est repris du blob.
+
+Les CV importés ne sont pas analysés : l'analyse est faite (et mise en cache)
+à la première demande, comme pour un CV créé par POST /cv/.
+"""
+import asyncio
+import io
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app import docx_extract, file_blobs, models
+from app.config import settings
+from app.pdf_extract import PDFExtractor
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+UNSUPPORTED = "Format de fichier non supporté"
+
+# Archive ouverte par le processus courant (worker du pool) : son répertoire
+# central n'est lu qu'une fois pour tous les fichiers qu'il en extrait
+_archive: Optional[Tuple[str, zipfile.ZipFile]] = None
+_archive_lock = threading.Lock()
+
+
+class BulkImportError(Exception):
+    """
+    Archive illisible (fichier qui n'est pas un ZIP valide).
+    """
+
+
+def _open_archive(path: str) -> zipfile.ZipFile:
+    global _archive
+    if _archive is None or _archive[0] != path:
+        if _archive is not None:
+            _archive[1].close()
+        _archive = (path, zipfile.ZipFile(path))
+    return _archive[1]
+
+
+class Member(NamedTuple):
+    sha256: str
+    size: int
+    text: str
+    # False : texte repris d'un blob existant, sans extraction
+    extracted: bool = True
+
+
+def _read_member(path: str, name: str, max_bytes: int) -> bytes:
+    with _archive_lock:
+        archive = _open_archive(path)
+        info = archive.getinfo(name)
+        if max_bytes and info.file_size > max_bytes:
+            raise ValueError(f"Fichier trop volumineux ({info.file_size} octets)")
+        # Lecture bornée par la taille déclarée du fichier
+        return archive.read(info)
+
+
+def hash_member(path: str, name: str, max_bytes: int) -> Tuple[str, int]:
+    """
+    Empreinte et taille d'un fichier de l'archive (exécutée dans les processus du pool).
+    """
+    data = _read_member(path, name, max_bytes)
+    return file_blobs.hash_bytes(data), len(data)
+
+
+def extract_member(path: str, name: str, max_bytes: int) -> str:
+    """
+    Texte d'un fichier PDF ou DOCX de l'archive (exécutée dans les processus du pool).
+    """
+    content = io.BytesIO(_read_member(path, name, max_bytes))
+    if name.lower().endswith(".pdf"):
+        # Déjà dans un processus du pool : extraction séquentielle
+        return PDFExtractor(backend=settings.PDF_BACKEND, max_pages=settings.PDF_MAX_PAGES).extract(content)
+    return docx_extract.extract(content)
+
+
+def _is_ignored(name: str) -> bool:
+    # Dossiers et métadonnées ajoutées par macOS
+    base = os.path.basename(name)
+    return name.endswith("/") or name.startswith("__MACOSX/") or base.startswith(".") or not base
+
+
+class BulkImporter:
+    """
+    Pool d'extraction des fichiers d'archives et création des CV par lots.
+
+    workers > 0 : pool de processus ; workers = 0 : un seul thread dans le
+    processus courant (utile en développement et dans les tests).
+    """
+
+    def __init__(self, workers: int = 0, batch_size: int = 100, max_member_bytes: int = 0):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_member_bytes = max_member_bytes
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def window(self) -> int:
+        # Tâches en cours au plus : de quoi occuper chaque worker sans lire l'archive d'avance
+        return max(self.workers, 1) * 4
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk-import")
+            return self._executor
+
+    async def _member(self, loop: asyncio.AbstractEventLoop, executor: Executor, path: str, name: str,
+                      texts: Dict[str, "asyncio.Future[str]"],
+                      known: Optional[Callable[[str], Awaitable[Optional[str]]]]) -> Member:
+        sha256, size = await loop.run_in_executor(executor, hash_member, path, name, self.max_member_bytes)
+        if sha256 in texts:
+            # Même contenu plus haut dans l'archive : une seule extraction
+            return Member(sha256, size, await asyncio.shield(texts[sha256]), extracted=False)
+        texts[sha256] = loop.create_future()
+        try:
+            text = await known(sha256) if known is not None else None
+            extracted = text is None
+            if extracted:
+                text = await loop.run_in_executor(executor, extract_member, path, name, self.max_member_bytes)
+        except Exception as e:
+            # Les doublons de ce contenu sont en erreur de la même façon
+            texts[sha256].set_exception(e)
+            raise
+        except BaseException:
+            texts[sha256].cancel()
+            raise
+        texts[sha256].set_result(text)
+        return Member(sha256, size, text, extracted)
+
+    async def extract_archive(self, path: str, known: Optional[Callable[[str], Awaitable[Optional[str]]]] = None,
+                              ) -> AsyncIterator[Tuple[str, Optional[Member], Optional[str]]]:
+        """
+        (nom, fichier extrait, erreur) pour chaque fichier de l'archive, dans
+        l'ordre de l'archive ; le fichier extrait vaut None en cas d'erreur ou
+        pour un format non supporté. known(sha256) donne le texte d'un contenu
+        déjà importé (None sinon) : seuls les contenus inconnus sont extraits.
+        """
+        try:
+            with zipfile.ZipFile(path) as archive:
+                names = [info.filename for info in archive.infolist() if not _is_ignored(info.filename)]
+        except zipfile.BadZipFile as e:
+            raise BulkImportError(str(e)) from None
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        pending: List[Tuple[str, Optional[asyncio.Future]]] = []
+        texts: Dict[str, asyncio.Future] = {}
+        members = iter(names)
+        try:
+            while True:
+                while len(pending) < self.window:
+                    name = next(members, None)
+                    if name is None:
+                        break
+                    future = None
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        future = asyncio.ensure_future(self._member(loop, executor, path, name, texts, known))
+                    pending.append((name, future))
+                if not pending:
+                    return
+                name, future = pending.pop(0)
+                if future is None:
+                    yield name, None, UNSUPPORTED
+                    continue
+                try:
+                    yield name, await future, None
+                except Exception as e:
+                    yield name, None, str(e) or type(e).__name__
+        finally:
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
+            for future in texts.values():
+                # Erreurs reprises par aucun doublon : pas d'avertissement asyncio
+                if future.done() and not future.cancelled():
+                    future.exception()
+
+    async def import_archive(self, db: Session, user_id: int, stream: BinaryIO) -> Dict[str, Any]:
+        """
+        Crée un CV par fichier PDF/DOCX de l'archive ; retourne le résultat par fichier.
+        """
+        path = getattr(stream, "name", None)
+        copied = None
+        if not isinstance(path, str) or not os.path.isfile(path):
+            # Les workers ouvrent l'archive par son chemin : copie de l'upload sur disque
+            copied = await run_in_threadpool(_save_to_disk, stream)
+            path = copied
+        # La session n'est utilisée que par ce thread (recherches des empreintes et insertions)
+        session_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk-import-db")
+        loop = asyncio.get_running_loop()
+
+        async def known(sha256: str) -> Optional[str]:
+            blob = await loop.run_in_executor(session_thread, file_blobs.find, db, sha256)
+            return blob.text if blob is not None else None
+
+        try:
+            files: List[Dict[str, Any]] = []
+            batch: List[Tuple[Dict[str, Any], Member]] = []
+            async for name, member, error in self.extract_archive(path, known):
+                result = {"filename": name, "status": "failed", "cv_id": None, "error": error}
+                files.append(result)
+                if member is None:
+                    if error == UNSUPPORTED:
+                        result["status"] = "skipped"
+                    continue
+                if not member.extracted:
+                    file_blobs.record_skipped_extraction()
+                if not member.text.strip():
+                    result["error"] = "Aucun texte n'a pu être extrait du fichier"
+                    continue
+                batch.append((result, member))
+                if len(batch) >= self.batch_size:
+                    await loop.run_in_executor(session_thread, self._insert, db, user_id, batch)
+                    batch = []
+            if batch:
+                await loop.run_in_executor(session_thread, self._insert, db, user_id, batch)
+        finally:
+            session_thread.shutdown(wait=True)
+            if copied is not None:
+                os.remove(copied)
+
+        counts = {status: sum(1 for result in files if result["status"] == status)
+                  for status in ("imported", "failed", "skipped")}
+        return {"total": len(files), **counts, "files": files}
+
+    @staticmethod
+    def _insert(db: Session, user_id: int, batch: List[Tuple[Dict[str, Any], Member]]) -> None:
+        """
+        Une transaction pour le lot (CV et blobs des fichiers) ; en cas
+        d'échec, tous les fichiers du lot sont en erreur.
+        """
+        rows, duplicates = [], []
+        try:
+            for _, member in batch:
+                duplicates.append(file_blobs.find(db, member.sha256) is not None)
+                blob = file_blobs.link(db, member.sha256, member.size, member.text)
+                cv = models.CV(user_id=user_id, data=member.text, blob_sha256=member.sha256)
+                db.add(cv)
+                rows.append((cv, blob))
+            db.flush()
+            ids = [cv.id for cv, _ in rows]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            for result, _ in batch:
+                result["error"] = f"Enregistrement impossible: {str(e)}"
+            return
+        for (result, member), cv_id, duplicate in zip(batch, ids, duplicates):
+            result.update(status="imported", cv_id=cv_id)
+            file_blobs.record_upload(member.size, duplicate)
+        # Les textes ne sont plus utiles : la session ne garde pas le lot en mémoire
+        for cv, blob in rows:
+            db.expunge(cv)
+            if blob in db:
+                db.expunge(blob)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _save_to_disk(stream: BinaryIO) -> str:
+    with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as copy:
+        stream.seek(0)
+        shutil.copyfileobj(stream, copy, 1024 * 1024)
+    return copy.name
+
+
+bulk_importer = BulkImporter(
+    workers=settings.BULK_IMPORT_WORKERS,
+    batch_size=settings.BULK_IMPORT_BATCH_SIZE,
+    max_member_bytes=settings.UPLOAD_MAX_BYTES,
+)
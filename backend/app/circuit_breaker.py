@@ -0,0 +1,113 @@
+"""
+Disjoncteur (circuit breaker) pour les appels à un service externe.
+
+Après un nombre d'échecs consécutifs, le disjoncteur s'ouvre : les appels sont
+refusés immédiatement (l'appelant sert sa réponse de repli sans attendre le
+réseau). Une fois le délai de récupération écoulé, il passe en semi-ouvert et
+laisse passer un nombre limité d'appels d'essai : un succès le referme, un
+échec le rouvre pour un nouveau délai.
+"""
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """
+    Levée lorsqu'un appel est refusé parce que le disjoncteur est ouvert.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(f"Circuit ouvert pour {name}")
+        self.name = name
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur thread-safe, utilisable depuis des threads comme depuis la boucle asyncio.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_time: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.half_open_max_calls = half_open_max_calls
+        self.stats = Counter()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_time:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def acquire(self) -> None:
+        """
+        Autorise un appel ou lève CircuitOpen (sans attente).
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                self.stats["allowed"] += 1
+                return
+            if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                self.stats["probes"] += 1
+                return
+            self.stats["rejected"] += 1
+        raise CircuitOpen(self.name)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.stats["successes"] += 1
+            self._failures = 0
+            if self._state != CLOSED:
+                self._state = CLOSED
+                self.stats["closed"] += 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.stats["failures"] += 1
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self.stats["opened"] += 1
+
+    def record_cancelled(self) -> None:
+        """
+        Appel abandonné sans résultat (client déconnecté) : libère la place d'essai.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "allowed": self.stats["allowed"],
+                "rejected": self.stats["rejected"],
+                "probes": self.stats["probes"],
+                "successes": self.stats["successes"],
+                "failures": self.stats["failures"],
+                "opened": self.stats["opened"],
+            }
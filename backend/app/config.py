@@ -18,6 +18,88 @@ class Settings(BaseSettings):
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     
+    # Analyse NLP par lots
+    NLP_BATCH_SIZE: int = int(os.getenv("NLP_BATCH_SIZE", "32"))
+    NLP_N_PROCESS: int = int(os.getenv("NLP_N_PROCESS", "1"))
+    NLP_MAX_N_PROCESS: int = int(os.getenv("NLP_MAX_N_PROCESS", str(os.cpu_count() or 1)))
+    NLP_BATCH_MAX_TEXTS: int = int(os.getenv("NLP_BATCH_MAX_TEXTS", "500"))
+    
+    # Nombre de phrases du résumé automatique
+    SUMMARY_SENTENCES: int = int(os.getenv("SUMMARY_SENTENCES", "3"))
+    
+    # Taxonomie des métiers (rechargée à chaud, vérification toutes les N secondes)
+    JOB_TAXONOMY_PATH: str = os.getenv("JOB_TAXONOMY_PATH", os.path.join(os.path.dirname(__file__), "data", "job_taxonomy.json"))
+    JOB_TAXONOMY_RELOAD_INTERVAL: float = float(os.getenv("JOB_TAXONOMY_RELOAD_INTERVAL", "5"))
+    
+    # Identification de la langue (profils de trigrammes, taille de l'échantillon analysé)
+    LANGUAGE_PROFILES_PATH: str = os.getenv("LANGUAGE_PROFILES_PATH", os.path.join(os.path.dirname(__file__), "data", "language_profiles.json"))
+    LANGUAGE_SAMPLE_CHARS: int = int(os.getenv("LANGUAGE_SAMPLE_CHARS", "1000"))
+    
+    # Index vectoriel des compétences (fichier .npy régénéré si la taxonomie change)
+    SKILL_INDEX_PATH: str = os.getenv("SKILL_INDEX_PATH", os.path.join(os.path.dirname(__file__), "data", "skill_index.npy"))
+    SKILL_SIMILARITY_THRESHOLD: float = float(os.getenv("SKILL_SIMILARITY_THRESHOLD", "0.6"))
+    
+    # Pool de workers NLP (par défaut un processus par cœur moins un ; 0 = un thread dans le processus de l'API)
+    NLP_POOL_WORKERS: int = int(os.getenv("NLP_POOL_WORKERS", str(max((os.cpu_count() or 2) - 1, 1))))
+    NLP_POOL_MAX_PENDING: int = int(os.getenv("NLP_POOL_MAX_PENDING", "16"))
+    NLP_POOL_RETRY_AFTER: int = int(os.getenv("NLP_POOL_RETRY_AFTER", "5"))
+    
+    # Cache des analyses NLP (incrémenter la version invalide les résultats enregistrés)
+    ANALYZER_VERSION: str = os.getenv("ANALYZER_VERSION", "5")
+    ANALYSIS_CACHE_SIZE: int = int(os.getenv("ANALYSIS_CACHE_SIZE", "1024"))
+    
+    # Cache des réponses des modèles de langage (durées en secondes)
+    LLM_CACHE_SIZE: int = int(os.getenv("LLM_CACHE_SIZE", "512"))
+    LLM_CACHE_TTL: float = float(os.getenv("LLM_CACHE_TTL", "86400"))
+    LLM_CACHE_STALE_TTL: float = float(os.getenv("LLM_CACHE_STALE_TTL", "604800"))
+    
+    # Appels aux modèles de langage : endpoint compatible TGI optionnel (sinon API
+    # Hugging Face), délai par appel en secondes et nombre d'appels simultanés
+    HF_INFERENCE_URL: str = os.getenv("HF_INFERENCE_URL", "")
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "30"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    # Disjoncteur par modèle : échecs consécutifs avant ouverture, délai avant
+    # les appels d'essai (secondes) et nombre d'appels d'essai simultanés
+    LLM_BREAKER_FAILURES: int = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+    LLM_BREAKER_RECOVERY: float = float(os.getenv("LLM_BREAKER_RECOVERY", "30"))
+    LLM_BREAKER_HALF_OPEN_CALLS: int = int(os.getenv("LLM_BREAKER_HALF_OPEN_CALLS", "1"))
+    # Regroupement des prompts vers HF_INFERENCE_URL : fenêtre en secondes (0 =
+    # désactivé, l'endpoint doit accepter une liste de prompts) et taille maximale d'un lot
+    LLM_BATCH_WINDOW: float = float(os.getenv("LLM_BATCH_WINDOW", "0"))
+    LLM_BATCH_MAX_SIZE: int = int(os.getenv("LLM_BATCH_MAX_SIZE", "8"))
+    
+    # Taille maximale d'un fichier importé (octets), refusé dès le dépassement
+    UPLOAD_MAX_BYTES: int = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+    
+    # Extraction du texte des PDF : backend ("pdfium" rapide, "pdfplumber"),
+    # nombre maximal de pages lues (0 = toutes), processus pour les gros PDF
+    # (0 = extraction dans le processus courant) et taille minimale pour les utiliser
+    PDF_BACKEND: str = os.getenv("PDF_BACKEND", "pdfium")
+    PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", "50"))
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", "2"))
+    PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+    
+    # Import asynchrone des CV : dossier des fichiers en attente, workers par
+    # processus, tentatives par job, délai avant la première nouvelle tentative
+    # (doublé à chaque échec), durée du bail d'un worker et intervalle de
+    # consultation de la file (secondes)
+    IMPORT_DIR: str = os.getenv("IMPORT_DIR", os.path.join(os.path.dirname(__file__), "data", "imports"))
+    IMPORT_WORKERS: int = int(os.getenv("IMPORT_WORKERS", "2"))
+    IMPORT_MAX_ATTEMPTS: int = int(os.getenv("IMPORT_MAX_ATTEMPTS", "3"))
+    IMPORT_RETRY_DELAY: float = float(os.getenv("IMPORT_RETRY_DELAY", "5"))
+    IMPORT_LEASE_SECONDS: float = float(os.getenv("IMPORT_LEASE_SECONDS", "300"))
+    IMPORT_POLL_INTERVAL: float = float(os.getenv("IMPORT_POLL_INTERVAL", "1"))
+    
+    # Import en masse (archive ZIP) : taille maximale de l'archive (octets),
+    # processus d'extraction (0 = un thread dans le processus courant) et
+    # nombre de CV enregistrés par transaction
+    BULK_IMPORT_MAX_BYTES: int = int(os.getenv("BULK_IMPORT_MAX_BYTES", str(1024 * 1024 * 1024)))
+    BULK_IMPORT_WORKERS: int = int(os.getenv("BULK_IMPORT_WORKERS", str(os.cpu_count() or 1)))
+    BULK_IMPORT_BATCH_SIZE: int = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "100"))
+    
+    # Niveau des journaux de l'application (logger "smartcv")
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    
     # Clés API
     HUGGINGFACE_API_KEY: str = os.getenv("HUGGINGFACE_API_KEY", "")
     
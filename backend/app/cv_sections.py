@@ -0,0 +1,221 @@
+"""
+Découpage d'un CV en sections typées en une seule passe.
+
+Un seul automate (SkillMatcher) reconnaît à la fois les titres de section et
+les mots-clés, en plusieurs langues, avec des frontières de mot ("bac" ne
+correspond plus à "backend"). Le texte est parcouru une fois, ligne par ligne,
+et les segments sont produits au fil de l'eau par un générateur : le coût est
+linéaire en la taille du texte, même pour un document de plusieurs centaines
+de pages.
+"""
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.skill_matcher import SkillMatcher
+
+EXPERIENCE = "experience"
+EDUCATION = "education"
+SKILLS = "skills"
+CONTACT = "contact"
+KINDS = [EXPERIENCE, EDUCATION, SKILLS, CONTACT]
+# Titres qui ferment la section en cours sans en ouvrir une nouvelle de type connu
+OTHER = "other"
+
+HEADING = "heading"
+SECTION = "section"
+KEYWORD = "keyword"
+
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    EXPERIENCE: [
+        "expérience", "expériences", "experience", "experiences", "expérience professionnelle",
+        "expériences professionnelles", "experience professionnelle", "parcours professionnel",
+        "work experience", "professional experience", "employment history", "employment",
+        "experiencia", "experiencia profesional", "experiencia laboral",
+        "berufserfahrung", "berufliche erfahrung", "الخبرة المهنية", "الخبرات المهنية", "الخبرة",
+    ],
+    EDUCATION: [
+        "formation", "formations", "éducation", "education", "diplômes", "diplomes", "études",
+        "etudes", "cursus", "parcours académique", "formation académique", "academic background",
+        "educación", "formación", "formación académica", "estudios",
+        "ausbildung", "bildungsweg", "studium", "التعليم", "المؤهلات العلمية", "التكوين",
+    ],
+    SKILLS: [
+        "compétences", "competences", "compétences techniques", "savoir-faire", "skills",
+        "technical skills", "competencias", "habilidades", "kenntnisse", "fähigkeiten",
+        "المهارات", "الكفاءات",
+    ],
+    CONTACT: [
+        "contact", "coordonnées", "coordonnees", "informations personnelles", "personal information",
+        "personal details", "contacto", "datos personales", "kontakt", "persönliche daten",
+        "معلومات الاتصال", "المعلومات الشخصية",
+    ],
+    OTHER: [
+        "langues", "languages", "idiomas", "sprachen", "اللغات", "centres d'intérêt", "loisirs",
+        "interests", "hobbies", "intereses", "interessen", "projets", "projects", "proyectos",
+        "projekte", "certifications", "références", "references", "profil", "profile", "summary",
+        "objectif", "objective", "perfil", "الهوايات",
+    ],
+}
+
+SECTION_KEYWORDS: Dict[str, List[str]] = {
+    EXPERIENCE: [
+        "experience", "expérience", "experiences", "expériences", "experienced", "worked at",
+        "j'ai travaillé", "experiencia", "erfahrung", "berufserfahrung", "خبرة",
+    ],
+    EDUCATION: [
+        "master", "licence", "bachelor", "doctorat", "phd", "bac", "bts", "dut", "ingénieur",
+        "mba", "máster", "licenciatura", "doctorado", "abitur", "diplom", "ماجستير", "بكالوريوس",
+        "دكتوراه",
+    ],
+    CONTACT: [
+        "email", "e-mail", "courriel", "tél", "téléphone", "telephone", "phone", "linkedin",
+        "teléfono", "correo", "telefon", "هاتف",
+    ],
+}
+
+# Un titre occupe le début de la ligne et celle-ci reste courte
+_HEADING_MAX_WORDS = 4
+_LINE_PREFIX = " \t\r-–—•*#>|"
+
+
+class Span(NamedTuple):
+    """
+    Segment typé du texte : kind (experience, education, skills, contact),
+    positions [start, end) dans le texte d'origine, texte de la ligne et origine
+    du typage (titre de section, ligne de la section ou mot-clé).
+    """
+    kind: str
+    start: int
+    end: int
+    text: str
+    source: str
+
+
+class Section(NamedTuple):
+    """
+    Section complète : du titre à la fin de sa dernière ligne.
+    """
+    kind: str
+    start: int
+    end: int
+    heading: str
+
+
+def _lowered(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Quelques caractères s'étendent en minuscules (ex. "İ") : garder les positions
+        lowered = "".join(char.lower()[:1] for char in text)
+    return lowered
+
+
+def group_sections(spans: Iterable[Span]) -> Iterator[Section]:
+    """
+    Regroupe des segments (dans l'ordre du texte) en sections : un titre et les
+    lignes qui le suivent jusqu'au titre suivant.
+    """
+    section: Optional[Section] = None
+    for span in spans:
+        if span.source == HEADING:
+            if section is not None:
+                yield section
+            section = Section(span.kind, span.start, span.end, span.text)
+        elif span.source == SECTION and section is not None:
+            section = section._replace(end=span.end)
+    if section is not None:
+        yield section
+
+
+class SectionSegmenter:
+    """
+    Automate multilingue des titres de section et des mots-clés, compilé une fois.
+    """
+
+    def __init__(self, headings: Dict[str, Iterable[str]], keywords: Dict[str, Iterable[str]]):
+        self._roles: Dict[str, List[Tuple[str, str]]] = {}
+        for role, vocabulary in ((HEADING, headings), (KEYWORD, keywords)):
+            for kind, phrases in vocabulary.items():
+                for phrase in phrases:
+                    phrase = phrase.strip().lower()
+                    if phrase:
+                        self._roles.setdefault(phrase, []).append((role, kind))
+        self.matcher = SkillMatcher(self._roles)
+
+    def iter_spans(self, text: str) -> Iterator[Span]:
+        """
+        Parcourt le texte une seule fois et produit les segments typés ligne par
+        ligne. Une ligne peut porter plusieurs types (sa section et des mots-clés),
+        dans l'ordre de KINDS ; les lignes sans type ne produisent rien.
+        """
+        lowered = _lowered(text)
+        matches = self.matcher.iter_matches(lowered)
+        pending = next(matches, None)
+        current: Optional[str] = None
+        position, length = 0, len(text)
+
+        while position < length:
+            newline = text.find("\n", position)
+            line_end = length if newline < 0 else newline
+            # Correspondances de la ligne (l'automate avance avec le découpage)
+            line_matches = []
+            while pending is not None and pending[0] < line_end:
+                line_matches.append(pending)
+                pending = next(matches, None)
+
+            start, end = self._trim(text, position, line_end)
+            if start < end:
+                heading = self._heading(lowered, start, end, line_matches)
+                keywords_from = start
+                if heading is not None:
+                    kind, keywords_from = heading
+                    current = kind if kind != OTHER else None
+                    if current is not None:
+                        yield Span(current, start, end, text[start:end], HEADING)
+                # Mots-clés hors du titre lui-même ("Formation : Master ...")
+                kinds = {kind for phrase_start, _, phrase in line_matches if phrase_start >= keywords_from
+                         for role, kind in self._roles[phrase] if role == KEYWORD}
+                for kind in KINDS:
+                    if kind == current and heading is None:
+                        yield Span(kind, start, end, text[start:end], SECTION)
+                    elif kind in kinds:
+                        yield Span(kind, start, end, text[start:end], KEYWORD)
+            position = line_end + 1
+
+    def iter_sections(self, text: str) -> Iterator[Section]:
+        """
+        Sections du texte (titre suivi de ses lignes), voir group_sections.
+        """
+        return group_sections(self.iter_spans(text))
+
+    def segment(self, text: str) -> Dict[str, List[Span]]:
+        """
+        Segments regroupés par type.
+        """
+        spans: Dict[str, List[Span]] = {kind: [] for kind in KINDS}
+        for span in self.iter_spans(text):
+            spans[span.kind].append(span)
+        return spans
+
+    def _heading(self, lowered: str, start: int, end: int, line_matches: list) -> Optional[Tuple[str, int]]:
+        """
+        Si la ligne est un titre (un titre connu au début d'une ligne courte, le
+        plus long l'emportant), retourne (type de section, fin du titre), sinon None.
+        """
+        best = None
+        for phrase_start, phrase_end, phrase in line_matches:
+            if phrase_start != start:
+                continue
+            for role, kind in self._roles[phrase]:
+                if role == HEADING and (best is None or phrase_end > best[1]):
+                    best = (kind, phrase_end)
+        if best is None or len(lowered[start:end].split()) > _HEADING_MAX_WORDS:
+            return None
+        return best
+
+    @staticmethod
+    def _trim(text: str, start: int, end: int) -> Tuple[int, int]:
+        # Espaces en bordure et puces ou marques de titre en début de ligne
+        while start < end and text[start] in _LINE_PREFIX:
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return start, end
@@ -0,0 +1,145 @@
+"""
+Extraction du texte des DOCX en flux, sans construire le modèle objet de python-docx.
+
+Les parties XML (word/document.xml, en-têtes et pieds de page) sont lues
+directement depuis l'archive ZIP par un analyseur incrémental (lxml
+iterparse) : chaque paragraphe est libéré dès que son texte est collecté, la
+mémoire utilisée ne dépend pas de la taille du document.
+
+Contrairement à doc.paragraphs, le texte comprend :
+- les tableaux : une ligne par rangée (cellules séparées par une
+  tabulation), ou colonne après colonne pour les tableaux de mise en page
+  des modèles de CV en colonnes ;
+- les zones de texte (encadrés « Compétences », barres latérales), une seule
+  fois alors que Word les enregistre en double (mc:Choice et mc:Fallback) ;
+- les en-têtes (avant le corps) et les pieds de page (après), sans répéter
+  un contenu identique d'une section à l'autre.
+"""
+import re
+import zipfile
+from typing import BinaryIO, Iterator, List, Tuple, Union
+
+from lxml import etree
+
+Source = Union[str, BinaryIO]
+
+DOCUMENT_PART = "word/document.xml"
+_HEADER_RE = re.compile(r"word/header(\d*)\.xml$")
+_FOOTER_RE = re.compile(r"word/footer(\d*)\.xml$")
+_CONTAINERS = ("p", "tr", "tc")
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+
+def _numbered_parts(names: List[str], pattern: "re.Pattern") -> List[str]:
+    parts = [(int(match.group(1) or 0), name) for name in names for match in [pattern.match(name)] if match]
+    return [name for _, name in sorted(parts)]
+
+
+def iter_part(stream: BinaryIO) -> Iterator[str]:
+    """
+    Lignes de texte d'une partie WordprocessingML (corps, en-tête ou pied de
+    page), dans l'ordre du document.
+    """
+    namespace = None
+    tags = {}
+    # Conteneurs en cours, du plus externe au plus interne : paragraphes
+    # ("p", un paragraphe de zone de texte est contenu dans celui qui l'ancre),
+    # rangées ("tr") et cellules ("tc") de tableaux, avec leurs textes
+    open_elements: List[Tuple[str, List[str]]] = []
+    skipped = 0
+
+    for event, element in etree.iterparse(stream, events=("start", "end"), remove_comments=True,
+                                          remove_pis=True, resolve_entities=False):
+        tag = element.tag
+        if namespace is None:
+            # Espace de noms de l'élément racine : WordprocessingML transitionnel ou strict
+            namespace = tag[:tag.index("}") + 1] if tag.startswith("{") else ""
+            tags = {namespace + name: name for name in ("p", "tr", "tc", "t", "tab", "br", "cr", "noBreakHyphen")}
+        if tag == _MC_FALLBACK:
+            # Copie de compatibilité d'un contenu déjà lu dans mc:Choice
+            skipped += 1 if event == "start" else -1
+            continue
+        name = tags.get(tag)
+        if skipped or name is None:
+            continue
+
+        if event == "start":
+            if name in _CONTAINERS:
+                open_elements.append((name, []))
+            continue
+
+        if name in _CONTAINERS:
+            _, parts = open_elements.pop()
+            if name == "tr":
+                # Rangée de valeurs courtes sur une ligne ; tableau de mise en page
+                # (colonnes de plusieurs paragraphes) colonne par colonne
+                text = ("\n" if any("\n" in cell for cell in parts) else "\t").join(parts)
+            else:
+                text = "\n".join(parts) if name == "tc" else "".join(parts).strip()
+            _release(element)
+            if not text:
+                continue
+            parent = open_elements[-1][0] if open_elements else None
+            if (name == "p" and parent == "tc") or (name == "tc" and parent == "tr") or (name == "tr" and parent == "tc"):
+                open_elements[-1][1].append(text)
+            elif name != "tc":
+                yield text
+        elif open_elements and open_elements[-1][0] == "p":
+            parts = open_elements[-1][1]
+            if name == "t":
+                if element.text:
+                    parts.append(element.text)
+            elif name == "tab":
+                # w:tab des propriétés du paragraphe (taquets) : pas de texte
+                if element.getparent().tag != namespace + "tabs":
+                    parts.append("\t")
+            elif name == "noBreakHyphen":
+                parts.append("-")
+            else:
+                parts.append("\n")
+
+
+def _release(element) -> None:
+    # Libère l'élément traité et ses prédécesseurs déjà lus
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def iter_lines(source: Source) -> Iterator[str]:
+    """
+    Lignes du document : en-têtes, corps puis pieds de page.
+    """
+    with zipfile.ZipFile(source) as archive:
+        names = archive.namelist()
+        if DOCUMENT_PART not in names:
+            raise ValueError("Fichier DOCX invalide : word/document.xml absent")
+        headers = _numbered_parts(names, _HEADER_RE)
+        footers = _numbered_parts(names, _FOOTER_RE)
+        seen = set()
+        for part in headers + [DOCUMENT_PART] + footers:
+            with archive.open(part) as stream:
+                if part == DOCUMENT_PART:
+                    yield from iter_part(stream)
+                    continue
+                lines = tuple(iter_part(stream))
+            # En-têtes et pieds de page identiques d'une section à l'autre : une seule fois
+            if lines and lines not in seen:
+                seen.add(lines)
+                yield from lines
+
+
+def extract(source: Source, stop_chars: int = 0) -> str:
+    """
+    Texte du DOCX (une ligne par paragraphe ou rangée de tableau) ; avec
+    stop_chars, s'arrête dès que ce nombre de caractères est atteint.
+    """
+    lines, size = [], 0
+    for line in iter_lines(source):
+        lines.append(line)
+        size += len(line) + 1
+        if stop_chars and size >= stop_chars:
+            break
+    return "\n".join(lines)
@@ -0,0 +1,121 @@
+"""
+Déduplication des fichiers importés par empreinte de contenu (SHA-256).
+
+L'empreinte est calculée pendant l'écriture du fichier reçu (une seule
+lecture de l'upload). La table file_blobs associe chaque empreinte au texte
+extrait du fichier : un fichier déjà importé n'est ni conservé sur disque ni
+extrait à nouveau, son texte est relu depuis la table et le CV créé est relié
+au blob existant.
+
+Chaque blob compte ses imports : les octets reçus en double (dont
+l'extraction est évitée) et les octets réellement conservés (textes extraits)
+sont calculés depuis la table, les extractions évitées par ce processus sont
+comptées dans stats.
+"""
+import hashlib
+from collections import Counter
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+
+CHUNK_SIZE = 1024 * 1024
+
+# Compteurs du processus : fichiers reçus, doublons, extractions évitées
+stats = Counter()
+
+
+def save_and_hash(stream: BinaryIO, path: str) -> Tuple[str, int]:
+    """
+    Copie le flux dans path en calculant son empreinte ; retourne (sha256, taille).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    stream.seek(0)
+    with open(path, "wb") as target:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            target.write(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def hash_bytes(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def find(db: Session, sha256: str) -> Optional[models.FileBlob]:
+    return db.get(models.FileBlob, sha256)
+
+
+def record_upload(size: int, duplicate: bool) -> None:
+    stats["uploads"] += 1
+    stats["bytes_received"] += size
+    if duplicate:
+        stats["duplicates"] += 1
+        stats["bytes_deduplicated"] += size
+
+
+def record_skipped_extraction() -> None:
+    stats["extractions_skipped"] += 1
+
+
+def link(db: Session, sha256: str, size: int, text: str) -> models.FileBlob:
+    """
+    Blob de ce contenu, créé avec le texte extrait s'il n'existe pas encore ;
+    sinon compte un import de plus. La validation de la transaction reste à
+    l'appelant.
+    """
+    blob = db.get(models.FileBlob, sha256)
+    if blob is None:
+        try:
+            with db.begin_nested():
+                blob = models.FileBlob(sha256=sha256, size=size, text=text, uploads=1)
+                db.add(blob)
+            stats["blobs_created"] += 1
+            return blob
+        except IntegrityError:
+            # Même fichier importé en parallèle : le blob vient d'être créé
+            blob = db.get(models.FileBlob, sha256)
+    # Incrément en SQL (imports simultanés), écrit tout de suite : un autre
+    # import du même fichier dans la transaction ajoute le sien
+    blob.uploads = models.FileBlob.uploads + 1
+    blob.last_seen_at = datetime.utcnow()
+    db.flush()
+    return blob
+
+
+def metrics(db: Session) -> Dict[str, Any]:
+    Blob = models.FileBlob
+    # Les fichiers ne sont pas conservés : seul le texte extrait est stocké
+    blobs, unique, received, stored = db.query(
+        func.count(Blob.sha256),
+        func.coalesce(func.sum(Blob.size), 0),
+        func.coalesce(func.sum(Blob.size * Blob.uploads), 0),
+        func.coalesce(func.sum(func.length(Blob.text)), 0),
+    ).one()
+    uploads = db.query(func.coalesce(func.sum(Blob.uploads), 0)).scalar()
+    return {
+        "blobs": blobs,
+        "uploads": uploads,
+        "duplicate_uploads": uploads - blobs,
+        "bytes_received": received,
+        "bytes_deduplicated": received - unique,
+        "text_bytes_stored": stored,
+        "dedup_ratio": round(1 - unique / received, 3) if received else 0.0,
+        "process": {
+            "uploads": stats["uploads"],
+            "duplicates": stats["duplicates"],
+            "extractions_skipped": stats["extractions_skipped"],
+            "blobs_created": stats["blobs_created"],
+            "bytes_received": stats["bytes_received"],
+            "bytes_deduplicated": stats["bytes_deduplicated"],
+        },
+    }
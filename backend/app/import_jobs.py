@@ -0,0 +1,354 @@
+"""
+Import asynchrone des CV (jobs enregistrés en base).
+
+POST /cv/import enregistre le fichier reçu sur disque et crée un job
+("queued") puis répond immédiatement (202). Des workers locaux, tâches de la
+boucle d'événements, prennent les jobs en attente et enchaînent extraction du
+texte, analyse NLP (pool NLP, cache d'analyses) et création du CV.
+
+- L'état des jobs est en base : un job pris par un worker arrêté en cours de
+  traitement est repris par un autre une fois son bail (lease) expiré. Le
+  worker renouvelle le bail tant qu'il traite le job, quelle qu'en soit la durée.
+- La prise d'un job est une mise à jour conditionnelle (compare-and-set) :
+  plusieurs processus peuvent faire tourner des workers sur la même base.
+- Le CV est créé dans la même transaction que le passage du job à
+  "succeeded", et seulement si le worker détient encore le bail : une
+  nouvelle tentative ne crée jamais de doublon.
+- Un fichier déjà importé (même empreinte SHA-256, voir file_blobs) n'est
+  ni conservé ni extrait à nouveau : son texte est relu depuis son blob.
+- Un échec est retenté avec un délai croissant jusqu'à max_attempts.
+- Un client peut renvoyer sa requête avec le même en-tête Idempotency-Key
+  sans créer un second job.
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import BinaryIO, Callable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import analysis_cache, file_blobs, models, nlp_utils
+from app.config import settings
+from app.database import SessionLocal
+from app.nlp_pool import PoolSaturated, pool as nlp_pool
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+
+def extract_file_text(path: str) -> str:
+    """
+    Texte d'un fichier PDF ou DOCX enregistré (appel bloquant).
+    """
+    with open(path, "rb") as stream:
+        if path.endswith(".pdf"):
+            return nlp_utils.pdf_text(stream)
+        return nlp_utils.docx_text(stream)
+
+
+async def analyze_text(text: str) -> dict:
+    return await analysis_cache.get_analysis(text, lambda normalized: nlp_pool.run("analyze_cv", normalized))
+
+
+class ImportJobQueue:
+    """
+    File des jobs d'import (en base) et workers locaux qui la vident.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], storage_dir: str, workers: int = 2,
+                 max_attempts: int = 3, retry_delay: float = 5.0, lease_seconds: float = 300.0,
+                 poll_interval: float = 1.0):
+        self.session_factory = session_factory
+        self.storage_dir = storage_dir
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+
+    # Soumission (dans la requête)
+
+    async def enqueue(self, db: Session, user_id: int, filename: str, stream: BinaryIO,
+                      idempotency_key: Optional[str] = None) -> Tuple[models.ImportJob, bool]:
+        """
+        Enregistre le fichier et crée le job ; retourne (job, créé). Avec une
+        clé d'idempotence déjà utilisée par cet utilisateur, retourne le job
+        existant sans rien enregistrer.
+        """
+        if idempotency_key:
+            existing = self._find_by_key(db, user_id, idempotency_key)
+            if existing is not None:
+                return existing, False
+
+        job_id = uuid.uuid4().hex
+        os.makedirs(self.storage_dir, exist_ok=True)
+        path = os.path.join(self.storage_dir, job_id + os.path.splitext(filename)[1].lower())
+        sha256, size = await run_in_threadpool(file_blobs.save_and_hash, stream, path)
+        # Fichier déjà importé : son texte est en base, inutile de le conserver
+        duplicate = file_blobs.find(db, sha256) is not None
+        file_blobs.record_upload(size, duplicate)
+        if duplicate:
+            await run_in_threadpool(self._remove_file, path)
+            path = None
+
+        job = models.ImportJob(id=job_id, user_id=user_id, idempotency_key=idempotency_key or None,
+                               filename=filename, file_path=path, content_sha256=sha256, status=QUEUED,
+                               attempts=0, run_after=datetime.utcnow())
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Même clé envoyée en parallèle : le premier job enregistré l'emporte
+            db.rollback()
+            if path:
+                os.remove(path)
+            return self._find_by_key(db, user_id, idempotency_key), False
+        db.refresh(job)
+        self.notify()
+        return job, True
+
+    @staticmethod
+    def _find_by_key(db: Session, user_id: int, idempotency_key: str) -> Optional[models.ImportJob]:
+        return db.query(models.ImportJob).filter(
+            models.ImportJob.user_id == user_id,
+            models.ImportJob.idempotency_key == idempotency_key,
+        ).first()
+
+    def notify(self) -> None:
+        # Réveille un worker de ce processus sans attendre le prochain tour
+        if self._wake is not None:
+            self._wake.set()
+
+    # Workers
+
+    async def start(self) -> None:
+        if self._tasks or self.workers <= 0:
+            return
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._wake = None
+
+    async def _worker(self) -> None:
+        while True:
+            claimed = await run_in_threadpool(self.claim)
+            if claimed is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.run_job(*claimed)
+
+    async def run_pending(self) -> int:
+        """
+        Traite les jobs prêts jusqu'à ce qu'il n'y en ait plus (tests, scripts) ;
+        retourne le nombre de jobs traités.
+        """
+        processed = 0
+        while True:
+            claimed = await run_in_threadpool(self.claim)
+            if claimed is None:
+                return processed
+            await self.run_job(*claimed)
+            processed += 1
+
+    def claim(self) -> Optional[Tuple[str, str]]:
+        """
+        Prend le plus ancien job prêt (en attente, ou en cours avec un bail
+        expiré) ; retourne (id du job, jeton du bail) ou None.
+        """
+        Job = models.ImportJob
+        with self.session_factory() as db:
+            for _ in range(5):
+                now = datetime.utcnow()
+                ready = or_(
+                    and_(Job.status == QUEUED, Job.run_after <= now),
+                    and_(Job.status == RUNNING, Job.lease_expires_at < now),
+                )
+                candidate = db.query(Job.id).filter(ready).order_by(Job.created_at).first()
+                if candidate is None:
+                    return None
+                token = uuid.uuid4().hex
+                taken = db.query(Job).filter(Job.id == candidate.id, ready).update({
+                    Job.status: RUNNING,
+                    Job.lease_token: token,
+                    Job.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                    Job.attempts: Job.attempts + 1,
+                    Job.updated_at: now,
+                }, synchronize_session=False)
+                db.commit()
+                if taken:
+                    return candidate.id, token
+            # Jobs pris par d'autres workers entre la lecture et la mise à jour
+            return None
+
+    async def run_job(self, job_id: str, token: str) -> None:
+        # Bail prolongé pendant tout le traitement (extraction et analyse longues)
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, token))
+        try:
+            path, text = await run_in_threadpool(self._source, job_id)
+            if text is None:
+                text = await run_in_threadpool(extract_file_text, path)
+            else:
+                file_blobs.record_skipped_extraction()
+            if not text.strip():
+                raise ValueError("Aucun texte n'a pu être extrait du fichier")
+            analysis = await analyze_text(text)
+            completed = await run_in_threadpool(self._complete, job_id, token, text, analysis)
+            if completed and path:
+                await run_in_threadpool(self._remove_file, path)
+        except asyncio.CancelledError:
+            # Arrêt du worker : le job sera repris à l'expiration du bail
+            raise
+        except PoolSaturated:
+            # Pool NLP plein : remis en file sans compter de tentative
+            await run_in_threadpool(self._requeue, job_id, token, self.retry_delay)
+        except Exception as e:
+            await run_in_threadpool(self._fail, job_id, token, str(e) or type(e).__name__)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str, token: str) -> None:
+        # Renouvelle le bail avant son expiration, tant que ce worker le détient
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await run_in_threadpool(self._renew, job_id, token):
+                return
+
+    def _renew(self, job_id: str, token: str) -> bool:
+        Job = models.ImportJob
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            renewed = db.query(Job).filter(Job.id == job_id, Job.status == RUNNING, Job.lease_token == token).update({
+                Job.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                Job.updated_at: now,
+            }, synchronize_session=False)
+            db.commit()
+            return bool(renewed)
+
+    def _source(self, job_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        (fichier reçu, texte déjà extrait d'un fichier identique ou None).
+        """
+        with self.session_factory() as db:
+            job = db.get(models.ImportJob, job_id)
+            blob = file_blobs.find(db, job.content_sha256) if job.content_sha256 else None
+            if blob is not None:
+                return job.file_path, blob.text
+            if not job.file_path:
+                raise ValueError("Fichier importé introuvable")
+            return job.file_path, None
+
+    def _complete(self, job_id: str, token: str, text: str, analysis: dict) -> bool:
+        """
+        Crée le CV et termine le job dans une seule transaction, si le bail est toujours détenu.
+        """
+        Job = models.ImportJob
+        with self.session_factory() as db:
+            job = db.get(Job, job_id)
+            if job is None or job.status != RUNNING or job.lease_token != token:
+                return False
+            cv = models.CV(user_id=job.user_id, data=text)
+            if job.content_sha256:
+                size = os.path.getsize(job.file_path) if job.file_path and os.path.exists(job.file_path) else 0
+                cv.blob_sha256 = file_blobs.link(db, job.content_sha256, size, text).sha256
+            analysis_cache.store_on_cv(cv, analysis_cache.make_key(text), analysis)
+            db.add(cv)
+            db.flush()
+            now = datetime.utcnow()
+            done = db.query(Job).filter(Job.id == job_id, Job.status == RUNNING, Job.lease_token == token).update({
+                Job.status: SUCCEEDED,
+                Job.cv_id: cv.id,
+                Job.error: None,
+                Job.lease_token: None,
+                Job.lease_expires_at: None,
+                Job.finished_at: now,
+                Job.updated_at: now,
+            }, synchronize_session=False)
+            if not done:
+                db.rollback()
+                return False
+            db.commit()
+            return True
+
+    def _requeue(self, job_id: str, token: str, delay: float) -> None:
+        Job = models.ImportJob
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            db.query(Job).filter(Job.id == job_id, Job.status == RUNNING, Job.lease_token == token).update({
+                Job.status: QUEUED,
+                Job.attempts: Job.attempts - 1,
+                Job.run_after: now + timedelta(seconds=delay),
+                Job.lease_token: None,
+                Job.lease_expires_at: None,
+                Job.updated_at: now,
+            }, synchronize_session=False)
+            db.commit()
+
+    def _fail(self, job_id: str, token: str, error: str) -> None:
+        Job = models.ImportJob
+        with self.session_factory() as db:
+            job = db.get(Job, job_id)
+            if job is None or job.status != RUNNING or job.lease_token != token:
+                return
+            now = datetime.utcnow()
+            job.error = error
+            job.lease_token = None
+            job.lease_expires_at = None
+            job.updated_at = now
+            if job.attempts >= self.max_attempts:
+                job.status = FAILED
+                job.finished_at = now
+                path = job.file_path
+            else:
+                job.status = QUEUED
+                job.run_after = now + timedelta(seconds=self.retry_delay * 2 ** (job.attempts - 1))
+                path = None
+            db.commit()
+        if path:
+            self._remove_file(path)
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, job_id: str, user_id: int) -> Optional[models.ImportJob]:
+        with self.session_factory() as db:
+            job = db.query(models.ImportJob).filter(
+                models.ImportJob.id == job_id, models.ImportJob.user_id == user_id
+            ).first()
+            if job is not None:
+                db.expunge(job)
+            return job
+
+
+import_jobs = ImportJobQueue(
+    SessionLocal,
+    settings.IMPORT_DIR,
+    workers=settings.IMPORT_WORKERS,
+    max_attempts=settings.IMPORT_MAX_ATTEMPTS,
+    retry_delay=settings.IMPORT_RETRY_DELAY,
+    lease_seconds=settings.IMPORT_LEASE_SECONDS,
+    poll_interval=settings.IMPORT_POLL_INTERVAL,
+)
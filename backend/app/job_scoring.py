@@ -0,0 +1,118 @@
+"""
+Matrice métier×compétence précalculée pour le score de pertinence des CV.
+
+Les profils métiers sont compilés une seule fois :
+- un automate (SkillMatcher) sur le vocabulaire des compétences métiers ;
+- un index inversé compétence -> identifiants des métiers qui la demandent ;
+- une matrice dense métiers×compétences (0/1).
+
+Le score d'un ou plusieurs CV pour tous les métiers est alors un produit matriciel.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.skill_matcher import SkillMatcher
+
+
+class JobSkillMatrix:
+    """
+    Profils métiers compilés ; un métier est d'autant plus pertinent qu'une
+    grande part de ses compétences se retrouve dans les compétences du CV.
+    """
+
+    def __init__(self, job_skills: Dict[str, List[str]]):
+        self.jobs: List[str] = list(job_skills)
+        self.matcher = SkillMatcher(skill for skills in job_skills.values() for skill in skills)
+        self.skills: List[str] = self.matcher.skills
+        columns = {skill: column for column, skill in enumerate(self.skills)}
+
+        self.matrix = np.zeros((len(self.jobs), len(self.skills)), dtype=np.float32)
+        for row, skills in enumerate(job_skills.values()):
+            for skill in skills:
+                if skill.strip():
+                    self.matrix[row, columns[skill.strip().lower()]] = 1.0
+        self.sizes = np.maximum(self.matrix.sum(axis=1), 1.0)
+        self._positions = {job: row for row, job in enumerate(self.jobs)}
+
+        # Index inversé : compétence -> métiers, aussi stocké au format CSR
+        # (métiers de la compétence c : _index_jobs[_index_ptr[c]:_index_ptr[c + 1]])
+        self.index: Dict[str, np.ndarray] = {
+            skill: np.flatnonzero(self.matrix[:, column]) for column, skill in enumerate(self.skills)
+        }
+        lengths = [len(self.index[skill]) for skill in self.skills]
+        self._index_ptr = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        self._index_jobs = np.concatenate([self.index[skill] for skill in self.skills] or [[]]).astype(np.int64)
+
+    def _incidence(self, skill_lists: List[List[str]]) -> tuple:
+        """
+        Matrice creuse (COO) compétences de CV × vocabulaire : une compétence de CV
+        touche une compétence métier si celle-ci y apparaît comme mot ou expression
+        entière. Retourne (lignes, colonnes, CV d'origine de chaque ligne).
+        """
+        rows, columns, owners = [], [], []
+        for cv, skills in enumerate(skill_lists):
+            for skill in skills:
+                indexes = self.matcher.find_indexes(skill)
+                rows.extend([len(owners)] * len(indexes))
+                columns.extend(indexes)
+                owners.append(cv)
+        return (np.asarray(rows, dtype=np.int64), np.asarray(columns, dtype=np.int64),
+                np.asarray(owners, dtype=np.int64))
+
+    def score_batch(self, skill_lists: List[List[str]], jobs: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Scores (0-1) de plusieurs CV pour les métiers demandés (tous par défaut).
+        Retourne une matrice CV × métiers, colonnes dans l'ordre de `jobs`.
+        """
+        rows = self._rows(jobs)
+        job_count = len(rows)
+        incidence_rows, incidence_columns, owners = self._incidence(skill_lists)
+
+        # Développer chaque entrée (compétence de CV, compétence métier) en paires
+        # (compétence de CV, métier) grâce à l'index inversé
+        starts = self._index_ptr[incidence_columns]
+        lengths = self._index_ptr[incidence_columns + 1] - starts
+        pair_rows = np.repeat(incidence_rows, lengths)
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        selected = np.full(len(self.jobs), -1, dtype=np.int64)
+        selected[rows] = np.arange(job_count)
+        pair_jobs = selected[self._index_jobs[offsets]]
+        keep = pair_jobs >= 0
+
+        # Une compétence de CV compte au plus une fois par métier
+        pairs = np.unique(pair_rows[keep] * job_count + pair_jobs[keep])
+        cells = owners[pairs // job_count] * job_count + pairs % job_count
+        counts = np.bincount(cells, minlength=len(skill_lists) * job_count).reshape(len(skill_lists), job_count)
+        return np.minimum(counts / self.sizes[rows], 1.0)
+
+    def score_many(self, skill_lists: List[List[str]], jobs: Optional[List[str]] = None) -> List[Dict[str, float]]:
+        """
+        Scores de plusieurs CV, chacun sous forme de dictionnaire trié par ordre décroissant.
+        """
+        names = self._names(jobs)
+        results = []
+        for row in np.round(self.score_batch(skill_lists, names), 2).tolist():
+            scores = dict(zip(names, row))
+            results.append(dict(sorted(scores.items(), key=lambda x: x[1], reverse=True)))
+        return results
+
+    def score(self, skills: List[str], jobs: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Scores d'un CV, triés par ordre décroissant.
+        """
+        return self.score_many([skills], jobs)[0]
+
+    def jobs_for_skill(self, skill: str) -> List[str]:
+        """
+        Métiers qui demandent cette compétence (recherche exacte, insensible à la casse).
+        """
+        return [self.jobs[row] for row in self.index.get(skill.strip().lower(), [])]
+
+    def _names(self, jobs: Optional[List[str]]) -> List[str]:
+        if jobs is None:
+            return self.jobs
+        return [job for job in jobs if job in self._positions]
+
+    def _rows(self, jobs: Optional[List[str]]) -> np.ndarray:
+        return np.asarray([self._positions[job] for job in self._names(jobs)], dtype=np.int64)
@@ -0,0 +1,123 @@
+"""
+Identification de la langue par profils de trigrammes de caractères.
+
+Les profils (trigrammes les plus fréquents de chaque langue) sont précalculés
+par scripts/build_language_profiles.py et chargés une seule fois. Ils sont
+convertis en une table de log-probabilités indexée par hachage des trigrammes :
+l'analyse d'un texte se réduit alors à quelques opérations NumPy sur un
+échantillon borné du début du texte.
+"""
+import json
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Lettres distinguées par le classifieur ; toute autre lettre est "autre lettre"
+ALPHABET = (
+    "abcdefghijklmnopqrstuvwxyz"
+    "àâäáãåæçèéêëìíîïñòóôöõøœùúûüýÿß"
+    + "".join(chr(code) for code in range(0x0621, 0x064B))
+)
+SEPARATOR = 0
+OTHER_LETTER = 1
+_ALPHABET_SIZE = len(ALPHABET) + 2
+# Codes Unicode couverts par la table de correspondance (au-delà : "autre lettre")
+_TABLE_LIMIT = 0x3000
+TABLE_SIZE = 65521
+
+
+def _build_char_table() -> np.ndarray:
+    table = np.full(_TABLE_LIMIT + 1, OTHER_LETTER, dtype=np.int64)
+    for code in range(_TABLE_LIMIT):
+        if not chr(code).isalpha():
+            table[code] = SEPARATOR
+    for position, char in enumerate(ALPHABET):
+        table[ord(char)] = position + 2
+    return table
+
+
+_CHAR_TABLE = _build_char_table()
+# Représentation lisible des identifiants dans les profils : " " séparateur, "_" autre lettre
+_DISPLAY = [" ", "_"] + list(ALPHABET)
+_DISPLAY_IDS = {char: position for position, char in enumerate(_DISPLAY)}
+
+
+def char_ids(text: str) -> np.ndarray:
+    """
+    Convertit un texte (déjà en minuscules) en identifiants de caractères, les
+    séparateurs consécutifs étant réduits à un seul et le texte encadré de séparateurs.
+    """
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    ids = _CHAR_TABLE[np.minimum(codes, _TABLE_LIMIT)]
+    ids = np.concatenate(([SEPARATOR], ids, [SEPARATOR]))
+    keep = np.ones(len(ids), dtype=bool)
+    keep[1:] = (ids[1:] != SEPARATOR) | (ids[:-1] != SEPARATOR)
+    return ids[keep]
+
+
+def trigram_buckets(ids: np.ndarray) -> np.ndarray:
+    """
+    Indices de hachage des trigrammes d'une suite d'identifiants.
+    """
+    if len(ids) < 3:
+        return np.zeros(0, dtype=np.int64)
+    trigrams = (ids[:-2] * _ALPHABET_SIZE + ids[1:-1]) * _ALPHABET_SIZE + ids[2:]
+    return trigrams % TABLE_SIZE
+
+
+def extract_trigrams(text: str) -> Iterable[str]:
+    """
+    Trigrammes lisibles d'un texte (utilisé pour construire les profils).
+    """
+    ids = char_ids(text.lower())
+    for position in range(len(ids) - 2):
+        yield "".join(_DISPLAY[i] for i in ids[position:position + 3])
+
+
+def trigram_bucket(trigram: str) -> int:
+    """
+    Indice de hachage d'un trigramme lisible (tel qu'enregistré dans les profils).
+    """
+    ids = np.asarray([_DISPLAY_IDS[char] for char in trigram], dtype=np.int64)
+    return int(trigram_buckets(ids)[0])
+
+
+class LanguageIdentifier:
+    """
+    Classifieur bayésien naïf sur les trigrammes de caractères.
+    """
+
+    def __init__(self, profiles: Dict[str, Dict[str, int]], sample_chars: int = 1000,
+                 min_trigrams: int = 8, confidence_scale: float = 20.0):
+        self.languages: List[str] = list(profiles)
+        self.sample_chars = sample_chars
+        self.min_trigrams = min_trigrams
+        self.confidence_scale = confidence_scale
+
+        counts = np.zeros((len(self.languages), TABLE_SIZE), dtype=np.float64)
+        for row, language in enumerate(self.languages):
+            for trigram, count in profiles[language].items():
+                counts[row, trigram_bucket(trigram)] += count
+        # Log-probabilités lissées (les trigrammes absents du profil reçoivent un plancher)
+        totals = counts.sum(axis=1, keepdims=True)
+        self.weights = np.log((counts + 0.5) / (totals + 0.5 * TABLE_SIZE)).astype(np.float32)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "LanguageIdentifier":
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        return cls(data["profiles"], **kwargs)
+
+    def identify(self, text: str) -> Tuple[str, float]:
+        """
+        Retourne (code de langue, confiance entre 0 et 1) ; "unknown" si le texte est trop court.
+        """
+        buckets = trigram_buckets(char_ids(text[:self.sample_chars].lower()))
+        if len(buckets) < self.min_trigrams:
+            return "unknown", 0.0
+        scores = np.take(self.weights, buckets, axis=1).sum(axis=1)
+        # Confiance : softmax des log-vraisemblances moyennes par trigramme
+        scaled = (scores - scores.max()) / len(buckets) * self.confidence_scale
+        probabilities = np.exp(scaled) / np.exp(scaled).sum()
+        best = int(np.argmax(probabilities))
+        return self.languages[best], round(float(probabilities[best]), 2)
@@ -0,0 +1,80 @@
+"""
+Regroupement (micro-batching) des appels de génération de texte.
+
+Sous forte charge, de nombreux petits prompts (suggestions de compétences,
+réponses et suggestions du chatbot) partent un par un. Le regroupeur les
+retient pendant une courte fenêtre (ou jusqu'à une taille de lot) et les
+envoie en une seule requête ; chaque appelant reçoit le texte généré pour son
+propre prompt. Seuls les prompts destinés au même modèle avec les mêmes
+paramètres de génération partagent un lot.
+"""
+import asyncio
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+Dispatch = Callable[[Hashable, List[str]], Awaitable[List[str]]]
+
+
+class MicroBatcher:
+    """
+    File de prompts par clé (modèle, paramètres), vidée à la fin de la fenêtre
+    ou dès que le lot est plein. Une instance appartient à une boucle d'événements.
+    """
+
+    def __init__(self, dispatch: Dispatch, window: float = 0.02, max_batch_size: int = 8,
+                 stats: Optional[Counter] = None):
+        self.dispatch = dispatch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.stats = stats if stats is not None else Counter()
+        self._pending: Dict[Hashable, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, key: Hashable, prompt: str) -> str:
+        """
+        Ajoute le prompt au lot en cours pour key et attend son texte généré.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((prompt, future))
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        # Les appelants déjà partis (délai dépassé, client déconnecté) sont retirés du lot
+        batch = [item for item in self._pending.pop(key, []) if not item[1].done()]
+        if not batch:
+            return
+        self.stats["batches"] += 1
+        self.stats["prompts"] += len(batch)
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(batch))
+        task = asyncio.get_running_loop().create_task(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Hashable, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            texts = await self.dispatch(key, [prompt for prompt, _ in batch])
+            if len(texts) != len(batch):
+                raise ValueError(f"{len(texts)} réponses reçues pour un lot de {len(batch)} prompts")
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), text in zip(batch, texts):
+            if not future.done():
+                future.set_result(text)
@@ -0,0 +1,297 @@
+"""
+Client asynchrone partagé pour les appels aux modèles de langage (Hugging Face).
+
+Un seul AsyncInferenceClient est créé par boucle d'événements : sa connexion
+HTTP est conservée (keep-alive) d'un appel à l'autre au lieu d'un nouveau
+client par requête. Le nombre d'appels simultanés est borné par un sémaphore
+et chaque appel reçoit un délai maximal, attente d'une place comprise.
+
+Un disjoncteur par modèle (voir circuit_breaker) refuse immédiatement les
+appels lorsqu'un modèle échoue de façon répétée : l'appelant sert alors sa
+réponse de repli sans aucun accès réseau.
+
+Avec une fenêtre de regroupement (LLM_BATCH_WINDOW), les appels non streamés
+vers HF_INFERENCE_URL sont regroupés en lots (voir llm_batcher) : une requête
+{"inputs": [prompts...], "parameters": {...}} par lot, l'endpoint répondant
+par une liste de textes générés dans le même ordre.
+
+HF_INFERENCE_URL permet de diriger tous les appels vers un serveur compatible
+TGI (endpoint dédié, serveur local de test) au lieu de l'API Hugging Face.
+
+Les flux (stream_text_generation) passent par le client httpx de la boucle :
+chaque réponse est fermée à la fin du générateur, flux complet ou interrompu,
+au lieu de rester attachée au client partagé jusqu'à sa fermeture.
+
+Chaque appel est mesuré (voir llm_metrics) : modèle, template du prompt,
+latence, tokens générés et issue.
+"""
+import asyncio
+import json
+import time
+import weakref
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from huggingface_hub import AsyncInferenceClient
+
+from app.circuit_breaker import CircuitBreaker
+from app.llm_batcher import MicroBatcher
+from app.llm_metrics import LLMMetrics, count_tokens
+from app.config import settings
+
+# Endpoint d'un modèle de l'API Hugging Face, sans HF_INFERENCE_URL
+HF_MODEL_URL = "https://router.huggingface.co/hf-inference/models/{model}"
+_DONE = object()
+
+
+def _stream_token(line: str) -> Any:
+    """
+    Texte du token d'une ligne de flux TGI ("data:{...}"), None pour une ligne
+    sans token, _DONE en fin de flux ; lève RuntimeError pour une erreur du serveur.
+    """
+    if not line.startswith("data:"):
+        return None
+    payload = line[len("data:"):].strip()
+    if payload == "[DONE]":
+        return _DONE
+    event = json.loads(payload)
+    if event.get("error") is not None:
+        raise RuntimeError(event["error"])
+    return event["token"]["text"]
+
+
+class LLMClient:
+    """
+    Accès aux modèles de génération de texte avec concurrence bornée et délais par appel.
+    """
+
+    def __init__(self, base_url: str = "", token: str = "", timeout: float = 30.0, max_concurrency: int = 8,
+                 breaker_failures: int = 5, breaker_recovery: float = 30.0, breaker_half_open_calls: int = 1,
+                 batch_window: float = 0.0, batch_max_size: int = 8):
+        self.base_url = base_url
+        self.token = token
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.breaker_failures = breaker_failures
+        self.breaker_recovery = breaker_recovery
+        self.breaker_half_open_calls = breaker_half_open_calls
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        # Le regroupement suppose un endpoint qui accepte une liste de prompts
+        self.batch_window = batch_window
+        self.batch_max_size = batch_max_size
+        self.batch_stats = Counter()
+        self.metrics = LLMMetrics()
+        # Client et sémaphore par boucle d'événements (ils ne peuvent pas être partagés entre boucles)
+        self._per_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = weakref.WeakKeyDictionary()
+
+    def _resources(self) -> tuple:
+        loop = asyncio.get_running_loop()
+        resources = self._per_loop.get(loop)
+        if resources is None:
+            client = AsyncInferenceClient(
+                base_url=self.base_url or None,
+                token=self.token or None,
+                timeout=self.timeout,
+            )
+            # Client HTTP direct : lots de prompts et flux (réponse fermée dès la fin du flux)
+            http = httpx.AsyncClient(timeout=self.timeout, headers=self._headers())
+            batcher = None
+            if self.batching:
+                batcher = MicroBatcher(self._dispatch_batch, self.batch_window, self.batch_max_size, self.batch_stats)
+            resources = (client, asyncio.Semaphore(self.max_concurrency), http, batcher)
+            self._per_loop[loop] = resources
+        return resources
+
+    @property
+    def batching(self) -> bool:
+        return bool(self.base_url) and self.batch_window > 0 and self.batch_max_size > 1
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    async def _dispatch_batch(self, key: Tuple[str, tuple], prompts: List[str]) -> List[str]:
+        """
+        Envoie un lot de prompts (même modèle, mêmes paramètres) en une requête.
+        L'issue est comptée une fois par lot dans le disjoncteur du modèle, et
+        non une fois par appelant.
+        """
+        model, parameters = key
+        _, semaphore, http, _ = self._resources()
+        breaker = self.breaker(model)
+        try:
+            async with semaphore:
+                response = await http.post(self.base_url, json={"inputs": prompts, "parameters": dict(parameters)})
+            response.raise_for_status()
+            texts = []
+            for item in response.json():
+                # Selon le serveur : {"generated_text": ...} ou [{"generated_text": ...}] par prompt
+                if isinstance(item, list):
+                    item = item[0]
+                texts.append(item["generated_text"])
+        except asyncio.CancelledError:
+            breaker.record_cancelled()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return texts
+
+    def _target(self, model: str) -> Optional[str]:
+        # Avec une URL de base, le modèle est celui servi par cet endpoint
+        return None if self.base_url else model
+
+    def _url(self, model: str) -> str:
+        return self.base_url or HF_MODEL_URL.format(model=model)
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        breaker = self.breakers.get(model)
+        if breaker is None:
+            breaker = self.breakers.setdefault(model, CircuitBreaker(
+                model,
+                failure_threshold=self.breaker_failures,
+                recovery_time=self.breaker_recovery,
+                half_open_max_calls=self.breaker_half_open_calls,
+            ))
+        return breaker
+
+    async def text_generation(self, prompt: str, model: str, timeout: Optional[float] = None,
+                              template: str = "default", **parameters: Any) -> str:
+        """
+        Génère un texte ; lève CircuitOpen si le disjoncteur du modèle est ouvert
+        et asyncio.TimeoutError si le délai est dépassé. template identifie le
+        modèle de prompt dans les métriques.
+        """
+        resources = self._resources()
+        client, semaphore = resources[:2]
+        breaker = self.breaker(model)
+        start = time.perf_counter()
+        try:
+            breaker.acquire()
+        except Exception as e:
+            self.metrics.record_call(model, template, time.perf_counter() - start, 0, e)
+            raise
+
+        batched = self.batching
+
+        async def call() -> str:
+            if batched:
+                return await resources[3].submit((model, tuple(sorted(parameters.items()))), prompt)
+            async with semaphore:
+                return await client.text_generation(prompt, model=self._target(model), **parameters)
+
+        try:
+            text = await asyncio.wait_for(call(), timeout or self.timeout)
+        except asyncio.CancelledError as e:
+            breaker.record_cancelled()
+            self.metrics.record_call(model, template, time.perf_counter() - start, 0, e)
+            raise
+        except Exception as e:
+            if not batched:
+                breaker.record_failure()
+            elif isinstance(e, asyncio.TimeoutError):
+                # Appelant parti avant la réponse du lot : l'issue du lot est comptée par _dispatch_batch
+                breaker.record_cancelled()
+            self.metrics.record_call(model, template, time.perf_counter() - start, 0, e)
+            raise
+        if not batched:
+            breaker.record_success()
+        self.metrics.record_call(model, template, time.perf_counter() - start, count_tokens(text))
+        return text
+
+    async def stream_text_generation(self, prompt: str, model: str, timeout: Optional[float] = None,
+                                     template: str = "default", **parameters: Any) -> AsyncIterator[str]:
+        """
+        Génère un texte en transmettant les tokens au fur et à mesure (API de
+        streaming). Le délai s'applique à l'ensemble de la génération.
+        """
+        _, semaphore, http, _ = self._resources()
+        breaker = self.breaker(model)
+        start = time.perf_counter()
+        try:
+            breaker.acquire()
+        except Exception as e:
+            self.metrics.record_call(model, template, time.perf_counter() - start, 0, e, stream=True)
+            raise
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.timeout)
+        response = None
+        acquired = False
+        generated = 0
+        try:
+            await asyncio.wait_for(semaphore.acquire(), deadline - loop.time())
+            acquired = True
+            request = http.build_request("POST", self._url(model),
+                                         json={"inputs": prompt, "parameters": parameters, "stream": True})
+            response = await asyncio.wait_for(http.send(request, stream=True), deadline - loop.time())
+            response.raise_for_status()
+            lines = response.aiter_lines().__aiter__()
+            while True:
+                try:
+                    line = await asyncio.wait_for(lines.__anext__(), deadline - loop.time())
+                except StopAsyncIteration:
+                    line = "data: [DONE]"
+                token = _stream_token(line)
+                if token is _DONE:
+                    breaker.record_success()
+                    self.metrics.record_call(model, template, time.perf_counter() - start, generated, stream=True)
+                    return
+                if token is None:
+                    continue
+                generated += 1
+                yield token
+        except (asyncio.CancelledError, GeneratorExit):
+            breaker.record_cancelled()
+            self.metrics.record_call(model, template, time.perf_counter() - start, generated,
+                                     asyncio.CancelledError(), stream=True)
+            raise
+        except Exception as e:
+            breaker.record_failure()
+            self.metrics.record_call(model, template, time.perf_counter() - start, generated, e, stream=True)
+            raise
+        finally:
+            # Ferme la réponse dans tous les cas (fin du flux, délai, client
+            # déconnecté) : la connexion est rendue au pool ou fermée
+            if response is not None:
+                await response.aclose()
+            if acquired:
+                semaphore.release()
+
+    def breaker_metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {model: breaker.metrics() for model, breaker in sorted(self.breakers.items())}
+
+    def batch_metrics(self) -> Dict[str, Any]:
+        batches = self.batch_stats["batches"]
+        return {
+            "enabled": self.batching,
+            "window": self.batch_window,
+            "max_batch_size": self.batch_max_size,
+            "batches": batches,
+            "prompts": self.batch_stats["prompts"],
+            "mean_batch_size": round(self.batch_stats["prompts"] / batches, 2) if batches else 0.0,
+            "largest_batch": self.batch_stats["max_batch_size"],
+            "errors": self.batch_stats["errors"],
+        }
+
+    async def aclose(self) -> None:
+        """
+        Ferme le client de la boucle courante (à l'arrêt de l'application).
+        """
+        resources = self._per_loop.pop(asyncio.get_running_loop(), None)
+        if resources is not None:
+            await resources[0].close()
+            await resources[2].aclose()
+
+
+llm_client = LLMClient(
+    base_url=settings.HF_INFERENCE_URL,
+    token=settings.HUGGINGFACE_API_KEY,
+    timeout=settings.LLM_TIMEOUT,
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    breaker_failures=settings.LLM_BREAKER_FAILURES,
+    breaker_recovery=settings.LLM_BREAKER_RECOVERY,
+    breaker_half_open_calls=settings.LLM_BREAKER_HALF_OPEN_CALLS,
+    batch_window=settings.LLM_BATCH_WINDOW,
+    batch_max_size=settings.LLM_BATCH_MAX_SIZE,
+)
@@ -0,0 +1,150 @@
+"""
+Instrumentation des appels aux modèles de langage.
+
+Chaque appel est enregistré avec son modèle, l'identifiant du modèle de prompt
+(template), sa latence (attente d'une place comprise), le nombre de tokens
+générés et son issue (ok, timeout, circuit_open, error, cancelled). Les
+mesures alimentent des histogrammes en mémoire (par modèle et template) et
+une ligne de journal JSON par appel (logger "smartcv.llm"), pour repérer les
+prompts qui dominent la latence et la consommation de tokens.
+"""
+import asyncio
+import json
+import logging
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from app.circuit_breaker import CircuitOpen
+
+logger = logging.getLogger("smartcv.llm")
+
+# Bornes supérieures des intervalles des histogrammes
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (8, 16, 32, 64, 128, 256, 512, 1024)
+
+# Estimation du nombre de tokens d'un texte non streamé (mots et ponctuation)
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    return len(_TOKEN_RE.findall(text))
+
+
+def outcome_of(error: Optional[BaseException]) -> str:
+    if error is None:
+        return "ok"
+    if isinstance(error, CircuitOpen):
+        return "circuit_open"
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(error, asyncio.CancelledError):
+        return "cancelled"
+    return "error"
+
+
+class Histogram:
+    """
+    Histogramme à intervalles fixes ; les quantiles sont interpolés dans
+    l'intervalle, borné par les valeurs observées (min et max).
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.min = value if not self.count else min(self.min, value)
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = max(self.bounds[index - 1] if index > 0 else 0.0, self.min)
+                upper = min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{bound:g}" for bound in self.bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "mean": round(self.sum / self.count, 4) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 4),
+            "p95": round(self.quantile(0.95), 4),
+            "p99": round(self.quantile(0.99), 4),
+            "min": round(self.min, 4),
+            "max": round(self.max, 4),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class _CallStats:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.tokens = Histogram(TOKEN_BUCKETS)
+        self.outcomes = Counter()
+
+
+class LLMMetrics:
+    """
+    Histogrammes par (modèle, template) et succès du cache par template (thread-safe).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[str, str], _CallStats] = {}
+        self._cache: Dict[str, Counter] = {}
+
+    def record_call(self, model: str, template: str, latency: float, tokens: int,
+                    error: Optional[BaseException] = None, stream: bool = False) -> None:
+        outcome = outcome_of(error)
+        with self._lock:
+            stats = self._calls.get((model, template))
+            if stats is None:
+                stats = self._calls[(model, template)] = _CallStats()
+            stats.latency.observe(latency)
+            stats.outcomes[outcome] += 1
+            if outcome == "ok":
+                stats.tokens.observe(tokens)
+        record = {"event": "llm_call", "model": model, "template": template, "latency_ms": round(latency * 1000, 1),
+                  "tokens": tokens, "outcome": outcome, "stream": stream}
+        if error is not None and outcome != "cancelled":
+            record["error"] = str(error) or type(error).__name__
+        logger.log(logging.INFO if outcome in ("ok", "cancelled") else logging.WARNING,
+                   json.dumps(record, ensure_ascii=False))
+
+    def record_cache(self, template: str, hit: bool) -> None:
+        with self._lock:
+            self._cache.setdefault(template, Counter())["hits" if hit else "misses"] += 1
+        logger.debug(json.dumps({"event": "llm_cache", "template": template, "hit": hit}))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = [{
+                "model": model,
+                "template": template,
+                "outcomes": dict(stats.outcomes),
+                "latency_seconds": stats.latency.snapshot(),
+                "generated_tokens": stats.tokens.snapshot(),
+            } for (model, template), stats in sorted(self._calls.items())]
+            cache = {template: {"hits": counts["hits"], "misses": counts["misses"]}
+                     for template, counts in sorted(self._cache.items())}
+        # Les prompts qui cumulent le plus de temps d'attente en premier
+        calls.sort(key=lambda call: -call["latency_seconds"]["sum"])
+        return {"calls": calls, "cache": cache}
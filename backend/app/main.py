@@ -1,14 +1,44 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import users, auth, cv  # Retirez 'ai' s'il n'existe pas encore
+from app.routers import users, auth, cv, nlp, assistant  # Retirez 'ai' s'il n'existe pas encore
 from app.config import Settings
+from app.nlp_pool import pool as nlp_pool
+from app.llm_client import llm_client
+from app.pdf_extract import pdf_extractor
+from app.uploads import UploadLimitMiddleware
+from app.import_jobs import import_jobs
+from app.bulk_import import bulk_importer
 
 settings = Settings()
 
+# Journaux de l'application (dont une ligne JSON par appel aux modèles de langage)
+app_logger = logging.getLogger("smartcv")
+app_logger.setLevel(settings.LOG_LEVEL)
+if not app_logger.handlers:
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    app_logger.addHandler(log_handler)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Démarrer les workers NLP (chargement du modèle) avant les premières requêtes
+    nlp_pool.warm_up()
+    # Workers d'import : reprennent aussi les jobs laissés en cours par un arrêt précédent
+    await import_jobs.start()
+    yield
+    await import_jobs.stop()
+    nlp_pool.shutdown()
+    pdf_extractor.shutdown()
+    bulk_importer.shutdown()
+    await llm_client.aclose()
+
 app = FastAPI(
     title=settings.APP_NAME,
     description=settings.APP_DESCRIPTION,
-    version=settings.APP_VERSION
+    version=settings.APP_VERSION,
+    lifespan=lifespan
 )
 
 # Configuration CORS
@@ -20,10 +50,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Taille des fichiers importés bornée pendant la réception
+app.add_middleware(UploadLimitMiddleware, limits={
+    "/cv/import": settings.UPLOAD_MAX_BYTES,
+    "/cv/import/bulk": settings.BULK_IMPORT_MAX_BYTES,
+})
+
 # Inclusion des routers
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(cv.router)
+app.include_router(nlp.router)
+app.include_router(assistant.router)
 # app.include_router(ai.router)  # Commentez cette ligne si le module n'existe pas encore
 
 @app.get("/")
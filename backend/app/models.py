@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, JSON, Float, Table, ARRAY
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, JSON, Float, Table, ARRAY, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -10,7 +10,7 @@ project_technologies = Table(
     "project_technologies",
     Base.metadata,
     Column("project_id", Integer, ForeignKey("projects.id")),
-    Column("technology", String)
+    Column("technology", String, ForeignKey("technologies.name"))
 )
 
 class User(Base):
@@ -43,6 +43,7 @@ class CV(Base):
     education_level = Column(Integer, default=0)  # 0-5 (0: aucun, 5: doctorat)
     years_experience = Column(Integer, default=0)
     location = Column(String, nullable=True)
+    blob_sha256 = Column(String(64), ForeignKey("file_blobs.sha256"), nullable=True)  # fichier importé
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -125,3 +126,34 @@ class RecruiterSearchLog(Base):
     search_date = Column(DateTime, default=datetime.utcnow)
 
     recruiter = relationship("User", back_populates="search_logs")
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+    __table_args__ = (UniqueConstraint("user_id", "idempotency_key", name="uq_import_jobs_user_key"),)
+
+    id = Column(String(32), primary_key=True)  # identifiant opaque (uuid hex)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    idempotency_key = Column(String, nullable=True)  # en-tête Idempotency-Key du client
+    filename = Column(String)
+    file_path = Column(String, nullable=True)  # fichier reçu, supprimé une fois le job terminé
+    content_sha256 = Column(String(64), nullable=True)  # empreinte du fichier reçu
+    status = Column(String, default="queued", index=True)  # "queued", "running", "succeeded", "failed"
+    attempts = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    cv_id = Column(Integer, ForeignKey("cvs.id"), nullable=True)
+    run_after = Column(DateTime, default=datetime.utcnow)  # prochaine tentative
+    lease_token = Column(String(32), nullable=True)  # worker qui traite le job
+    lease_expires_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+class FileBlob(Base):
+    __tablename__ = "file_blobs"
+
+    sha256 = Column(String(64), primary_key=True)  # empreinte SHA-256 du fichier importé
+    size = Column(Integer)  # taille du fichier (octets)
+    text = Column(Text)  # texte extrait
+    uploads = Column(Integer, default=1)  # nombre d'imports de ce fichier
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow)
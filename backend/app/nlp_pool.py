@@ -0,0 +1,179 @@
+"""
+Exécution des traitements NLP hors de la boucle de requêtes.
+
+Les fonctions de nlp_utils sont liées au CPU et au GIL : exécutées directement
+dans les endpoints, elles occupent le threadpool de FastAPI et ralentissent les
+autres routes. Le pool les envoie dans des processus dédiés (le modèle SpaCy
+est chargé une seule fois par processus) avec une file d'attente bornée. Si
+un worker meurt (mémoire, signal), le pool cassé est remplacé par un nouveau.
+"""
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+from app.config import settings
+
+
+class PoolSaturated(Exception):
+    """
+    Levée lorsque tous les workers sont occupés et que la file d'attente est pleine.
+    """
+
+
+def _init_worker():
+    """
+    Initialisation d'un processus worker : charge le modèle SpaCy une fois pour toutes.
+    """
+    from app import nlp_utils
+    nlp_utils.parse("Initialisation du worker", "analysis")
+
+
+def _run_task(name: str, args: tuple, kwargs: dict) -> Any:
+    from app import nlp_utils
+    return getattr(nlp_utils, name)(*args, **kwargs)
+
+
+class NLPPool:
+    """
+    Pool de workers NLP avec file d'attente bornée.
+
+    workers > 0 : pool de processus (par défaut, un worker par cœur moins un) ;
+    workers = 0 : un seul thread dans le processus courant (utile en
+    développement et dans les tests).
+    """
+
+    def __init__(self, workers: int = 0, max_pending: int = 16):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.stats = Counter()
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def slots(self) -> int:
+        return self.workers or 1
+
+    @property
+    def capacity(self) -> int:
+        return self.slots + self.max_pending
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nlp")
+            return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.stats["rejected"] += 1
+                raise PoolSaturated()
+            self._in_flight += 1
+            self.stats["submitted"] += 1
+
+    def _release(self, future: Future) -> None:
+        # Appelé à la fin réelle de la tâche, même si le client s'est déconnecté
+        with self._lock:
+            self._in_flight -= 1
+            self.stats["failed" if future.cancelled() or future.exception() else "completed"] += 1
+
+    def _discard(self, executor: Executor) -> None:
+        # Pool cassé : le prochain appel démarre de nouveaux workers (une seule
+        # fois, même si plusieurs tâches ont échoué avec ce pool)
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self.stats["restarts"] += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, executor: Executor, name: str, args: tuple, kwargs: dict) -> Future:
+        self._acquire()
+        try:
+            future = executor.submit(_run_task, name, args, kwargs)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def submit(self, name: str, *args, **kwargs) -> Future:
+        """
+        Soumet nlp_utils.<name>(*args, **kwargs) au pool ; lève PoolSaturated si la file est pleine.
+        """
+        return self._submit(self._get_executor(), name, args, kwargs)
+
+    async def run(self, name: str, *args, **kwargs) -> Any:
+        """
+        Version asynchrone de submit : libère la boucle pendant le traitement.
+        Lève BrokenProcessPool si un worker est mort pendant la tâche ; le pool
+        est alors reconstruit pour les appels suivants.
+        """
+        executor = self._get_executor()
+        try:
+            return await asyncio.wrap_future(self._submit(executor, name, args, kwargs))
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    def warm_up(self) -> None:
+        """
+        Démarre les workers (et charge le modèle) avant les premières requêtes.
+        """
+        executor = self._get_executor()
+        if self.workers > 0:
+            for future in [executor.submit(_init_worker) for _ in range(self.workers)]:
+                future.result()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+            stats = dict(self.stats)
+        busy = min(in_flight, self.slots)
+        return {
+            "mode": "process" if self.workers > 0 else "thread",
+            "workers": self.slots,
+            "in_flight": in_flight,
+            "busy_workers": busy,
+            "worker_utilization": round(busy / self.slots, 2),
+            "queue_depth": in_flight - busy,
+            "queue_capacity": self.max_pending,
+            "submitted": stats.get("submitted", 0),
+            "completed": stats.get("completed", 0),
+            "failed": stats.get("failed", 0),
+            "rejected": stats.get("rejected", 0),
+            "restarts": stats.get("restarts", 0),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+pool = NLPPool(workers=settings.NLP_POOL_WORKERS, max_pending=settings.NLP_POOL_MAX_PENDING)
+
+
+async def run_nlp(name: str, *args, **kwargs) -> Any:
+    """
+    Exécute nlp_utils.<name> dans le pool NLP ; renvoie 503 si le pool est saturé.
+    """
+    try:
+        return await pool.run(name, *args, **kwargs)
+    except (PoolSaturated, BrokenProcessPool):
+        raise HTTPException(
+            status_code=503,
+            detail="NLP workers are busy, please retry later.",
+            headers={"Retry-After": str(settings.NLP_POOL_RETRY_AFTER)},
+        )
@@ -1,16 +1,29 @@
 import re
 import random
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+import numpy as np
 import spacy
+from spacy.attrs import LOWER, IS_STOP, IS_PUNCT, SENT_START
 from collections import Counter
+from functools import cached_property
 import json
 import os
-from io import BytesIO
-import docx
-import pdfplumber
 from fastapi import UploadFile
-from huggingface_hub import InferenceClient
+from fastapi.concurrency import run_in_threadpool
 from app.config import Settings
+from app.skill_matcher import SkillMatcher
+from app.job_scoring import JobSkillMatrix
+from app.taxonomy import TaxonomyStore, fold_text
+from app.language_id import LanguageIdentifier
+from app import cv_sections
+from app.cv_sections import SectionSegmenter, Span, Section, group_sections
+from app.skill_index import SkillEmbedder, SkillIndex
+from app.response_cache import ResponseCache
+from app.llm_client import llm_client
+from app.pdf_extract import pdf_extractor
+from app import docx_extract
+from app.llm_metrics import logger as llm_logger, outcome_of
 
 # Import des modèles de base de données
 from app import models
@@ -24,314 +37,676 @@ except OSError:
 
 settings = Settings()
 
-def get_hf_client():
-    """Retourne un client Hugging Face configuré avec le token d'API"""
-    return InferenceClient(token=settings.HUGGINGFACE_API_KEY)
+# Liste de compétences courantes (à enrichir)
+COMMON_SKILLS = [
+    "python", "java", "javascript", "html", "css", "react", "angular", "vue", 
+    "node.js", "express", "django", "flask", "fastapi", "sql", "nosql", "mongodb",
+    "postgresql", "mysql", "docker", "kubernetes", "aws", "azure", "gcp", "git",
+    "agile", "scrum", "kanban", "jira", "confluence", "excel", "word", "powerpoint",
+    "photoshop", "illustrator", "indesign", "figma", "sketch", "adobe xd",
+    "marketing", "seo", "sem", "google analytics", "social media", "content writing",
+    "copywriting", "project management", "team management", "leadership", "communication"
+]
 
-def extract_skills(text: str) -> List[str]:
+# Automate construit une seule fois au démarrage
+skill_matcher = SkillMatcher(COMMON_SKILLS)
+
+# Taxonomie des métiers (fichier de données rechargé à chaud)
+taxonomy_store = TaxonomyStore(settings.JOB_TAXONOMY_PATH, settings.JOB_TAXONOMY_RELOAD_INTERVAL)
+
+# Automate des titres de section et mots-clés (multilingue), construit une seule fois
+section_segmenter = SectionSegmenter(cv_sections.SECTION_HEADINGS, cv_sections.SECTION_KEYWORDS)
+
+# Profils de langues précalculés, chargés une seule fois
+language_identifier = LanguageIdentifier.load(settings.LANGUAGE_PROFILES_PATH, sample_chars=settings.LANGUAGE_SAMPLE_CHARS)
+
+def _build_view(components: List[str], sentencizer: bool = False):
+    """
+    Construit une vue restreinte du pipeline principal : même vocabulaire, même
+    tokenizer et mêmes composants (partagés, sans copie des poids).
+    """
+    view = spacy.blank(nlp.lang, vocab=nlp.vocab)
+    view.tokenizer = nlp.tokenizer
+    for name in components:
+        view.add_pipe(name, source=nlp)
+    if sentencizer:
+        # Découpage en phrases par règles au lieu du parser
+        view.add_pipe("sentencizer")
+    return view
+
+# Pipelines par tâche
+pipelines = {
+    "full": nlp,
+    # Entités nommées et phrases : suffisant pour l'analyse d'un CV
+    "analysis": _build_view(["ner"], sentencizer=True),
+    # Tokens, stopwords et phrases uniquement
+    "sentences": _build_view([], sentencizer=True),
+}
+
+# Nombre d'analyses SpaCy effectuées, au total ("nlp") et par pipeline (utile pour les tests et le suivi)
+parse_counter = Counter()
+
+def parse(text: str, pipeline: str = "full"):
+    """
+    Analyse un texte avec le pipeline SpaCy demandé en comptabilisant l'appel.
+    """
+    parse_counter["nlp"] += 1
+    parse_counter[pipeline] += 1
+    return pipelines[pipeline](text)
+
+def parse_many(texts: List[str], batch_size: int = 32, n_process: int = 1, pipeline: str = "analysis") -> list:
+    """
+    Analyse plusieurs textes avec nlp.pipe en conservant l'ordre d'entrée.
+    Un texte qui fait échouer le lot est isolé : sa position reçoit l'exception
+    et l'analyse par lots reprend sur les textes suivants.
+    """
+    results = []
+    while len(results) < len(texts):
+        remaining = texts[len(results):]
+        try:
+            for doc in pipelines[pipeline].pipe(remaining, batch_size=batch_size, n_process=n_process):
+                parse_counter["nlp"] += 1
+                parse_counter[pipeline] += 1
+                results.append(doc)
+        except Exception:
+            # Réessayer le premier texte restant seul pour attribuer l'erreur
+            try:
+                results.append(parse(texts[len(results)], pipeline))
+            except Exception as item_error:
+                results.append(item_error)
+    return results
+
+class AnalysisContext:
+    """
+    Contexte d'analyse partagé : le texte n'est analysé qu'une seule fois par SpaCy
+    et chaque résultat dérivé est calculé à la demande puis mémorisé.
+    """
+
+    def __init__(self, text: str, doc=None, pipeline: str = "analysis"):
+        self.text = text
+        self.pipeline = pipeline
+        if doc is not None:
+            # Document déjà analysé (par exemple via nlp.pipe)
+            self.__dict__["doc"] = doc
+
+    @cached_property
+    def text_lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def spans(self) -> List[Span]:
+        # Découpage en sections en une seule passe, partagé par les extracteurs
+        return list(section_segmenter.iter_spans(self.text))
+
+    @cached_property
+    def sections(self) -> List[Section]:
+        return list(group_sections(self.spans))
+
+    @cached_property
+    def doc(self):
+        return parse(self.text, self.pipeline)
+
+    @cached_property
+    def entities(self) -> List[tuple]:
+        return [(ent.text, ent.label_) for ent in self.doc.ents]
+
+    @cached_property
+    def sentences(self) -> list:
+        return list(self.doc.sents)
+
+    @cached_property
+    def token_frequencies(self) -> Counter:
+        # Fréquence des mots (sauf stopwords et ponctuation)
+        return Counter([token.text.lower() for token in self.doc if not token.is_stop and not token.is_punct])
+
+    @cached_property
+    def skills(self) -> List[str]:
+        # Correspondances exactes uniquement (mots entiers) : les variantes
+        # proches sont données à part (similar_skills), sans compter dans les scores
+        found_skills = skill_matcher.find(self.text_lower)
+        entities = [text.lower() for text, label in self.entities if label in ["PRODUCT", "ORG", "LANGUAGE"]]
+        # Combiner et dédupliquer
+        return list(set(found_skills + entities))
+
+    @cached_property
+    def similar_skills(self) -> Dict[str, str]:
+        # Mots proches d'une compétence connue ("reactjs" -> "react"), à titre indicatif
+        found = set(self.skills)
+        words = sorted({token.lower_ for token in self.doc
+                        if not token.is_stop and not token.is_punct and not token.like_num and len(token) > 1} - found)
+        return {word: matches[0][0] for word, matches in zip(words, similar_skills(words, COMMON_SKILLS))
+                if matches and matches[0][0] not in found}
+
+def get_context(text: str, context: Optional[AnalysisContext] = None, pipeline: str = "analysis") -> AnalysisContext:
+    """
+    Retourne le contexte fourni s'il correspond au texte, sinon en crée un nouveau
+    avec le pipeline indiqué.
+    """
+    if context is not None and context.text == text:
+        return context
+    return AnalysisContext(text, pipeline=pipeline)
+
+def extract_skills(text: str, context: Optional[AnalysisContext] = None) -> List[str]:
     """
     Extrait les compétences d'un texte en utilisant une liste prédéfinie et NER.
     """
-    # Liste de compétences courantes (à enrichir)
-    common_skills = [
-        "python", "java", "javascript", "html", "css", "react", "angular", "vue", 
-        "node.js", "express", "django", "flask", "fastapi", "sql", "nosql", "mongodb",
-        "postgresql", "mysql", "docker", "kubernetes", "aws", "azure", "gcp", "git",
-        "agile", "scrum", "kanban", "jira", "confluence", "excel", "word", "powerpoint",
-        "photoshop", "illustrator", "indesign", "figma", "sketch", "adobe xd",
-        "marketing", "seo", "sem", "google analytics", "social media", "content writing",
-        "copywriting", "project management", "team management", "leadership", "communication"
-    ]
-    
-    # Convertir en minuscules pour la comparaison
-    text_lower = text.lower()
-    
-    # Rechercher les compétences dans le texte
-    found_skills = [skill for skill in common_skills if re.search(r'\b' + re.escape(skill) + r'\b', text_lower)]
-    
-    # Utiliser SpaCy pour extraire des entités supplémentaires
-    doc = nlp(text)
-    entities = [ent.text.lower() for ent in doc.ents if ent.label_ in ["PRODUCT", "ORG", "LANGUAGE"]]
-    
-    # Combiner et dédupliquer
-    all_skills = list(set(found_skills + entities))
-    
-    return all_skills
+    return list(get_context(text, context).skills)
 
-def summarize_text(text: str) -> str:
+def sentence_scores(doc) -> tuple:
+    """
+    Calcule le score de chaque phrase (somme des fréquences de ses mots, hors
+    stopwords et ponctuation) en une opération vectorisée.
+    Retourne (scores, débuts, fins), les bornes étant des indices de tokens.
+    """
+    if len(doc) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return np.zeros(0), empty, empty
+    
+    array = doc.to_array([LOWER, IS_STOP, IS_PUNCT, SENT_START])
+    # Identifiant de terme (forme en minuscules) et phrase de chaque token
+    _, term_ids = np.unique(array[:, 0], return_inverse=True)
+    is_start = array[:, 3] == 1
+    is_start[0] = True
+    sentence_ids = np.cumsum(is_start) - 1
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], len(doc))
+    
+    # Fréquence de chaque terme (sauf stopwords et ponctuation)
+    content = (array[:, 1] == 0) & (array[:, 2] == 0)
+    frequencies = np.bincount(term_ids[content], minlength=term_ids.max() + 1)
+    
+    # Matrice creuse phrase×terme au format COO (une entrée par token),
+    # multipliée par le vecteur des fréquences
+    scores = np.bincount(sentence_ids, weights=frequencies[term_ids], minlength=len(starts))
+    return scores, starts, ends
+
+def summarize_text(text: str, context: Optional[AnalysisContext] = None, max_sentences: Optional[int] = None) -> str:
     """
-    Crée un résumé du texte en extrayant les phrases les plus importantes.
+    Crée un résumé du texte en extrayant les phrases les plus importantes,
+    présentées dans leur ordre d'apparition.
     """
-    doc = nlp(text)
+    if max_sentences is None:
+        max_sentences = settings.SUMMARY_SENTENCES
+    # Seuls les tokens, les stopwords et les phrases sont nécessaires
+    context = get_context(text, context, pipeline="sentences")
+    doc = context.doc
+    scores, starts, ends = sentence_scores(doc)
     
-    # Calculer la fréquence des mots (sauf stopwords)
-    word_freq = Counter([token.text.lower() for token in doc if not token.is_stop and not token.is_punct])
-    
-    # Calculer le score de chaque phrase basé sur la fréquence des mots
-    sentence_scores = {}
-    for sent in doc.sents:
-        for word in sent:
-            if word.text.lower() in word_freq:
-                if sent in sentence_scores:
-                    sentence_scores[sent] += word_freq[word.text.lower()]
-                else:
-                    sentence_scores[sent] = word_freq[word.text.lower()]
-    
-    # Sélectionner les 3 phrases avec les scores les plus élevés
-    summary_sentences = sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:3]
+    # Sélectionner les phrases avec les scores les plus élevés (à égalité, la première)
+    candidates = np.flatnonzero(scores > 0)
+    best = candidates[np.lexsort((candidates, -scores[candidates]))][:max_sentences]
     
     # Trier les phrases selon leur ordre d'apparition dans le texte
-    summary = " ".join([sent.text for sent in summary_sentences])
+    summary = " ".join([doc[starts[i]:ends[i]].text for i in np.sort(best)])
     
     return summary
 
-def evaluate_cv(text: str) -> Dict[str, float]:
+def evaluate_cv(text: str, context: Optional[AnalysisContext] = None) -> Dict[str, float]:
     """
     Donne un score fictif basé sur le nombre de compétences trouvées.
     """
-    score = 0.5 + 0.05 * len(extract_skills(text))
+    score = 0.5 + 0.05 * len(get_context(text, context).skills)
     return {"score": min(score, 1.0)}
 
-def detect_language(text: str) -> str:
+def identify_language(text: str, context: Optional[AnalysisContext] = None) -> Tuple[str, float]:
     """
-    Détecte la langue de base (français, anglais, autre) de façon simplifiée.
+    Identifie la langue du CV (fr, en, es, de, ar) à partir des trigrammes de
+    caractères du début du texte. Retourne (langue, confiance) ou ("unknown", 0.0).
     """
-    if re.search(r"\b(le|la|et|est|vous|nous|je|de)\b", text.lower()):
-        return "fr"
-    elif re.search(r"\b(the|and|is|you|we|i|of)\b", text.lower()):
-        return "en"
-    else:
-        return "unknown"
+    return language_identifier.identify(text or "")
 
-def extract_experiences(text: str) -> List[str]:
+def detect_language(text: str, context: Optional[AnalysisContext] = None) -> str:
     """
-    Extrait les expériences professionnelles (ligne contenant 'experience' ou 'worked at').
+    Détecte la langue du CV (code seul, voir identify_language).
     """
-    return [line for line in text.split("\n") if "experience" in line.lower() or "worked at" in line.lower()]
+    return identify_language(text, context)[0]
 
-def extract_degrees(text: str) -> List[str]:
+def section_lines(text: str, kind: str, context: Optional[AnalysisContext] = None) -> List[str]:
     """
-    Extrait les diplômes du texte.
+    Lignes d'un type donné : lignes de la section correspondante et lignes
+    contenant un mot-clé de ce type (les titres de section sont exclus).
     """
-    degrees = ["master", "licence", "bachelor", "doctorat", "phd", "bac", "bts", "dut", "ingénieur"]
-    return [line for line in text.split("\n") if any(degree in line.lower() for degree in degrees)]
+    return [span.text for span in get_context(text, context).spans
+            if span.kind == kind and span.source != cv_sections.HEADING]
 
-def suggest_skills_for_job(job_title: str) -> List[str]:
+def extract_experiences(text: str, context: Optional[AnalysisContext] = None) -> List[str]:
     """
-    Suggère des compétences pertinentes pour un poste donné en utilisant l'IA
+    Extrait les expériences professionnelles (section "Expérience" ou lignes qui en parlent).
+    """
+    return section_lines(text, cv_sections.EXPERIENCE, context)
+
+def extract_degrees(text: str, context: Optional[AnalysisContext] = None) -> List[str]:
+    """
+    Extrait les diplômes du texte (section "Formation" ou lignes citant un diplôme).
+    """
+    return section_lines(text, cv_sections.EDUCATION, context)
+
+def extract_sections(text: str, context: Optional[AnalysisContext] = None) -> List[Dict[str, Any]]:
+    """
+    Sections du CV avec leurs positions dans le texte.
+    """
+    return [
+        {"type": section.kind, "start": section.start, "end": section.end, "heading": section.heading}
+        for section in get_context(text, context).sections
+    ]
+
+def analyze_cv(text: str, context: Optional[AnalysisContext] = None) -> Dict[str, Any]:
+    """
+    Analyse complète d'un CV avec une seule analyse SpaCy partagée par tous les analyseurs.
+    """
+    context = get_context(text, context)
+    language, confidence = identify_language(text, context)
+    return {
+        "language": language,
+        "language_confidence": confidence,
+        "skills": extract_skills(text, context),
+        "similar_skills": context.similar_skills,
+        "summary": summarize_text(text, context),
+        "evaluation": evaluate_cv(text, context),
+        "experiences": extract_experiences(text, context),
+        "degrees": extract_degrees(text, context),
+        "sections": extract_sections(text, context),
+    }
+
+def analyze_cvs(texts: List[str], batch_size: int = 32, n_process: int = 1) -> List[Dict[str, Any]]:
+    """
+    Analyse un lot de CV avec nlp.pipe. Les résultats sont renvoyés dans l'ordre
+    des textes reçus ; une erreur sur un texte n'interrompt pas le reste du lot.
+    """
+    results: List[Dict[str, Any]] = [{"index": index} for index in range(len(texts))]
+    valid = []
+    for index, text in enumerate(texts):
+        if text and text.strip():
+            valid.append(index)
+        else:
+            results[index]["error"] = "Text is required."
+    
+    docs = parse_many([texts[index] for index in valid], batch_size=batch_size, n_process=n_process)
+    for index, doc in zip(valid, docs):
+        try:
+            if isinstance(doc, Exception):
+                raise doc
+            results[index]["result"] = analyze_cv(texts[index], AnalysisContext(texts[index], doc))
+        except Exception as e:
+            results[index]["error"] = str(e)
+    
+    return results
+
+# Appels aux modèles par opération et réponses de repli servies, par cause
+llm_requests = Counter()
+llm_fallbacks = Counter()
+
+def _record_fallback(operation: str, error: Exception) -> None:
+    reason = outcome_of(error)
+    llm_fallbacks[(operation, reason)] += 1
+    llm_logger.warning(json.dumps({"event": "llm_fallback", "operation": operation, "reason": reason,
+                                   "error": str(error) or type(error).__name__}, ensure_ascii=False))
+
+def llm_metrics() -> Dict[str, Any]:
+    """
+    État des disjoncteurs par modèle, regroupement des prompts, taux de
+    réponses de repli par opération, histogrammes des appels par modèle et
+    template (latence, tokens, issues) et succès du cache par template.
+    """
+    operations = {}
+    for operation, requests in sorted(llm_requests.items()):
+        reasons = {reason: count for (name, reason), count in sorted(llm_fallbacks.items()) if name == operation}
+        fallbacks = sum(reasons.values())
+        operations[operation] = {
+            "requests": requests,
+            "fallbacks": fallbacks,
+            "fallback_rate": round(fallbacks / requests, 4) if requests else 0.0,
+            "reasons": reasons,
+        }
+    return {
+        "breakers": llm_client.breaker_metrics(),
+        "batching": llm_client.batch_metrics(),
+        "operations": operations,
+        **llm_client.metrics.snapshot(),
+    }
+
+# Compétences proposées lorsque le modèle n'est pas disponible
+DEFAULT_SUGGESTED_SKILLS = ["Python", "JavaScript", "Communication", "Travail d'équipe", "Résolution de problèmes"]
+
+# Modèle et version du prompt des suggestions : les changer invalide le cache
+SKILL_SUGGESTION_MODEL = "mistralai/Mistral-7B-Instruct-v0.2"
+SKILL_SUGGESTION_PROMPT_VERSION = "1"
+SKILL_SUGGESTION_TEMPLATE = f"suggest_skills.v{SKILL_SUGGESTION_PROMPT_VERSION}"
+
+skill_suggestions_cache = ResponseCache(settings.LLM_CACHE_SIZE, settings.LLM_CACHE_TTL, settings.LLM_CACHE_STALE_TTL)
+
+async def _generate_job_skills(job_title: str) -> List[str]:
+    """
+    Appel au modèle pour suggérer 5 compétences ; lève une exception en cas d'échec.
     """
-    if not job_title:
-        return ["Python", "JavaScript", "Communication", "Travail d'équipe", "Résolution de problèmes"]
-    
-    client = get_hf_client()
     prompt = f"""
     Suggère 5 compétences professionnelles pertinentes pour un poste de {job_title}.
     Réponds uniquement avec une liste de compétences, sans phrases d'introduction.
     """
     
+    response = await llm_client.text_generation(
+        prompt,
+        model=SKILL_SUGGESTION_MODEL,
+        template=SKILL_SUGGESTION_TEMPLATE,
+        max_new_tokens=150,
+        temperature=0.3,
+        return_full_text=False
+    )
+    
+    # Nettoyer et extraire les compétences
+    skills_text = response.strip()
+    # Diviser par lignes ou par virgules selon le format de réponse
+    if "\n" in skills_text:
+        skills = [s.strip().strip('- ') for s in skills_text.split("\n") if s.strip()]
+    else:
+        skills = [s.strip() for s in skills_text.split(",") if s.strip()]
+    if not skills:
+        raise ValueError("Réponse vide du modèle")
+    
+    # Limiter à 5 compétences
+    return skills[:5]
+
+async def suggest_skills_for_job(job_title: str) -> List[str]:
+    """
+    Suggère des compétences pertinentes pour un poste donné en utilisant l'IA.
+    Les réponses sont mises en cache par intitulé normalisé, modèle et version du prompt.
+    """
+    if not job_title or not fold_text(job_title):
+        return list(DEFAULT_SUGGESTED_SKILLS)
+    
+    key = f"{SKILL_SUGGESTION_MODEL}:{SKILL_SUGGESTION_PROMPT_VERSION}:{fold_text(job_title)}"
+    llm_requests["suggest_skills"] += 1
+    computed = []
+
+    def compute():
+        computed.append(True)
+        return _generate_job_skills(job_title)
+
     try:
-        response = client.text_generation(
-            prompt,
-            model="mistralai/Mistral-7B-Instruct-v0.2",
-            max_new_tokens=150,
-            temperature=0.3,
-            return_full_text=False
-        )
-        
-        # Nettoyer et extraire les compétences
-        skills_text = response.strip()
-        # Diviser par lignes ou par virgules selon le format de réponse
-        if "\n" in skills_text:
-            skills = [s.strip().strip('- ') for s in skills_text.split("\n") if s.strip()]
-        else:
-            skills = [s.strip() for s in skills_text.split(",") if s.strip()]
-        
-        # Limiter à 5 compétences
-        return skills[:5]
+        return list(await skill_suggestions_cache.get_or_compute_async(key, compute))
     except Exception as e:
-        print(f"Erreur lors de la suggestion de compétences: {str(e)}")
+        _record_fallback("suggest_skills", e)
         # Fallback à des compétences génériques
-        return ["Python", "JavaScript", "Communication", "Travail d'équipe", "Résolution de problèmes"]
+        return list(DEFAULT_SUGGESTED_SKILLS)
+    finally:
+        # Succès : réponse en cache ou calcul d'un autre appel en cours
+        llm_client.metrics.record_cache(SKILL_SUGGESTION_TEMPLATE, hit=not computed)
+
+skill_embedder = SkillEmbedder(nlp.vocab)
+_skill_index = {"taxonomy": None, "index": None}
+
+def get_skill_index() -> SkillIndex:
+    """
+    Index vectoriel de toutes les compétences connues (liste commune et taxonomie),
+    ouvert en mmap depuis SKILL_INDEX_PATH et reconstruit si la taxonomie change.
+    """
+    taxonomy = taxonomy_store.get()
+    if _skill_index["taxonomy"] is not taxonomy:
+        vocabulary = list(COMMON_SKILLS)
+        for profile in [taxonomy.generic] + taxonomy.jobs:
+            vocabulary += profile.market_skills + profile.core_skills
+        _skill_index["index"] = SkillIndex.load(settings.SKILL_INDEX_PATH, vocabulary, skill_embedder)
+        _skill_index["taxonomy"] = taxonomy
+    return _skill_index["index"]
+
+def similar_skills(skills: List[str], candidates: Optional[List[str]] = None, k: int = 1) -> List[List[tuple]]:
+    """
+    Compétences connues les plus proches de chaque compétence (recherche groupée
+    en un seul produit matriciel), au-dessus de SKILL_SIMILARITY_THRESHOLD.
+    """
+    return get_skill_index().nearest(skills, k=k, threshold=settings.SKILL_SIMILARITY_THRESHOLD, candidates=candidates)
 
 def compare_with_job_offers(skills: List[str], job_title: str) -> Dict[str, any]:
     """
     Compare les compétences extraites avec celles demandées dans les offres d'emploi.
     """
-    # Compétences couramment demandées pour différents postes (simulation)
-    job_market_skills = {
-        "développeur": ["Python", "JavaScript", "Git", "SQL", "Docker", "CI/CD", "Agile"],
-        "développeur web": ["HTML", "CSS", "JavaScript", "React", "Node.js", "REST API", "GraphQL"],
-        "data scientist": ["Python", "R", "SQL", "Machine Learning", "TensorFlow", "Pandas", "Statistiques"],
-        "designer": ["Photoshop", "Illustrator", "Figma", "UI/UX", "Sketch", "InDesign", "Design Thinking"],
-        "marketing": ["SEO", "Google Analytics", "Content Marketing", "Social Media", "Email Marketing", "CRM"],
-    }
+    # Trouver le poste le plus proche (compétences générales si aucun ne correspond)
+    profile = taxonomy_store.get().market_profile(job_title)
+    target_skills = profile.market_skills
     
-    # Trouver le poste le plus proche
-    target_skills = []
-    for job, market_skills in job_market_skills.items():
-        if job in job_title.lower():
-            target_skills = market_skills
-            break
+    # Calculer le score de correspondance par opérations d'ensembles sur les clés normalisées
+    user_keys = {fold_text(skill) for skill in skills}
+    matched_keys = user_keys & profile.market_keys
     
-    # Si aucun poste correspondant, utiliser des compétences générales
-    if not target_skills:
-        target_skills = ["Communication", "Travail d'équipe", "Résolution de problèmes", "Adaptabilité"]
+    # Compétences proches des compétences demandées restantes ("ReactJS" pour "React")
+    remaining = [skill for skill in skills if fold_text(skill) not in matched_keys]
+    targets = [skill for skill in target_skills if fold_text(skill) not in matched_keys]
+    display = {fold_text(skill): skill for skill in targets}
+    similar = {}
+    for skill, matches in zip(remaining, similar_skills(remaining, targets) if targets else []):
+        key = fold_text(matches[0][0]) if matches else None
+        if key in display and key not in matched_keys:
+            matched_keys.add(key)
+            similar[skill] = display[key]
     
-    # Calculer le score de correspondance
-    matching_skills = [skill for skill in skills if any(market_skill.lower() == skill.lower() for market_skill in target_skills)]
-    missing_skills = [skill for skill in target_skills if not any(skill.lower() == user_skill.lower() for user_skill in skills)]
+    matching_skills = [skill for skill in skills if fold_text(skill) in matched_keys or skill in similar]
+    missing_skills = [skill for skill in target_skills if fold_text(skill) not in matched_keys]
     
-    match_score = len(matching_skills) / len(target_skills) if target_skills else 0
+    match_score = len(matched_keys) / len(profile.market_keys) if profile.market_keys else 0
     
     return {
         "match_score": match_score,
         "matching_skills": matching_skills,
+        "similar_skills": similar,
         "missing_skills": missing_skills,
         "recommended_skills": missing_skills[:3]  # Top 3 compétences à acquérir
     }
 
-def generate_chatbot_response(user_query: str, job_title: Optional[str] = None) -> Dict[str, Any]:
+CHATBOT_MODEL = "mistralai/Mistral-7B-Instruct-v0.2"
+# Identifiants des prompts du chatbot dans les métriques des appels
+CHATBOT_ANSWER_TEMPLATE = "chatbot_answer"
+CHATBOT_SUGGESTIONS_TEMPLATE = "chatbot_suggestions"
+
+# Réponse par défaut en cas d'erreur
+CHATBOT_FALLBACK = {
+    "message": "Je suis désolé, je n'ai pas pu traiter votre demande. Comment puis-je vous aider avec votre CV?",
+    "suggestions": [
+        "Essayez de poser une question plus spécifique",
+        "Demandez des conseils sur une section particulière de votre CV",
+        "Précisez le poste que vous visez pour des conseils plus adaptés"
+    ],
+    "next_step": ""
+}
+
+def chatbot_next_step(user_query: str) -> str:
     """
-    Génère une réponse de chatbot pour guider l'utilisateur dans la création de son CV
-    en utilisant l'API Hugging Face
+    Détection basique d'intention (par mots-clés, sans analyse SpaCy).
     """
-    # Analyser la requête avec SpaCy pour détecter l'intention
-    doc = nlp(user_query.lower())
-    
-    # Mots-clés pour détecter l'intention
     education_keywords = ["éducation", "formation", "diplôme", "études", "école"]
     experience_keywords = ["expérience", "travail", "emploi", "job", "poste"]
     skills_keywords = ["compétence", "savoir-faire", "aptitude", "connaissance"]
     
-    # Détection basique d'intention
-    next_step = ""
-    if any(keyword in user_query.lower() for keyword in education_keywords):
-        next_step = "education"
-    elif any(keyword in user_query.lower() for keyword in experience_keywords):
-        next_step = "experience"
-    elif any(keyword in user_query.lower() for keyword in skills_keywords):
-        next_step = "skills"
-    
-    # Utiliser Hugging Face pour générer une réponse personnalisée
-    client = get_hf_client()
+    query_lower = user_query.lower()
+    if any(keyword in query_lower for keyword in education_keywords):
+        return "education"
+    elif any(keyword in query_lower for keyword in experience_keywords):
+        return "experience"
+    elif any(keyword in query_lower for keyword in skills_keywords):
+        return "skills"
+    return ""
+
+def chatbot_prompts(user_query: str, job_title: Optional[str] = None) -> tuple:
+    """
+    Prompts de la réponse et des suggestions. Les suggestions ne dépendent que de
+    la question : les deux générations peuvent être lancées en même temps.
+    """
+    target = f"Poste visé: {job_title}" if job_title else ""
     prompt = f"""
     Tu es un assistant CV qui aide les utilisateurs à créer un CV professionnel.
     
     Question de l'utilisateur: {user_query}
     
-    {f"Poste visé: {job_title}" if job_title else ""}
+    {target}
     
     Réponds de manière concise et professionnelle avec des conseils pratiques.
     Limite ta réponse à 3-4 phrases maximum.
     """
+    suggestions_prompt = f"""
+    Basé sur cette question d'un utilisateur qui rédige son CV: "{user_query}"
+    
+    {target}
+    
+    Génère 3 suggestions concrètes et pratiques que l'utilisateur peut suivre.
+    Chaque suggestion doit être une phrase courte et actionnable.
+    Réponds uniquement avec la liste des 3 suggestions, sans phrases d'introduction.
+    """
+    return prompt, suggestions_prompt
+
+def parse_chatbot_suggestions(suggestions_response: str) -> List[str]:
+    """
+    Nettoie et extrait les suggestions (3 au maximum).
+    """
+    suggestions_text = suggestions_response.strip()
+    if "\n" in suggestions_text:
+        suggestions = [s.strip().strip('- ') for s in suggestions_text.split("\n") if s.strip()]
+    else:
+        suggestions = [s.strip() for s in suggestions_text.split(".") if s.strip()]
+    return suggestions[:3]
+
+async def generate_chatbot_response(user_query: str, job_title: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Génère une réponse de chatbot pour guider l'utilisateur dans la création de son CV
+    en utilisant l'API Hugging Face (réponse et suggestions générées en parallèle)
+    """
+    next_step = chatbot_next_step(user_query)
+    prompt, suggestions_prompt = chatbot_prompts(user_query, job_title)
+    llm_requests["chatbot"] += 1
     
     try:
-        response = client.text_generation(
-            prompt,
-            model="mistralai/Mistral-7B-Instruct-v0.2",
-            max_new_tokens=200,
-            temperature=0.7,
-            return_full_text=False
-        )
-        
-        # Générer des suggestions basées sur la réponse
-        suggestions_prompt = f"""
-        Basé sur cette question: "{user_query}"
-        
-        Et cette réponse: "{response}"
-        
-        Génère 3 suggestions concrètes et pratiques que l'utilisateur peut suivre.
-        Chaque suggestion doit être une phrase courte et actionnable.
-        Réponds uniquement avec la liste des 3 suggestions, sans phrases d'introduction.
-        """
-        
-        suggestions_response = client.text_generation(
-            suggestions_prompt,
-            model="mistralai/Mistral-7B-Instruct-v0.2",
-            max_new_tokens=150,
-            temperature=0.5,
-            return_full_text=False
+        response, suggestions_response = await asyncio.gather(
+            llm_client.text_generation(
+                prompt,
+                model=CHATBOT_MODEL,
+                template=CHATBOT_ANSWER_TEMPLATE,
+                max_new_tokens=200,
+                temperature=0.7,
+                return_full_text=False
+            ),
+            llm_client.text_generation(
+                suggestions_prompt,
+                model=CHATBOT_MODEL,
+                template=CHATBOT_SUGGESTIONS_TEMPLATE,
+                max_new_tokens=150,
+                temperature=0.5,
+                return_full_text=False
+            ),
         )
         
-        # Nettoyer et extraire les suggestions
-        suggestions_text = suggestions_response.strip()
-        if "\n" in suggestions_text:
-            suggestions = [s.strip().strip('- ') for s in suggestions_text.split("\n") if s.strip()]
-        else:
-            suggestions = [s.strip() for s in suggestions_text.split(".") if s.strip()]
-        
-        # Limiter à 3 suggestions
-        suggestions = suggestions[:3]
-        
         return {
             "message": response.strip(),
-            "suggestions": suggestions,
+            "suggestions": parse_chatbot_suggestions(suggestions_response),
             "next_step": next_step
         }
     except Exception as e:
-        print(f"Erreur lors de la génération de réponse: {str(e)}")
-        # Réponse par défaut en cas d'erreur
-        return {
-            "message": "Je suis désolé, je n'ai pas pu traiter votre demande. Comment puis-je vous aider avec votre CV?",
-            "suggestions": [
-                "Essayez de poser une question plus spécifique",
-                "Demandez des conseils sur une section particulière de votre CV",
-                "Précisez le poste que vous visez pour des conseils plus adaptés"
-            ],
-            "next_step": ""
-        }
+        _record_fallback("chatbot", e)
+        return dict(CHATBOT_FALLBACK, suggestions=list(CHATBOT_FALLBACK["suggestions"]))
+
+async def stream_chatbot_response(user_query: str, job_title: Optional[str] = None) -> AsyncIterator[tuple]:
+    """
+    Variante en streaming de generate_chatbot_response : produit ("token", texte)
+    au fil de la génération de la réponse, puis un dernier événement
+    ("suggestions", {message, suggestions, next_step}). Les suggestions sont
+    générées en parallèle de la réponse.
+    """
+    next_step = chatbot_next_step(user_query)
+    prompt, suggestions_prompt = chatbot_prompts(user_query, job_title)
+    llm_requests["chatbot_stream"] += 1
+    suggestions_task = asyncio.ensure_future(llm_client.text_generation(
+        suggestions_prompt,
+        model=CHATBOT_MODEL,
+        template=CHATBOT_SUGGESTIONS_TEMPLATE,
+        max_new_tokens=150,
+        temperature=0.5,
+        return_full_text=False
+    ))
+    # L'erreur éventuelle des suggestions est traitée même si la tâche n'est pas attendue
+    suggestions_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+    
+    message = []
+    try:
+        async for token in llm_client.stream_text_generation(
+            prompt,
+            model=CHATBOT_MODEL,
+            template=CHATBOT_ANSWER_TEMPLATE,
+            max_new_tokens=200,
+            temperature=0.7,
+            return_full_text=False
+        ):
+            message.append(token)
+            yield "token", token
+        suggestions = parse_chatbot_suggestions(await suggestions_task)
+        yield "suggestions", {"message": "".join(message).strip(), "suggestions": suggestions, "next_step": next_step}
+    except Exception as e:
+        _record_fallback("chatbot_stream", e)
+        yield "error", {"detail": "La génération de la réponse a échoué."}
+        yield "suggestions", dict(CHATBOT_FALLBACK, suggestions=list(CHATBOT_FALLBACK["suggestions"]))
+    finally:
+        # Erreur ou client déconnecté : ne pas laisser tourner la génération des suggestions
+        if not suggestions_task.done():
+            suggestions_task.cancel()
 
 def get_job_specific_skills(job_title: str) -> List[str]:
     """
     Retourne des compétences spécifiques à un métier donné
+    (compétences génériques si le métier n'est pas dans la taxonomie)
     """
-    # Dictionnaire de compétences par métier (à enrichir)
-    job_skills = {
-        "développeur": ["JavaScript", "Python", "Git", "SQL", "Résolution de problèmes"],
-        "data scientist": ["Python", "R", "Machine Learning", "SQL", "Statistiques"],
-        "marketing": ["SEO", "Réseaux sociaux", "Google Analytics", "Copywriting"],
-        "designer": ["Photoshop", "Illustrator", "UI/UX", "Figma", "InDesign"]
-    }
-    
-    # Rechercher le métier dans le dictionnaire (recherche partielle)
-    for job, skills in job_skills.items():
-        if job in job_title.lower():
-            return skills
-    
-    # Métier non trouvé, retourner des compétences génériques
-    return ["Communication", "Organisation", "Adaptabilité", "Travail d'équipe"]
+    return taxonomy_store.get().core_skills(job_title)
+
+_job_matrix = {"taxonomy": None, "matrix": None}
+
+def get_job_matrix() -> JobSkillMatrix:
+    """
+    Matrice métier×compétence des métiers évalués, recompilée uniquement
+    lorsque la taxonomie est rechargée.
+    """
+    taxonomy = taxonomy_store.get()
+    if _job_matrix["taxonomy"] is not taxonomy:
+        _job_matrix["matrix"] = JobSkillMatrix({job: taxonomy.core_skills(job) for job in taxonomy.relevance_jobs})
+        _job_matrix["taxonomy"] = taxonomy
+    return _job_matrix["matrix"]
 
-def calculate_job_relevance(cv_text: str) -> Dict[str, float]:
+def expand_skills(skill_lists: List[List[str]]) -> List[List[str]]:
+    """
+    Ajoute à chaque liste les compétences métiers proches ("postgresql" -> "sql"),
+    avec une seule recherche pour toutes les compétences de tous les CV.
+    """
+    flat = [skill for skills in skill_lists for skill in skills]
+    matches = iter(similar_skills(flat, get_job_matrix().skills, k=3))
+    expanded = []
+    for skills in skill_lists:
+        known = {skill.lower() for skill in skills}
+        extra = []
+        for _ in skills:
+            for skill, _score in next(matches):
+                if skill not in known:
+                    known.add(skill)
+                    extra.append(skill)
+        expanded.append(list(skills) + extra)
+    return expanded
+
+def calculate_job_relevance(cv_text: str, context: Optional[AnalysisContext] = None, jobs: Optional[List[str]] = None) -> Dict[str, float]:
     """
     Calcule un score de pertinence du CV pour différents métiers
     """
-    # Liste de métiers à évaluer
-    jobs = ["développeur", "data scientist", "marketing", "designer", "chef de projet", "commercial"]
-    
-    # Extraire les compétences du CV
-    cv_skills = extract_skills(cv_text)
-    
-    # Calculer les scores pour chaque métier
-    scores = {}
-    for job in jobs:
-        job_skills = get_job_specific_skills(job)
-        
-        # Calculer le nombre de compétences correspondantes
-        matching_skills = sum(1 for skill in cv_skills if any(job_skill.lower() in skill.lower() for job_skill in job_skills))
-        
-        # Calculer le score (0-1)
-        score = min(matching_skills / max(len(job_skills), 1), 1.0)
-        scores[job] = round(score, 2)
-    
-    # Trier les scores par ordre décroissant
-    return dict(sorted(scores.items(), key=lambda x: x[1], reverse=True))
+    cv_skills = get_context(cv_text, context).skills
+    return get_job_matrix().score(expand_skills([cv_skills])[0], jobs)
+
+def calculate_job_relevance_batch(cv_texts: List[str], jobs: Optional[List[str]] = None) -> List[Dict[str, float]]:
+    """
+    Calcule en un seul appel les scores de pertinence de plusieurs CV
+    (les textes sont analysés par lots avec nlp.pipe).
+    """
+    docs = parse_many(cv_texts)
+    skill_lists = [[] if isinstance(doc, Exception) else AnalysisContext(text, doc).skills
+                   for text, doc in zip(cv_texts, docs)]
+    return get_job_matrix().score_many(expand_skills(skill_lists), jobs)
 
 def suggest_cv_improvements(cv_text: str) -> Dict[str, Any]:
     """
     Analyse le CV et suggère des améliorations
     """
-    # Analyser le CV avec SpaCy
-    doc = nlp(cv_text)
+    # Seul le découpage en phrases est utilisé
+    doc = parse(cv_text, "sentences")
     
     # Suggestions de style
     style_suggestions = [
@@ -375,31 +750,35 @@ def suggest_cv_improvements(cv_text: str) -> Dict[str, Any]:
         "improved_sections": improved_sections
     }
 
-async def extract_text_from_pdf(file: UploadFile) -> str:
+def pdf_text(stream, stop_chars: int = 0) -> str:
     """
-    Extrait le texte d'un fichier PDF
+    Texte d'un PDF lu depuis un fichier ouvert (voir pdf_extract : backend
+    configuré, pages en parallèle pour les gros documents, nombre de pages borné).
     """
-    content = await file.read()
-    pdf_file = BytesIO(content)
-    
-    text = ""
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-    
-    return text
+    return pdf_extractor.extract(stream, stop_chars=stop_chars)
+
+def docx_text(stream) -> str:
+    """
+    Texte d'un DOCX lu depuis un fichier ouvert (voir docx_extract : lecture
+    en flux du XML, tableaux, zones de texte, en-têtes et pieds de page compris).
+    """
+    return docx_extract.extract(stream)
+
+async def extract_text_from_pdf(file: UploadFile, stop_chars: int = 0) -> str:
+    """
+    Extrait le texte d'un fichier PDF (lu depuis le fichier temporaire de
+    l'upload, dans le threadpool) ; stop_chars arrête la lecture des pages
+    une fois ce nombre de caractères atteint
+    """
+    await file.seek(0)
+    return await run_in_threadpool(pdf_text, file.file, stop_chars)
 
 async def extract_text_from_docx(file: UploadFile) -> str:
     """
     Extrait le texte d'un fichier DOCX
     """
-    content = await file.read()
-    docx_file = BytesIO(content)
-    
-    doc = docx.Document(docx_file)
-    text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-    
-    return text
+    await file.seek(0)
+    return await run_in_threadpool(docx_text, file.file)
 
 def generate_cover_letter(cv_text: str, job_title: str, company_name: str, tone: str = "professional") -> str:
     """
@@ -0,0 +1,186 @@
+"""
+Extraction du texte des PDF avec des backends interchangeables.
+
+- "pdfium" (pypdfium2, installé avec pdfplumber) : extraction native, rapide,
+  dans l'ordre du flux de contenu ; backend par défaut.
+- "pdfplumber" : reconstruit les lignes à partir de la position des
+  caractères, plus lent mais utile pour les mises en page particulières.
+
+Les PDF d'au moins PDF_PARALLEL_MIN_PAGES pages sont découpés en plages de
+pages réparties sur un pool de processus. PDF_MAX_PAGES borne le nombre de
+pages lues et stop_chars arrête l'extraction dès que le texte obtenu est
+suffisant (tri de CV : les premières pages suffisent).
+"""
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+
+import pdfplumber
+import pypdfium2 as pdfium
+
+from app.config import settings
+
+Source = Union[str, BinaryIO]
+
+# PDFium n'est pas thread-safe, même pour des documents distincts : tous les
+# appels d'un processus passent par ce verrou (extractions simultanées dans le
+# threadpool, workers d'import). Le parallélisme passe par le pool de processus.
+_pdfium_lock = threading.RLock()
+
+
+def _pdfium_pages(source: Source, start: int, stop: Optional[int]) -> Iterator[str]:
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(source)
+        pages = len(pdf)
+    try:
+        for index in range(start, min(stop if stop is not None else pages, pages)):
+            with _pdfium_lock:
+                page = pdf[index]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+            yield text.replace("\r\n", "\n").replace("\r", "\n")
+    finally:
+        with _pdfium_lock:
+            pdf.close()
+
+
+def _pdfplumber_pages(source: Source, start: int, stop: Optional[int]) -> Iterator[str]:
+    with pdfplumber.open(source) as pdf:
+        for page in pdf.pages[start:stop]:
+            text = page.extract_text() or ""
+            # Libère les caractères et objets de la page déjà traitée
+            page.close()
+            yield text
+
+
+BACKENDS: Dict[str, Callable[[Source, int, Optional[int]], Iterator[str]]] = {
+    "pdfium": _pdfium_pages,
+    "pdfplumber": _pdfplumber_pages,
+}
+
+
+def page_count(source: Source) -> int:
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(source)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+def iter_pages(source: Source, backend: str = "pdfium", start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """
+    Texte des pages [start, stop) une par une avec le backend choisi : le
+    document est fermé dès que l'itération s'arrête.
+    """
+    try:
+        pages = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Backend d'extraction PDF inconnu: {backend}") from None
+    return pages(source, start, stop)
+
+
+def extract_pages(source: Source, backend: str = "pdfium", start: int = 0, stop: Optional[int] = None) -> List[str]:
+    # Exécutée dans les processus du pool, d'où une fonction de module
+    return list(iter_pages(source, backend, start, stop))
+
+
+class PDFExtractor:
+    """
+    Extraction page par page, ou par plages de pages en parallèle pour les gros documents.
+    """
+
+    def __init__(self, backend: str = "pdfium", max_pages: int = 0, workers: int = 0, parallel_min_pages: int = 32):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend d'extraction PDF inconnu: {backend}")
+        self.backend = backend
+        self.max_pages = max_pages
+        self.workers = workers
+        self.parallel_min_pages = parallel_min_pages
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def extract(self, stream: BinaryIO, stop_chars: int = 0, backend: Optional[str] = None) -> str:
+        """
+        Texte du PDF (pages séparées par un saut de ligne), au plus max_pages
+        pages ; avec stop_chars, s'arrête après la page qui atteint ce nombre de caractères.
+        """
+        backend = backend or self.backend
+        stream.seek(0)
+        pages = page_count(stream)
+        if self.max_pages:
+            pages = min(pages, self.max_pages)
+        if self.workers > 1 and pages >= self.parallel_min_pages:
+            texts = self._extract_parallel(stream, backend, pages, stop_chars)
+        else:
+            texts = self._extract_sequential(stream, backend, pages, stop_chars)
+        return "\n".join(texts)
+
+    def _extract_sequential(self, stream: BinaryIO, backend: str, pages: int, stop_chars: int) -> List[str]:
+        stream.seek(0)
+        texts, size = [], 0
+        page_texts = iter_pages(stream, backend, 0, pages)
+        try:
+            for text in page_texts:
+                texts.append(text)
+                size += len(text)
+                if stop_chars and size >= stop_chars:
+                    break
+        finally:
+            page_texts.close()
+        return texts
+
+    def _extract_parallel(self, stream: BinaryIO, backend: str, pages: int, stop_chars: int) -> List[str]:
+        # Les processus ouvrent le fichier par son chemin : copie sur disque si
+        # le flux n'en a pas (fichier temporaire anonyme de l'upload)
+        path = getattr(stream, "name", None)
+        copied = None
+        if not isinstance(path, str) or not os.path.isfile(path):
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as copy:
+                stream.seek(0)
+                shutil.copyfileobj(stream, copy, 1024 * 1024)
+            path = copied = copy.name
+        try:
+            chunk = max(1, -(-pages // (self.workers * 2)))
+            executor = self._get_executor()
+            futures = [executor.submit(extract_pages, path, backend, start, min(start + chunk, pages))
+                       for start in range(0, pages, chunk)]
+            texts, size = [], 0
+            for index, future in enumerate(futures):
+                for text in future.result():
+                    texts.append(text)
+                    size += len(text)
+                    if stop_chars and size >= stop_chars:
+                        # Les plages suivantes ne sont pas lues (ou leur résultat est ignoré)
+                        for pending in futures[index + 1:]:
+                            pending.cancel()
+                        return texts
+            return texts
+        finally:
+            if copied is not None:
+                os.remove(copied)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+pdf_extractor = PDFExtractor(
+    backend=settings.PDF_BACKEND,
+    max_pages=settings.PDF_MAX_PAGES,
+    workers=settings.PDF_WORKERS,
+    parallel_min_pages=settings.PDF_PARALLEL_MIN_PAGES,
+)
@@ -0,0 +1,152 @@
+"""
+Cache des réponses des modèles de langage (Hugging Face).
+
+Les appels au modèle prennent plusieurs secondes alors que les mêmes requêtes
+(par exemple les mêmes intitulés de poste) reviennent toute la journée :
+- les réponses sont conservées avec une durée de validité (TTL) et un nombre
+  d'entrées borné (LRU) ;
+- des requêtes simultanées pour la même clé ne déclenchent qu'un seul appel,
+  les autres attendent son résultat (single-flight) ;
+- une entrée expirée reste servie pendant une période de grâce, le temps
+  qu'un rafraîchissement en arrière-plan la remplace.
+Les échecs ne sont jamais mis en cache.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Set
+
+logger = logging.getLogger("smartcv.llm")
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float
+    stale_until: float
+
+
+class ResponseCache:
+    """
+    Cache TTL + LRU thread-safe avec regroupement des appels concurrents et
+    rafraîchissement en arrière-plan des entrées expirées.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 86400.0, stale_ttl: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = Counter()
+        self._clock = clock
+        self._data: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get_or_compute_async(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Retourne la valeur en cache pour key, ou la calcule avec compute() (une
+        coroutine). Un seul appel est en cours par clé : les appelants
+        concurrents attendent son résultat, erreur comprise. Le rafraîchissement
+        des entrées périmées est une tâche de la boucle d'événements.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            now = self._clock()
+            with self._lock:
+                entry = self._data.get(key)
+                if entry is not None:
+                    self._data.move_to_end(key)
+                    if now < entry.expires_at:
+                        self.stats["hits"] += 1
+                        return entry.value
+                    if now < entry.stale_until:
+                        self.stats["stale_hits"] += 1
+                        if key not in self._in_flight:
+                            future = self._in_flight[key] = loop.create_future()
+                            self.stats["refreshes"] += 1
+                            task = loop.create_task(self._refresh_async(key, compute, future))
+                            self._tasks.add(task)
+                            task.add_done_callback(self._tasks.discard)
+                        return entry.value
+                future = self._in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._in_flight[key] = loop.create_future()
+                    self.stats["misses"] += 1
+                else:
+                    self.stats["coalesced"] += 1
+
+            if leader:
+                return await self._compute_async(key, compute, future)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Appel principal annulé (client déconnecté) : recommencer
+                if future.cancelled():
+                    continue
+                raise
+
+    async def _compute_async(self, key: str, compute: Callable[[], Awaitable[Any]], future: asyncio.Future) -> Any:
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.cancel()
+            raise
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                self.stats["errors"] += 1
+            future.set_exception(e)
+            # L'erreur est transmise aux appelants en attente, s'il y en a
+            future.exception()
+            raise
+        self.put(key, value)
+        with self._lock:
+            self._in_flight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    async def _refresh_async(self, key: str, compute: Callable[[], Awaitable[Any]], future: asyncio.Future) -> None:
+        try:
+            await self._compute_async(key, compute, future)
+        except Exception as e:
+            # L'entrée périmée reste servie jusqu'à la fin de sa période de grâce
+            logger.warning(json.dumps({"event": "llm_cache_refresh_error", "key": key,
+                                       "error": str(e) or type(e).__name__}, ensure_ascii=False))
+
+    def put(self, key: str, value: Any) -> None:
+        now = self._clock()
+        with self._lock:
+            self._data[key] = _Entry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "in_flight": len(self._in_flight),
+                "hits": self.stats["hits"],
+                "stale_hits": self.stats["stale_hits"],
+                "misses": self.stats["misses"],
+                "coalesced": self.stats["coalesced"],
+                "refreshes": self.stats["refreshes"],
+                "errors": self.stats["errors"],
+                "evictions": self.stats["evictions"],
+            }
@@ -1,4 +1,7 @@
+import json
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Dict, List
 from pydantic import BaseModel
@@ -23,7 +26,7 @@ class AssistantResponse(BaseModel):
     message: str = ""
 
 @router.post("/guide", response_model=AssistantResponse)
-def get_cv_guidance(request: AssistantRequest, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def get_cv_guidance(request: AssistantRequest, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     """
     Guide interactif pour aider à remplir le CV étape par étape
     """
@@ -60,7 +63,7 @@ def get_cv_guidance(request: AssistantRequest, db: Session = Depends(get_db), cu
         }
     elif request.step == "skills":
         # Utiliser le job_title pour suggérer des compétences pertinentes
-        job_skills = nlp_utils.suggest_skills_for_job(request.job_title)
+        job_skills = await nlp_utils.suggest_skills_for_job(request.job_title)
         return {
             "suggestions": job_skills,
             "next_step": "summary",
@@ -78,16 +81,34 @@ def get_cv_guidance(request: AssistantRequest, db: Session = Depends(get_db), cu
         }
 
 @router.post("/chatbot", response_model=AssistantResponse)
-def cv_chatbot(request: AssistantRequest, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def cv_chatbot(request: AssistantRequest, current_user: models.User = Depends(get_current_user)):
     """
     Chatbot IA pour guider l'utilisateur dans la création de son CV
     """
-    # Utiliser SpaCy ou Transformers pour analyser la question et générer une réponse
+    # Appels au modèle asynchrones : aucun thread n'est bloqué pendant la génération
     user_query = request.text
-    response = nlp_utils.generate_chatbot_response(user_query, request.job_title)
+    response = await nlp_utils.generate_chatbot_response(user_query, request.job_title)
     
     return {
         "suggestions": response["suggestions"],
         "next_step": response["next_step"],
         "message": response["message"]
     }
+
+@router.post("/chatbot/stream")
+async def cv_chatbot_stream(request: AssistantRequest, current_user: models.User = Depends(get_current_user)):
+    """
+    Variante en streaming du chatbot (Server-Sent Events) : un événement "token"
+    par fragment de réponse dès sa génération, puis un événement final
+    "suggestions" avec le message complet, les suggestions et l'étape suivante.
+    """
+    async def events():
+        async for event, data in nlp_utils.stream_chatbot_response(request.text, request.job_title):
+            payload = {"text": data} if event == "token" else data
+            yield f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
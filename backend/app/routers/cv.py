@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import CV
-from app.schemas import CVCreate, CVOut
+from app.schemas import CVCreate, CVOut, ImportJobOut
 from app.auth import get_current_user
-from app import nlp_utils  # Importation correcte
+from app import analysis_cache, file_blobs
+from app.nlp_pool import run_nlp
+from app.config import settings
+from app.import_jobs import FINISHED, SUPPORTED_EXTENSIONS, import_jobs
+from app.bulk_import import BulkImportError, bulk_importer
 # Commentez ou supprimez cette ligne si vous n'utilisez pas qrcode pour l'instant
 # import qrcode
 from io import BytesIO
@@ -20,28 +30,110 @@ def create_cv(cv: CVCreate, db: Session = Depends(get_db), current_user = Depend
     db.refresh(db_cv)
     return db_cv
 
-@router.post("/import", response_model=CVOut)
+@router.post("/import", response_model=ImportJobOut, status_code=202)
 async def import_cv(
     file: UploadFile,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=200),
     db: Session = Depends(get_db), 
     current_user = Depends(get_current_user)
 ):
     """
-    Importe un CV depuis un fichier PDF ou DOCX
+    Importe un CV depuis un fichier PDF ou DOCX. Le fichier est mis en file
+    d'attente et la réponse (202) contient le job d'import : extraction,
+    analyse et création du CV sont faites par les workers d'import. Suivre le
+    job avec GET /cv/import/jobs/{id} ou son flux /events. Une requête
+    renvoyée avec le même en-tête Idempotency-Key retourne le même job.
     """
     # Vérifier le type de fichier
-    if file.filename.endswith('.pdf'):
-        cv_text = await nlp_utils.extract_text_from_pdf(file)
-    elif file.filename.endswith('.docx'):
-        cv_text = await nlp_utils.extract_text_from_docx(file)
-    else:
+    if not file.filename.lower().endswith(SUPPORTED_EXTENSIONS):
         raise HTTPException(status_code=400, detail="Format de fichier non supporté")
     
-    # Créer un nouveau CV avec le texte extrait
-    db_cv = CV(user_id=current_user.id, data=cv_text)
-    db.add(db_cv)
-    db.commit()
-    db.refresh(db_cv)
-    return db_cv
+    job, _ = await import_jobs.enqueue(db, current_user.id, file.filename, file.file, idempotency_key)
+    response.headers["Location"] = f"/cv/import/jobs/{job.id}"
+    return job
+
+@router.post("/import/bulk")
+async def import_cv_archive(
+    file: UploadFile,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Importe en une requête tous les CV PDF/DOCX d'une archive ZIP. Les fichiers
+    sont extraits en parallèle et les CV créés par lots ; la réponse détaille
+    le résultat de chaque fichier ("imported", "failed" ou "skipped").
+    """
+    if not file.filename.lower().endswith(".zip"):
+        raise HTTPException(status_code=400, detail="Format de fichier non supporté")
+    try:
+        return await bulk_importer.import_archive(db, current_user.id, file.file)
+    except BulkImportError:
+        raise HTTPException(status_code=400, detail="Archive ZIP invalide")
 
+@router.get("/import/metrics")
+def import_metrics(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """
+    Déduplication des fichiers importés : blobs, imports en double, octets
+    économisés et extractions évitées.
+    """
+    return file_blobs.metrics(db)
 
+@router.get("/import/jobs/{job_id}", response_model=ImportJobOut)
+async def get_import_job(job_id: str, current_user = Depends(get_current_user)):
+    """
+    État d'un job d'import ; cv_id est renseigné une fois le CV créé.
+    """
+    job = await run_in_threadpool(import_jobs.get, job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+@router.get("/import/jobs/{job_id}/events")
+async def import_job_events(job_id: str, current_user = Depends(get_current_user)):
+    """
+    Suivi d'un job d'import (Server-Sent Events) : un événement "status" à
+    chaque changement d'état, le flux se termine avec le job.
+    """
+    job = await run_in_threadpool(import_jobs.get, job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    async def events():
+        current, last = job, None
+        while True:
+            state = ImportJobOut.model_validate(current).model_dump(mode="json")
+            if state != last:
+                last = state
+                yield f"event: status\ndata: {json.dumps(state, ensure_ascii=False)}\n\n"
+            if current.status in FINISHED:
+                return
+            await asyncio.sleep(settings.IMPORT_POLL_INTERVAL)
+            current = await run_in_threadpool(import_jobs.get, job_id, current_user.id)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/{cv_id}/analyze")
+async def analyze_cv(
+    cv_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Analyse NLP d'un CV enregistré. Le résultat est mis en cache et enregistré
+    sur le CV : une nouvelle analyse d'un CV inchangé ne relance pas SpaCy.
+    """
+    db_cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
+    if not db_cv:
+        raise HTTPException(status_code=404, detail="CV not found")
+    if not db_cv.data:
+        raise HTTPException(status_code=400, detail="Text is required.")
+    
+    analysis = await analysis_cache.get_analysis(db_cv.data, lambda text: run_nlp("analyze_cv", text), cv=db_cv)
+    if db.is_modified(db_cv):
+        db.commit()
+    return analysis
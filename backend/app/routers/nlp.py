@@ -3,8 +3,10 @@ Router NLP pour FastAPI : expose les endpoints d'analyse NLP pour les CV.
 Importe et utilise les fonctions du module app/nlp_utils.py.
 """
 from fastapi import APIRouter, HTTPException
-from app.schemas import NLPAnalysis
-from app import nlp_utils
+from app.schemas import NLPAnalysis, NLPBatchAnalysis
+from app.config import settings
+from app import nlp_utils, analysis_cache
+from app.nlp_pool import pool, run_nlp
 
 router = APIRouter(
     prefix="/nlp",
@@ -12,38 +14,60 @@ router = APIRouter(
 )
 
 @router.post("/analyze", summary="Analyse NLP complète d'un texte")
-def analyze_nlp(data: NLPAnalysis):
+async def analyze_nlp(data: NLPAnalysis):
     """
     Endpoint principal : retourne toutes les analyses NLP (langue, compétences, résumé, évaluation, expériences, diplômes)
     """
     if not data.text:
         raise HTTPException(status_code=400, detail="Text is required.")
+    # Une seule analyse SpaCy partagée par tous les analyseurs, mise en cache par contenu
+    return await analysis_cache.get_analysis(data.text, lambda text: run_nlp("analyze_cv", text))
+
+@router.post("/analyze/batch", summary="Analyse NLP d'un lot de textes")
+async def analyze_nlp_batch(data: NLPBatchAnalysis):
+    """
+    Analyse plusieurs CV en un seul appel avec nlp.pipe.
+    Les résultats suivent l'ordre des textes reçus ; chaque élément contient
+    soit "result", soit "error".
+    """
+    if not data.texts:
+        raise HTTPException(status_code=400, detail="Texts are required.")
+    if len(data.texts) > settings.NLP_BATCH_MAX_TEXTS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.NLP_BATCH_MAX_TEXTS} texts per batch.")
+    batch_size = settings.NLP_BATCH_SIZE if data.batch_size is None else data.batch_size
+    n_process = min(settings.NLP_N_PROCESS, settings.NLP_MAX_N_PROCESS) if data.n_process is None else data.n_process
+    
+    results = await run_nlp("analyze_cvs", data.texts, batch_size=batch_size, n_process=n_process)
     return {
-        "language": nlp_utils.detect_language(data.text),
-        "skills": nlp_utils.extract_skills(data.text),
-        "summary": nlp_utils.summarize_text(data.text),
-        "evaluation": nlp_utils.evaluate_cv(data.text),
-        "experiences": nlp_utils.extract_experiences(data.text),
-        "degrees": nlp_utils.extract_degrees(data.text),
+        "results": results,
+        "count": len(results),
+        "errors": sum(1 for item in results if "error" in item),
     }
 
 @router.post("/skills", summary="Extraire les compétences d'un texte")
-def extract_skills_endpoint(data: NLPAnalysis):
+async def extract_skills_endpoint(data: NLPAnalysis):
     """
     Extrait uniquement les compétences d'un texte
     """
     if not data.text:
         raise HTTPException(status_code=400, detail="Text is required.")
-    return {"skills": nlp_utils.extract_skills(data.text)}
+    return {"skills": await run_nlp("extract_skills", data.text)}
 
 @router.post("/suggest-skills", summary="Suggérer des compétences pour un poste")
-def suggest_skills_endpoint(job_title: str):
+async def suggest_skills_endpoint(job_title: str):
     """
     Suggère des compétences pertinentes pour un poste donné
     """
     if not job_title:
         raise HTTPException(status_code=400, detail="Job title is required.")
-    return {"suggested_skills": nlp_utils.suggest_skills_for_job(job_title)}
+    return {"suggested_skills": await nlp_utils.suggest_skills_for_job(job_title)}
+
+@router.get("/suggest-skills/cache/metrics", summary="Statistiques du cache des suggestions")
+def suggest_skills_cache_metrics():
+    """
+    Succès, réponses périmées servies, appels regroupés et rafraîchissements du cache des suggestions
+    """
+    return nlp_utils.skill_suggestions_cache.metrics()
 
 @router.post("/compare-with-market", summary="Comparer les compétences avec le marché")
 def compare_with_market(skills: list[str], job_title: str):
@@ -55,7 +79,7 @@ def compare_with_market(skills: list[str], job_title: str):
     return nlp_utils.compare_with_job_offers(skills, job_title)
 
 @router.post("/job-relevance-score", summary="Calculer le score de pertinence pour différents métiers")
-def job_relevance_score(data: NLPAnalysis):
+async def job_relevance_score(data: NLPAnalysis):
     """
     Calcule un score de pertinence du CV pour différents métiers
     """
@@ -63,20 +87,52 @@ def job_relevance_score(data: NLPAnalysis):
         raise HTTPException(status_code=400, detail="Text is required.")
     
     # Analyser le CV et calculer des scores pour différents métiers
-    return {"job_scores": nlp_utils.calculate_job_relevance(data.text)}
+    return {"job_scores": await run_nlp("calculate_job_relevance", data.text)}
+
+@router.post("/job-relevance-score/batch", summary="Scores de pertinence métiers pour un lot de CV")
+async def job_relevance_score_batch(data: NLPBatchAnalysis):
+    """
+    Calcule en un seul appel les scores de pertinence de plusieurs CV, dans l'ordre des textes reçus
+    """
+    if not data.texts:
+        raise HTTPException(status_code=400, detail="Texts are required.")
+    if len(data.texts) > settings.NLP_BATCH_MAX_TEXTS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.NLP_BATCH_MAX_TEXTS} texts per batch.")
+    return {"job_scores": await run_nlp("calculate_job_relevance_batch", data.texts)}
 
 @router.post("/improve-cv", summary="Suggestions d'améliorations pour le CV")
-def improve_cv(data: NLPAnalysis):
+async def improve_cv(data: NLPAnalysis):
     """
     Analyse le CV et suggère des améliorations
     """
     if not data.text:
         raise HTTPException(status_code=400, detail="Text is required.")
     
-    improvements = nlp_utils.suggest_cv_improvements(data.text)
+    improvements = await run_nlp("suggest_cv_improvements", data.text)
     return {
         "style_suggestions": improvements["style"],
         "content_suggestions": improvements["content"],
         "grammar_issues": improvements["grammar"],
         "improved_sections": improvements["improved_sections"]
     }
+
+@router.get("/pool/metrics", summary="Métriques du pool de workers NLP")
+def pool_metrics():
+    """
+    Profondeur de la file d'attente et taux d'occupation des workers NLP
+    """
+    return pool.metrics()
+
+@router.get("/cache/metrics", summary="Métriques du cache d'analyses")
+def cache_metrics():
+    """
+    Taille, succès et évictions du cache d'analyses NLP
+    """
+    return analysis_cache.metrics()
+
+@router.get("/llm/metrics", summary="Disjoncteurs et réponses de repli des modèles de langage")
+def llm_metrics():
+    """
+    État du disjoncteur de chaque modèle et taux de réponses de repli par opération
+    """
+    return nlp_utils.llm_metrics()
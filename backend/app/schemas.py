@@ -1,7 +1,9 @@
-from pydantic import BaseModel, EmailStr, HttpUrl
+from pydantic import BaseModel, EmailStr, Field, HttpUrl
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 
+from app.config import settings
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -35,9 +37,29 @@ class CVOut(BaseModel):
     class Config:
         from_attributes = True
 
+class ImportJobOut(BaseModel):
+    id: str
+    status: str
+    filename: str
+    attempts: int
+    error: Optional[str] = None
+    cv_id: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class NLPAnalysis(BaseModel):
     text: str
 
+class NLPBatchAnalysis(BaseModel):
+    texts: List[str]
+    # Bornés : le nombre de processus lancés par requête ne dépend pas du client
+    batch_size: Optional[int] = Field(None, ge=1, le=settings.NLP_BATCH_MAX_TEXTS)
+    n_process: Optional[int] = Field(None, ge=1, le=settings.NLP_MAX_N_PROCESS)
+
 class SkillsRequest(BaseModel):
     skills: list[str]
     job_title: str
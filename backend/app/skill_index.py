@@ -0,0 +1,219 @@
+"""
+Index vectoriel des compétences pour la comparaison sémantique.
+
+Chaque compétence de la taxonomie est représentée par un vecteur en deux blocs,
+chacun de norme 1 :
+- la moyenne des vecteurs de mots du modèle SpaCy ("postgresql" proche de "sql") ;
+- un vecteur haché de trigrammes de caractères, qui couvre les mots absents du
+  vocabulaire du modèle ("reactjs" proche de "react").
+
+La matrice est précalculée et enregistrée dans un fichier .npy ouvert en
+mémoire partagée (mmap) par chaque processus. Une recherche des plus proches
+voisins pour toutes les compétences d'un CV est un seul produit matriciel.
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zlib
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Version du format de la matrice (à incrémenter si le calcul des vecteurs change)
+FORMAT_VERSION = "1"
+CHAR_DIM = 256
+_WORD_RE = re.compile(r"\w+")
+
+
+def _char_buckets(phrase: str) -> List[int]:
+    padded = f"<{phrase}>"
+    # crc32 plutôt que hash() : les indices doivent être stables d'un processus à l'autre
+    return [zlib.crc32(padded[i:i + 3].encode("utf-8")) % CHAR_DIM for i in range(len(padded) - 2)]
+
+
+class SkillEmbedder:
+    """
+    Calcule les vecteurs (word + caractères) de compétences à partir du vocabulaire SpaCy.
+    """
+
+    def __init__(self, vocab, word_weight: float = 0.4):
+        self.vocab = vocab
+        self.word_weight = word_weight
+        self.word_dim = vocab.vectors_length
+        self.dim = self.word_dim + CHAR_DIM
+
+    def embed(self, phrases: Sequence[str]) -> np.ndarray:
+        """
+        Vecteurs des expressions (une ligne par expression, chaque bloc normalisé ;
+        le bloc word est nul si aucun mot n'a de vecteur).
+        """
+        matrix = np.zeros((len(phrases), self.dim), dtype=np.float32)
+        for row, phrase in enumerate(phrases):
+            phrase = phrase.strip().lower()
+            words = [word for word in _WORD_RE.findall(phrase)
+                     if self.vocab.has_vector(word) and not self.vocab[word].is_stop]
+            if words and self.word_dim:
+                vector = np.mean([self.vocab.get_vector(word) for word in words], axis=0)
+                norm = np.linalg.norm(vector)
+                if norm > 0:
+                    matrix[row, :self.word_dim] = vector / norm
+            counts = np.bincount(_char_buckets(phrase), minlength=CHAR_DIM).astype(np.float32)
+            norm = np.linalg.norm(counts)
+            if norm > 0:
+                matrix[row, self.word_dim:] = counts / norm
+        return matrix
+
+    def weigh(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Pondère les blocs des vecteurs de requête : la similarité obtenue par
+        produit scalaire avec la matrice de l'index est alors
+        word_weight × cos(word) + (1 - word_weight) × cos(caractères),
+        ou cos(caractères) seul pour une requête sans vecteur de mots.
+        """
+        has_words = np.any(matrix[:, :self.word_dim] != 0, axis=1)
+        word_weights = np.where(has_words, self.word_weight, 0.0).astype(np.float32)[:, None]
+        weighted = matrix.copy()
+        weighted[:, :self.word_dim] *= word_weights
+        weighted[:, self.word_dim:] *= 1.0 - word_weights
+        return weighted
+
+    def fingerprint(self, skills: Iterable[str]) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{FORMAT_VERSION}:{self.word_dim}:{CHAR_DIM}:{len(self.vocab.vectors)}".encode("utf-8"))
+        for skill in skills:
+            digest.update(b"\0")
+            digest.update(skill.encode("utf-8"))
+        return digest.hexdigest()
+
+
+class SkillIndex:
+    """
+    Matrice normalisée des compétences et recherche des plus proches voisins.
+    """
+
+    def __init__(self, skills: List[str], matrix: np.ndarray, embedder: SkillEmbedder):
+        self.skills = skills
+        self.matrix = matrix
+        self.embedder = embedder
+        self._positions = {skill: row for row, skill in enumerate(skills)}
+        self._word_counts = np.asarray([len(skill.split()) for skill in skills], dtype=np.int64)
+
+    @staticmethod
+    def _names(skills: Iterable[str]) -> List[str]:
+        names, seen = [], set()
+        for skill in skills:
+            skill = skill.strip().lower()
+            if skill and skill not in seen:
+                seen.add(skill)
+                names.append(skill)
+        return names
+
+    @classmethod
+    def build(cls, skills: Iterable[str], embedder: SkillEmbedder) -> "SkillIndex":
+        names = cls._names(skills)
+        return cls(names, embedder.embed(names), embedder)
+
+    @staticmethod
+    def _matrix_path(path: str, fingerprint: str) -> str:
+        root, ext = os.path.splitext(path)
+        return f"{root}.{fingerprint[:16]}{ext or '.npy'}"
+
+    def save(self, path: str) -> None:
+        """
+        Enregistre la matrice dans un fichier .npy nommé d'après l'empreinte
+        (à côté de path) et la liste des compétences dans path + .json, qui
+        désigne ce fichier. La matrice est remplacée avant le JSON : un worker qui
+        ouvre l'index en même temps lit toujours une matrice et une empreinte
+        qui vont ensemble.
+        """
+        directory = os.path.dirname(path) or "."
+        fingerprint = self.embedder.fingerprint(self.skills)
+        matrix_path = self._matrix_path(path, fingerprint)
+        # Fichier temporaire propre à chaque appel (processus et threads), dans
+        # le même dossier pour que le remplacement reste atomique
+        with tempfile.NamedTemporaryFile("wb", dir=directory, suffix=".tmp", delete=False) as handle:
+            np.save(handle, np.ascontiguousarray(self.matrix))
+        os.replace(handle.name, matrix_path)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False) as handle:
+            json.dump({"fingerprint": fingerprint, "matrix": os.path.basename(matrix_path), "skills": self.skills},
+                      handle, ensure_ascii=False)
+        os.replace(handle.name, f"{path}.json")
+        # Matrices des versions précédentes (dont l'ancien format, enregistré dans
+        # path) : un worker qui en a déjà ouvert une garde son mmap, un worker
+        # qui arrive trop tard la recalcule
+        root, ext = os.path.splitext(path)
+        for stale in glob.glob(f"{glob.escape(root)}.*{glob.escape(ext or '.npy')}") + [path]:
+            if stale != matrix_path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+    @classmethod
+    def load(cls, path: str, skills: Iterable[str], embedder: SkillEmbedder) -> "SkillIndex":
+        """
+        Ouvre la matrice enregistrée en mmap si elle correspond à ces compétences
+        et à ce modèle ; sinon la recalcule et tente de l'enregistrer.
+        """
+        names = cls._names(skills)
+        fingerprint = embedder.fingerprint(names)
+        try:
+            with open(f"{path}.json", encoding="utf-8") as handle:
+                stored = json.load(handle)
+            # Le nom du fichier de la matrice dérive de l'empreinte : une matrice
+            # enregistrée pour d'autres compétences n'est jamais ouverte
+            matrix_path = cls._matrix_path(path, fingerprint)
+            if stored.get("fingerprint") == fingerprint and stored.get("matrix") == os.path.basename(matrix_path):
+                matrix = np.load(matrix_path, mmap_mode="r")
+                if matrix.shape == (len(names), embedder.dim):
+                    return cls(names, matrix, embedder)
+        except (OSError, ValueError):
+            pass
+        index = cls(names, embedder.embed(names), embedder)
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            index.save(path)
+        except OSError as e:
+            print(f"Impossible d'enregistrer l'index des compétences: {str(e)}")
+        return index
+
+    def similarity(self, queries: Sequence[str]) -> np.ndarray:
+        """
+        Similarités requêtes × compétences de l'index (un seul produit matriciel).
+        """
+        if not queries or not self.skills:
+            return np.zeros((len(queries), len(self.skills)), dtype=np.float32)
+        return self.embedder.weigh(self.embedder.embed(queries)) @ self.matrix.T
+
+    def nearest(self, queries: Sequence[str], k: int = 5, threshold: float = 0.0,
+                candidates: Optional[Iterable[str]] = None) -> List[List[Tuple[str, float]]]:
+        """
+        Pour chaque requête, les k compétences les plus proches (score décroissant)
+        dont la similarité atteint le seuil ; candidates restreint la recherche à
+        un sous-ensemble des compétences de l'index.
+
+        Une requête ne peut correspondre qu'à une compétence d'au plus autant de
+        mots qu'elle ("adobe photoshop" -> "photoshop", mais pas "management"
+        -> "project management").
+        """
+        scores = self.similarity(queries)
+        query_counts = np.asarray([len(query.split()) for query in queries], dtype=np.int64)
+        allowed = self._word_counts[None, :] <= query_counts[:, None]
+        if candidates is not None:
+            selected = np.zeros(len(self.skills), dtype=bool)
+            selected[[self._positions[skill] for skill in self._names(candidates) if skill in self._positions]] = True
+            allowed &= selected[None, :]
+        scores = np.where(allowed, scores, -np.inf)
+        k = min(k, len(self.skills))
+        if k <= 0:
+            return [[] for _ in queries]
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, columns in enumerate(top):
+            ranked = sorted(columns, key=lambda column: -scores[row, column])
+            results.append([(self.skills[column], round(float(scores[row, column]), 3))
+                            for column in ranked if scores[row, column] >= threshold])
+        return results
@@ -0,0 +1,120 @@
+"""
+Moteur de détection de compétences en une seule passe (automate d'Aho-Corasick).
+
+L'automate est construit une seule fois à partir de la taxonomie de compétences,
+puis chaque texte est parcouru caractère par caractère : le coût d'une recherche
+dépend de la longueur du texte et du nombre de correspondances, et non plus de la
+taille de la taxonomie.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    """Équivalent de la classe \\w des expressions régulières Python."""
+    return char.isalnum() or char == "_"
+
+
+class SkillMatcher:
+    """
+    Automate d'Aho-Corasick sur des compétences en minuscules.
+
+    Les compétences multi-mots ("google analytics", "adobe xd") sont gérées
+    naturellement. Une correspondance n'est retenue que si elle est délimitée
+    par des frontières de mot, comme le ferait r'\\b' + skill + r'\\b' ;
+    avec word_boundaries=False, toute occurrence est retenue (sous-chaîne).
+    """
+
+    def __init__(self, skills: Iterable[str], word_boundaries: bool = True):
+        self.skills: List[str] = []
+        self.word_boundaries = word_boundaries
+        # Transitions, liens d'échec et sorties de chaque état
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        seen = set()
+        for skill in skills:
+            skill = skill.strip().lower()
+            if not skill or skill in seen:
+                continue
+            seen.add(skill)
+            self._add(skill, len(self.skills))
+            self.skills.append(skill)
+
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def _add(self, skill: str, index: int) -> None:
+        state = 0
+        for char in skill:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(index)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Les sorties du lien d'échec sont aussi valides pour cet état
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, int, str]]:
+        """
+        Parcourt le texte (déjà en minuscules) et produit (début, fin, compétence)
+        pour chaque occurrence délimitée par des frontières de mot.
+        """
+        for start, end, index in self._scan(text):
+            yield start, end, self.skills[index]
+
+    def find(self, text: str) -> List[str]:
+        """
+        Retourne les compétences présentes dans le texte, dans l'ordre de la taxonomie.
+        """
+        return [self.skills[index] for index in self.find_indexes(text)]
+
+    def find_indexes(self, text: str) -> List[int]:
+        """
+        Comme find, mais retourne les indices des compétences dans self.skills.
+        """
+        return sorted({index for _, _, index in self._scan(text.lower())})
+
+    def _scan(self, text: str) -> Iterable[Tuple[int, int, int]]:
+        goto, fail, out, skills = self._goto, self._fail, self._out, self.skills
+        length = len(text)
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            end = position + 1
+            if not self.word_boundaries:
+                for index in out[state]:
+                    yield end - len(skills[index]), end, index
+                continue
+            after = end < length and _is_word_char(text[end])
+            for index in out[state]:
+                skill = skills[index]
+                start = end - len(skill)
+                before = start > 0 and _is_word_char(text[start - 1])
+                # Même sémantique que \b : le caractère voisin doit changer de nature
+                if before == _is_word_char(skill[0]) or after == _is_word_char(skill[-1]):
+                    continue
+                yield start, end, index
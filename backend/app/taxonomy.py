@@ -0,0 +1,151 @@
+"""
+Taxonomie des métiers chargée depuis un fichier de données versionné.
+
+Les intitulés et les compétences sont normalisés une seule fois au chargement
+(minuscules, accents supprimés). La résolution d'un intitulé de poste passe par
+un index de tokens (token -> métiers) et la comparaison de compétences se fait
+par opérations d'ensembles. Le fichier est rechargé à chaud lorsqu'il change.
+"""
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from app.skill_matcher import SkillMatcher
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def fold_text(text: str) -> str:
+    """
+    Normalise un texte pour la comparaison : minuscules, sans accents, espaces réduits.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(folded.split())
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(fold_text(text))
+
+
+def _singular(token: str) -> str:
+    # Pluriel régulier ("designers", "developpeurs") ramené au singulier
+    return token[:-1] if len(token) > 3 and token[-1] in "sx" and token[-2] not in "sx" else token
+
+
+class JobProfile:
+    """
+    Métier de la taxonomie avec ses compétences (forme affichée et clés normalisées).
+    """
+
+    def __init__(self, title: str, market_skills: List[str], core_skills: List[str]):
+        self.title = title
+        self.tokens: FrozenSet[str] = frozenset(_singular(token) for token in tokenize(title))
+        self.key = fold_text(title)
+        self.market_skills = market_skills
+        self.core_skills = core_skills
+        self.market_keys: FrozenSet[str] = frozenset(fold_text(skill) for skill in market_skills)
+
+
+class JobTaxonomy:
+    """
+    Taxonomie normalisée et indexée, construite à partir du contenu du fichier de données.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.version: str = str(data.get("version", ""))
+        generic = data.get("generic", {})
+        self.generic = JobProfile("", generic.get("market_skills", []), generic.get("core_skills", []))
+        self.relevance_jobs: List[str] = list(data.get("relevance_jobs", []))
+        self.jobs: List[JobProfile] = [
+            JobProfile(job["title"], job.get("market_skills", []), job.get("core_skills", []))
+            for job in data.get("jobs", [])
+        ]
+        # Index de tokens : token -> positions des métiers dont l'intitulé le contient
+        self.token_index: Dict[str, List[int]] = {}
+        for position, job in enumerate(self.jobs):
+            for token in job.tokens:
+                self.token_index.setdefault(token, []).append(position)
+        # Automate des intitulés normalisés, pour les intitulés contenus dans un
+        # mot ("webdesigner") : une passe sur le texte cherché, quel que soit le
+        # nombre de métiers
+        self.key_positions: Dict[str, int] = {}
+        for position, job in enumerate(self.jobs):
+            if job.key:
+                self.key_positions.setdefault(job.key, position)
+        self.key_matcher = SkillMatcher(self.key_positions, word_boundaries=False)
+
+    def resolve(self, job_title: str) -> Optional[JobProfile]:
+        """
+        Trouve le métier dont tous les tokens de l'intitulé (au singulier)
+        apparaissent dans job_title ; à défaut, celui dont l'intitulé est contenu
+        dans job_title ("webdesigner"). Le plus spécifique (le plus de tokens)
+        l'emporte, puis le premier de la taxonomie.
+        """
+        hits = Counter()
+        for token in {_singular(token) for token in tokenize(job_title or "")}:
+            for position in self.token_index.get(token, ()):
+                hits[position] += 1
+        matches = [position for position, count in hits.items() if count == len(self.jobs[position].tokens)]
+        if not matches:
+            matches = [self.key_positions[self.key_matcher.skills[index]]
+                       for index in self.key_matcher.find_indexes(fold_text(job_title or ""))]
+        best = None
+        for position in matches:
+            job = self.jobs[position]
+            if best is None or (len(job.tokens), -position) > (len(self.jobs[best].tokens), -best):
+                best = position
+        return self.jobs[best] if best is not None else None
+
+    def core_skills(self, job_title: str) -> List[str]:
+        job = self.resolve(job_title)
+        return job.core_skills if job and job.core_skills else self.generic.core_skills
+
+    def market_profile(self, job_title: str) -> JobProfile:
+        job = self.resolve(job_title)
+        return job if job and job.market_skills else self.generic
+
+
+def load_taxonomy(path: str) -> JobTaxonomy:
+    with open(path, encoding="utf-8") as handle:
+        return JobTaxonomy(json.load(handle))
+
+
+class TaxonomyStore:
+    """
+    Donne accès à la taxonomie courante et la recharge lorsque le fichier est
+    modifié (vérification de la date de modification au plus une fois par intervalle).
+    En cas de fichier invalide, la version précédente reste en service.
+    """
+
+    def __init__(self, path: str, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = os.path.getmtime(path)
+        self._taxonomy = load_taxonomy(path)
+        self._checked_at = time.monotonic()
+
+    def get(self) -> JobTaxonomy:
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._reload_if_changed(now)
+        return self._taxonomy
+
+    def _reload_if_changed(self, now: float) -> None:
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+            try:
+                mtime = os.path.getmtime(self.path)
+                if mtime != self._mtime:
+                    self._taxonomy = load_taxonomy(self.path)
+                    self._mtime = mtime
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Erreur lors du rechargement de la taxonomie: {str(e)}")
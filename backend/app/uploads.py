@@ -0,0 +1,57 @@
+"""
+Réception des fichiers importés sans les charger en mémoire.
+
+Starlette écrit chaque fichier d'un formulaire multipart dans un fichier
+temporaire (SpooledTemporaryFile, en mémoire jusqu'à 1 Mo puis sur disque) ;
+les extracteurs lisent directement ce fichier au lieu d'en faire une copie
+(await file.read() + BytesIO).
+
+UploadLimitMiddleware borne la taille des corps de requête des routes
+d'import : une requête annonçant une taille excessive (Content-Length) est
+refusée avant toute lecture, et un envoi sans taille annoncée (chunked) est
+interrompu dès que la limite est dépassée, sans attendre la fin du transfert.
+"""
+from typing import Dict
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+def too_large_detail(limit: int) -> str:
+    return f"Fichier trop volumineux (maximum {limit / (1024 * 1024):g} Mo)"
+
+
+class UploadLimitMiddleware:
+    """
+    Middleware ASGI : taille maximale du corps de requête (en octets) par chemin.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"].rstrip("/")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > limit:
+            response = JSONResponse({"detail": too_large_detail(limit)}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Relancée telle quelle par FastAPI pendant la lecture du formulaire
+                    raise HTTPException(status_code=413, detail=too_large_detail(limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
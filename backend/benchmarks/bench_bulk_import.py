@@ -0,0 +1,90 @@
+"""
+Benchmark : import en masse d'une archive ZIP de CV (PDF et DOCX).
+
+Compare l'extraction fichier par fichier dans le processus courant (un appel
+à /cv/import par CV) à l'extraction par le pool de processus de l'import en
+masse, et mesure la mémoire allouée par le processus principal (elle ne doit
+pas dépendre de la taille de l'archive).
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_bulk_import [nombre de CV] [processus]
+
+Le gain attendu est proche du nombre de cœurs disponibles.
+"""
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+import docx
+
+from app.bulk_import import BulkImporter, extract_member
+from benchmarks.pdf_corpus import build_pdf, cv_pages
+
+
+def docx_cv(pages) -> bytes:
+    document = docx.Document()
+    for line in pages[0]:
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def build_archive(path: str, count: int) -> None:
+    # Quelques modèles de CV répétés : la génération ne domine pas le benchmark
+    templates = []
+    for seed in range(8):
+        pages = cv_pages(1 + seed % 2, seed=seed)
+        templates.append(("pdf", build_pdf(pages)) if seed % 4 else ("docx", docx_cv(pages)))
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for index in range(count):
+            extension, content = templates[index % len(templates)]
+            archive.writestr(f"cvs/cv-{index:05d}.{extension}", content)
+
+
+async def bulk(importer: BulkImporter, path: str) -> int:
+    extracted = 0
+    async for _, member, _ in importer.extract_archive(path):
+        extracted += member is not None
+    return extracted
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cvs.zip")
+        build_archive(path, count)
+        print(f"{count} CV, archive de {os.path.getsize(path) / 1024 / 1024:.1f} Mo, {os.cpu_count()} cœur(s)\n")
+
+        with zipfile.ZipFile(path) as archive:
+            names = archive.namelist()
+        start = time.perf_counter()
+        for name in names:
+            extract_member(path, name, 0)
+        sequential = time.perf_counter() - start
+        print(f"{'fichier par fichier':<24}{sequential:>8.2f} s{count / sequential:>9.0f} CV/s")
+
+        for pool_size in sorted({1, workers}):
+            importer = BulkImporter(workers=pool_size)
+            try:
+                asyncio.run(bulk(importer, path))  # démarrage des processus
+                tracemalloc.start()
+                start = time.perf_counter()
+                extracted = asyncio.run(bulk(importer, path))
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            finally:
+                importer.shutdown()
+            print(f"{f'import en masse ({pool_size} proc.)':<24}{elapsed:>8.2f} s{extracted / elapsed:>9.0f} CV/s"
+                  f"   x{sequential / elapsed:.1f}   pic mémoire {peak / 1024 / 1024:.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
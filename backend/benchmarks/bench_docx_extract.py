@@ -0,0 +1,60 @@
+"""
+Benchmark : extraction du texte des DOCX, modèle objet python-docx
+(doc.paragraphs, ancienne extraction) contre lecture en flux du XML
+(docx_extract), sur un corpus de modèles de CV (voir docx_corpus) : temps,
+pic de mémoire allouée et part des mots attendus retrouvés.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_docx_extract [répétitions]
+"""
+import io
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import docx
+
+from app import docx_extract
+from benchmarks.docx_corpus import corpus
+
+
+def python_docx_text(stream) -> str:
+    document = docx.Document(stream)
+    return "\n".join(paragraph.text for paragraph in document.paragraphs)
+
+
+EXTRACTORS = {
+    "python-docx": python_docx_text,
+    "docx_extract": docx_extract.extract,
+}
+
+
+def recall(expected: str, text: str) -> float:
+    # Proportion des mots attendus présents dans le texte extrait
+    wanted = Counter(expected.split())
+    found = Counter(text.split())
+    return sum(min(count, found[word]) for word, count in wanted.items()) / sum(wanted.values())
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"{'document':<22}{'extracteur':<14}{'Ko':>6}{'temps ms':>10}{'pic Ko':>9}{'mots':>7}")
+    for document in corpus():
+        for name, extract in EXTRACTORS.items():
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                text = extract(io.BytesIO(document.content))
+                timings.append(time.perf_counter() - start)
+            tracemalloc.start()
+            extract(io.BytesIO(document.content))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{document.name:<22}{name:<14}{len(document.content) / 1024:>6.0f}"
+                  f"{statistics.median(timings) * 1000:>10.2f}{peak / 1024:>9.0f}{recall(document.text, text):>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
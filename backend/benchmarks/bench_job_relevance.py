@@ -0,0 +1,65 @@
+"""
+Benchmark : score de pertinence métiers, boucles imbriquées (ancienne version)
+contre la matrice métier×compétence précalculée, pour un lot de CV et des
+centaines de profils métiers.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_job_relevance [métiers] [cv]
+"""
+import random
+import string
+import sys
+import time
+
+from app.job_scoring import JobSkillMatrix
+
+
+def make_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+
+
+def make_data(job_count: int, cv_count: int, seed: int = 3) -> tuple:
+    rng = random.Random(seed)
+    vocabulary = [make_word(rng) for _ in range(2000)]
+    jobs = {f"métier {index}": rng.sample(vocabulary, rng.randint(5, 15)) for index in range(job_count)}
+    cvs = [rng.sample(vocabulary, rng.randint(10, 30)) for _ in range(cv_count)]
+    return jobs, cvs
+
+
+def legacy_scores(jobs: dict, cv_skills: list) -> dict:
+    scores = {}
+    for job, job_skills in jobs.items():
+        matching_skills = sum(1 for skill in cv_skills if any(job_skill.lower() in skill.lower() for job_skill in job_skills))
+        scores[job] = round(min(matching_skills / max(len(job_skills), 1), 1.0), 2)
+    return dict(sorted(scores.items(), key=lambda x: x[1], reverse=True))
+
+
+def main():
+    job_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    cv_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    jobs, cvs = make_data(job_count, cv_count)
+
+    start = time.perf_counter()
+    matrix = JobSkillMatrix(jobs)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = [legacy_scores(jobs, skills) for skills in cvs]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = matrix.score_many(cvs)
+    batch_time = time.perf_counter() - start
+
+    # Les écarts viennent des sous-chaînes comptées par l'ancienne version
+    # ("java" dans "javascript"), que la matrice ignore
+    mismatches = sum(1 for old, new in zip(legacy, batch) if old != new)
+    print(f"{job_count} métiers, {cv_count} CV, {len(matrix.skills)} compétences distinctes")
+    print(f"{'construction de la matrice (ms)':>34} {build * 1000:>10.1f}")
+    print(f"{'boucles imbriquées (ms)':>34} {legacy_time * 1000:>10.1f}")
+    print(f"{'matrice, un seul appel (ms)':>34} {batch_time * 1000:>10.1f}")
+    print(f"{'résultats différents':>34} {mismatches:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark : détection de la langue par expressions régulières (ancienne version)
+contre le classifieur à trigrammes de caractères, en temps par CV et en
+précision sur les échantillons annotés de tests/fixtures/language_samples.json.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_language [répétitions]
+"""
+import json
+import os
+import re
+import sys
+import time
+
+from app.config import settings
+from app.language_id import LanguageIdentifier
+
+SAMPLES = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "language_samples.json")
+
+
+def regex_language(text: str) -> str:
+    text_lower = text.lower()
+    if re.search(r"\b(le|la|et|est|vous|nous|je|de)\b", text_lower):
+        return "fr"
+    elif re.search(r"\b(the|and|is|you|we|i|of)\b", text_lower):
+        return "en"
+    else:
+        return "unknown"
+
+
+def measure(label, detect, texts, labels, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predictions = [detect(text) for text in texts]
+    elapsed = time.perf_counter() - start
+    accuracy = sum(prediction == expected for prediction, expected in zip(predictions, labels)) / len(labels)
+    print(f"{label:<12} {elapsed / (repeats * len(texts)) * 1e6:8.1f} µs/CV   précision {accuracy:.0%}")
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with open(SAMPLES, encoding="utf-8") as handle:
+        samples = json.load(handle)
+    # CV de taille réaliste : chaque échantillon répété jusqu'à ~3 ko
+    texts = [" ".join([sample["text"]] * (3000 // len(sample["text"]) + 1)) for sample in samples]
+    labels = [sample["language"] for sample in samples]
+
+    start = time.perf_counter()
+    identifier = LanguageIdentifier.load(settings.LANGUAGE_PROFILES_PATH, sample_chars=settings.LANGUAGE_SAMPLE_CHARS)
+    print(f"chargement des profils : {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    measure("regex", regex_language, texts, labels, repeats)
+    measure("trigrammes", lambda text: identifier.identify(text)[0], texts, labels, repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark : appels de génération un par un contre regroupement en lots, face à
+un serveur local qui imite un GPU (nombre fixe d'emplacements, un lot coûte à
+peine plus qu'un prompt seul).
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_llm_batching [appels_simultanés]
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.llm_client import LLMClient
+
+# Coût d'une requête : latence fixe + coût marginal par prompt du lot
+BASE_LATENCY = 0.05
+PER_PROMPT = 0.002
+SLOTS = 2
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    slots = threading.Semaphore(SLOTS)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        prompts = payload["inputs"] if isinstance(payload["inputs"], list) else [payload["inputs"]]
+        with self.slots:
+            time.sleep(BASE_LATENCY + PER_PROMPT * len(prompts))
+        body = json.dumps([{"generated_text": f"réponse à {prompt}"} for prompt in prompts]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def run(client: LLMClient, calls: int) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client.text_generation(f"question {i}", model="m", max_new_tokens=50)
+                                     for i in range(calls)))
+    elapsed = time.perf_counter() - start
+    assert results == [f"réponse à question {i}" for i in range(calls)]
+    await client.aclose()
+    return elapsed
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        print(f"{calls} appels simultanés, serveur à {SLOTS} emplacements")
+        elapsed = asyncio.run(run(LLMClient(base_url=url, timeout=60, max_concurrency=8), calls))
+        print(f"un prompt par requête : {elapsed:6.2f} s  ({calls / elapsed:7.1f} appels/s)")
+        for window, size in ((0.005, 8), (0.02, 16), (0.02, 32)):
+            client = LLMClient(base_url=url, timeout=60, max_concurrency=8, batch_window=window, batch_max_size=size)
+            elapsed = asyncio.run(run(client, calls))
+            metrics = client.batch_metrics()
+            print(f"lots (fenêtre {window * 1000:4.0f} ms, max {size:2d}) : {elapsed:6.2f} s  "
+                  f"({calls / elapsed:7.1f} appels/s, {metrics['batches']} requêtes, "
+                  f"{metrics['mean_batch_size']} prompts/lot)")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
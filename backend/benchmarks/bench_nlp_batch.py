@@ -0,0 +1,50 @@
+"""
+Benchmark : N appels à /nlp/analyze contre un appel à /nlp/analyze/batch.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_nlp_batch [nombre_de_cv]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+CV_TEMPLATE = (
+    "Candidat {index} - Développeur Python et JavaScript chez Capgemini depuis 2019.\n"
+    "Experience : conception d'API REST avec FastAPI, Docker et PostgreSQL.\n"
+    "Pilotage d'une équipe de 4 personnes en méthode agile, suivi dans Jira.\n"
+    "Master en informatique, Université de Lyon. Anglais courant.\n"
+)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    texts = [CV_TEMPLATE.format(index=index) for index in range(count)]
+    client = TestClient(app)
+    # Préchauffage du modèle
+    client.post("/nlp/analyze", json={"text": texts[0]})
+
+    start = time.perf_counter()
+    for text in texts:
+        client.post("/nlp/analyze", json={"text": text}).raise_for_status()
+    single = time.perf_counter() - start
+
+    print(f"{'mode':>24} {'durée (s)':>10} {'docs/s':>10}")
+    print(f"{'boucle /nlp/analyze':>24} {single:>10.2f} {count / single:>10.1f}")
+    for batch_size in (16, 64):
+        start = time.perf_counter()
+        response = client.post("/nlp/analyze/batch", json={"texts": texts, "batch_size": batch_size})
+        response.raise_for_status()
+        batch = time.perf_counter() - start
+        assert response.json()["errors"] == 0
+        label = f"batch (batch_size={batch_size})"
+        print(f"{label:>24} {batch:>10.2f} {count / batch:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark : latence par fonction de nlp_utils avec le pipeline SpaCy complet
+(avant) et avec les pipelines restreints par tâche (après).
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_nlp_pipelines
+"""
+import time
+
+from app import nlp_utils
+
+CV_TEXT = (
+    "Développeur Python chez Capgemini depuis 2019. "
+    "Conception d'API REST avec FastAPI, Docker et PostgreSQL pour des clients du secteur bancaire. "
+    "Pilotage d'une équipe de 4 personnes en méthode agile, suivi des tickets dans Jira. "
+    "Master en informatique à l'Université de Lyon, anglais courant.\n"
+) * 30
+
+QUERY = "Comment présenter mon expérience professionnelle pour un poste de développeur web ?"
+
+
+def timeit(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def measure() -> dict:
+    return {
+        "summarize_text": timeit(lambda: nlp_utils.summarize_text(CV_TEXT)),
+        "suggest_cv_improvements": timeit(lambda: nlp_utils.suggest_cv_improvements(CV_TEXT)),
+        "extract_skills": timeit(lambda: nlp_utils.extract_skills(CV_TEXT)),
+        "analyze_cv": timeit(lambda: nlp_utils.analyze_cv(CV_TEXT)),
+    }
+
+
+def main():
+    pruned = dict(nlp_utils.pipelines)
+    # Avant : toutes les tâches passent par le pipeline complet
+    nlp_utils.pipelines.update({name: nlp_utils.nlp for name in pruned})
+    before = measure()
+    # L'ancien chatbot analysait la requête sans utiliser le résultat
+    before["generate_chatbot_response (analyse)"] = timeit(lambda: nlp_utils.nlp(QUERY.lower()))
+    nlp_utils.pipelines.update(pruned)
+    after = measure()
+    after["generate_chatbot_response (analyse)"] = 0.0
+
+    print(f"Texte : {len(CV_TEXT)} caractères")
+    print(f"{'fonction':>38} {'avant (ms)':>11} {'après (ms)':>11}")
+    for name, value in before.items():
+        print(f"{name:>38} {value:>11.1f} {after[name]:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark : latence d'un endpoint simple (GET /) pendant une charge NLP
+concurrente, avec le pool en mode thread (workers=0) puis en mode processus.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_nlp_pool [workers] [requêtes_nlp]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import httpx
+
+from app.main import app
+from app import nlp_pool
+from app.nlp_pool import NLPPool
+
+CV_TEXT = (
+    "Développeur Python chez Capgemini depuis 2019. Conception d'API REST avec FastAPI, "
+    "Docker et PostgreSQL. Pilotage d'une équipe en méthode agile.\n"
+) * 40
+
+
+async def run(pool: NLPPool, nlp_requests: int) -> dict:
+    nlp_pool.pool = pool
+    pool.warm_up()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def nlp_load():
+            statuses = await asyncio.gather(*[
+                client.post("/nlp/analyze", json={"text": CV_TEXT}, timeout=120)
+                for _ in range(nlp_requests)
+            ])
+            return [response.status_code for response in statuses]
+
+        async def probe():
+            latencies = []
+            while not load.done():
+                start = time.perf_counter()
+                await client.get("/")
+                latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+            return latencies
+
+        start = time.perf_counter()
+        load = asyncio.ensure_future(nlp_load())
+        latencies = await probe()
+        statuses = await load
+        duration = time.perf_counter() - start
+    pool.shutdown()
+    latencies.sort()
+    return {
+        "duration": duration,
+        "ok": statuses.count(200),
+        "rejected": statuses.count(503),
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if len(latencies) > 1 else latencies[0],
+    }
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    nlp_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    print(f"{'mode':>12} {'durée (s)':>10} {'ok':>5} {'503':>5} {'GET / p50 (ms)':>15} {'p99 (ms)':>10}")
+    for label, pool in (("thread", NLPPool(workers=0, max_pending=64)),
+                        (f"{workers} process", NLPPool(workers=workers, max_pending=64))):
+        result = asyncio.run(run(pool, nlp_requests))
+        print(f"{label:>12} {result['duration']:>10.2f} {result['ok']:>5} {result['rejected']:>5} "
+              f"{result['p50']:>15.2f} {result['p99']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
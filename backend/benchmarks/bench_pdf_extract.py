@@ -0,0 +1,61 @@
+"""
+Benchmark : backends d'extraction PDF (pdfium, pdfplumber) sur un corpus de CV
+synthétiques (vitesse et fidélité du texte par rapport au texte attendu),
+extraction parallèle des gros documents et arrêt anticipé pour le tri de CV.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_pdf_extract [processus]
+
+Le gain de l'extraction parallèle dépend du nombre de cœurs disponibles ; il
+est surtout sensible avec le backend pdfplumber.
+"""
+import difflib
+import io
+import sys
+import time
+
+from app.pdf_extract import BACKENDS, PDFExtractor
+from benchmarks.pdf_corpus import corpus
+
+
+def fidelity(expected: str, text: str) -> float:
+    # Proportion de mots retrouvés dans le bon ordre
+    return difflib.SequenceMatcher(None, expected.split(), text.split(), autojunk=False).ratio()
+
+
+def timed(extractor: PDFExtractor, content: bytes, **options) -> tuple:
+    start = time.perf_counter()
+    text = extractor.extract(io.BytesIO(content), **options)
+    return time.perf_counter() - start, text
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    documents = corpus()
+
+    print(f"{'document':<16}{'backend':<12}{'temps ms':>10}{'ms/page':>9}{'fidélité':>10}")
+    for document in documents:
+        for backend in BACKENDS:
+            elapsed, text = timed(PDFExtractor(backend=backend), document.content)
+            print(f"{document.name:<16}{backend:<12}{elapsed * 1000:>10.1f}{elapsed * 1000 / document.pages:>9.2f}"
+                  f"{fidelity(document.text, text):>10.3f}")
+
+    name, content, expected, _ = documents[-1]
+    print(f"\n{name} avec pdfium :")
+    sequential, _ = timed(PDFExtractor(), content)
+    print(f"  séquentiel                    : {sequential * 1000:7.1f} ms")
+    extractor = PDFExtractor(workers=workers, parallel_min_pages=16)
+    try:
+        timed(extractor, content)  # démarrage des processus
+        elapsed, text = timed(extractor, content)
+        print(f"  {workers} processus                   : {elapsed * 1000:7.1f} ms  (fidélité {fidelity(expected, text):.3f})")
+    finally:
+        extractor.shutdown()
+    elapsed, text = timed(PDFExtractor(max_pages=3), content)
+    print(f"  3 premières pages (tri de CV) : {elapsed * 1000:7.1f} ms  ({len(text)} caractères)")
+    elapsed, text = timed(PDFExtractor(), content, stop_chars=4000)
+    print(f"  arrêt à 4000 caractères       : {elapsed * 1000:7.1f} ms  ({len(text)} caractères)")
+
+
+if __name__ == "__main__":
+    main()
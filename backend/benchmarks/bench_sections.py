@@ -0,0 +1,64 @@
+"""
+Benchmark : extraction des expériences et des diplômes par deux parcours de
+lignes avec tests de sous-chaînes (ancienne version) contre le découpage en
+sections en une seule passe, sur des CV de 1 à 100 pages.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_sections
+"""
+import time
+
+from app.cv_sections import SECTION_HEADINGS, SECTION_KEYWORDS, SectionSegmenter, EXPERIENCE, EDUCATION
+
+PAGE = (
+    "Jean Dupont\nEmail : jean.dupont@example.com\n"
+    "EXPÉRIENCE PROFESSIONNELLE\n"
+    "- Développeur backend chez Acme (2019-2023) : API REST, PostgreSQL, Docker.\n"
+    "- Stage de fin d'études chez Foo, automatisation des tests.\n"
+    "Formation\nMaster en informatique, Université de Lyon, 2019.\nBTS SIO, 2016.\n"
+    "Compétences\nPython, Django, FastAPI, Git, Kubernetes.\n"
+    "Langues\nAnglais courant, espagnol scolaire.\n"
+) * 6
+
+DEGREES = ["master", "licence", "bachelor", "doctorat", "phd", "bac", "bts", "dut", "ingénieur"]
+
+
+def old_extract(text):
+    experiences = [line for line in text.split("\n") if "experience" in line.lower() or "worked at" in line.lower()]
+    degrees = [line for line in text.split("\n") if any(degree in line.lower() for degree in DEGREES)]
+    return experiences, degrees
+
+
+def new_extract(segmenter, text):
+    experiences, degrees = [], []
+    for span in segmenter.iter_spans(text):
+        if span.source != "heading":
+            if span.kind == EXPERIENCE:
+                experiences.append(span.text)
+            elif span.kind == EDUCATION:
+                degrees.append(span.text)
+    return experiences, degrees
+
+
+def timed(function, *args, repeats=5):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = function(*args)
+    return (time.perf_counter() - start) / repeats * 1000, result
+
+
+def main():
+    start = time.perf_counter()
+    segmenter = SectionSegmenter(SECTION_HEADINGS, SECTION_KEYWORDS)
+    print(f"construction de l'automate : {(time.perf_counter() - start) * 1000:.1f} ms")
+    for pages in (1, 10, 100):
+        text = PAGE * pages
+        old_ms, (old_experiences, old_degrees) = timed(old_extract, text)
+        new_ms, (new_experiences, new_degrees) = timed(new_extract, segmenter, text)
+        print(f"{pages:>3} pages ({len(text) // 1024} ko) : lignes {old_ms:7.2f} ms "
+              f"({len(old_experiences)} exp., {len(old_degrees)} dipl.) | "
+              f"sections {new_ms:7.2f} ms ({len(new_experiences)} exp., {len(new_degrees)} dipl.)")
+
+
+if __name__ == "__main__":
+    main()
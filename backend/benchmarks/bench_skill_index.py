@@ -0,0 +1,49 @@
+"""
+Benchmark : plus proches voisins des compétences d'un CV, une requête à la fois
+(produit matrice-vecteur par compétence) contre une recherche groupée en un seul
+produit matriciel, et coût d'ouverture de l'index (calcul contre mmap).
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_skill_index [taille_de_l_index]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.nlp_utils import COMMON_SKILLS, nlp
+from app.skill_index import SkillEmbedder, SkillIndex
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(5)
+    words = [word for word in list(nlp.vocab.strings)[:200000] if word.isalpha() and len(word) > 3]
+    vocabulary = COMMON_SKILLS + rng.sample(words, size - len(COMMON_SKILLS))
+    queries = ["ReactJS", "PostgreSQL", "HTML5", "nodejs", "adobe photoshop"] * 8
+    embedder = SkillEmbedder(nlp.vocab)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "skills.npy")
+        start = time.perf_counter()
+        index = SkillIndex.load(path, vocabulary, embedder)
+        print(f"construction ({len(index.skills)} compétences) : {(time.perf_counter() - start) * 1000:7.1f} ms")
+        start = time.perf_counter()
+        index = SkillIndex.load(path, vocabulary, embedder)
+        print(f"ouverture mmap                      : {(time.perf_counter() - start) * 1000:7.1f} ms")
+
+        start = time.perf_counter()
+        one_by_one = [index.nearest([query], k=3)[0] for query in queries]
+        single = time.perf_counter() - start
+        start = time.perf_counter()
+        batched = index.nearest(queries, k=3)
+        grouped = time.perf_counter() - start
+
+    assert one_by_one == batched
+    print(f"{len(queries)} compétences une par une : {single * 1000:7.2f} ms")
+    print(f"{len(queries)} compétences groupées    : {grouped * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
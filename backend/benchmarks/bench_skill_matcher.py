@@ -0,0 +1,68 @@
+"""
+Benchmark : recherche de compétences par regex (une par compétence) contre
+l'automate d'Aho-Corasick de app.skill_matcher.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_skill_matcher
+"""
+import random
+import re
+import string
+import time
+
+from app.skill_matcher import SkillMatcher
+
+BASE_SKILLS = [
+    "python", "java", "javascript", "react", "node.js", "sql", "docker",
+    "google analytics", "adobe xd", "project management", "communication",
+]
+
+CV_TEXT = (
+    "Développeur Python et JavaScript, 5 ans d'expérience. "
+    "Maîtrise de React, Node.js, Docker et PostgreSQL. "
+    "Suivi des campagnes avec Google Analytics, maquettes sous Adobe XD. "
+    "Project management en méthode agile, forte communication.\n"
+) * 40
+
+
+def make_taxonomy(size: int, seed: int = 42) -> list:
+    """Taxonomie synthétique : compétences de base + termes aléatoires d'un à trois mots."""
+    rng = random.Random(seed)
+    skills = list(BASE_SKILLS)
+    while len(skills) < size:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        skills.append(" ".join(words))
+    return skills[:size]
+
+
+def regex_find(skills: list, text: str) -> list:
+    text_lower = text.lower()
+    return [skill for skill in skills if re.search(r'\b' + re.escape(skill) + r'\b', text_lower)]
+
+
+def timeit(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    print(f"Texte : {len(CV_TEXT)} caractères")
+    print(f"{'taxonomie':>10} {'construction':>14} {'regex (ms)':>12} {'automate (ms)':>14}")
+    for size in (50, 500, 2000, 10000):
+        skills = make_taxonomy(size)
+        start = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        build_ms = (time.perf_counter() - start) * 1000
+        assert sorted(matcher.find(CV_TEXT)) == sorted(regex_find(skills, CV_TEXT))
+        regex_ms = timeit(lambda: regex_find(skills, CV_TEXT))
+        matcher_ms = timeit(lambda: matcher.find(CV_TEXT))
+        print(f"{size:>10} {build_ms:>14.1f} {regex_ms:>12.2f} {matcher_ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark : résumé extractif, ancienne implémentation (dictionnaire de Span et
+boucles imbriquées) contre la version vectorisée, sur un CV d'environ 20 pages.
+Le document SpaCy est analysé une seule fois et partagé par les deux versions.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_summarizer [pages]
+"""
+import random
+import sys
+import time
+from collections import Counter
+
+from app import nlp_utils
+
+WORDS = (
+    "développement conception API Python Docker PostgreSQL équipe projet client "
+    "gestion agile migration cloud performance sécurité tests formation analyse "
+    "données tableau reporting budget livraison architecture microservices"
+).split()
+
+
+def make_cv(pages: int, seed: int = 7) -> str:
+    """Environ 40 phrases par page."""
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(pages * 40):
+        words = rng.choices(WORDS, k=rng.randint(8, 20))
+        sentences.append("J'ai assuré la " + " ".join(words) + ".")
+    return " ".join(sentences)
+
+
+def legacy_summary(doc) -> str:
+    word_freq = Counter([token.text.lower() for token in doc if not token.is_stop and not token.is_punct])
+    sentence_scores = {}
+    for sent in doc.sents:
+        for word in sent:
+            if word.text.lower() in word_freq:
+                if sent in sentence_scores:
+                    sentence_scores[sent] += word_freq[word.text.lower()]
+                else:
+                    sentence_scores[sent] = word_freq[word.text.lower()]
+    summary_sentences = sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:3]
+    return " ".join([sent.text for sent in summary_sentences])
+
+
+def timeit(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    text = make_cv(pages)
+    context = nlp_utils.AnalysisContext(text, pipeline="sentences")
+    doc = context.doc
+    print(f"{pages} pages : {len(text)} caractères, {len(doc)} tokens, {len(list(doc.sents))} phrases")
+    legacy_ms = timeit(lambda: legacy_summary(doc))
+    vectorized_ms = timeit(lambda: nlp_utils.summarize_text(text, context))
+    print(f"{'ancienne version (ms)':>26} {legacy_ms:>10.1f}")
+    print(f"{'version vectorisée (ms)':>26} {vectorized_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
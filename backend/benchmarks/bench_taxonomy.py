@@ -0,0 +1,57 @@
+"""
+Benchmark : résolution d'intitulés de poste, recherche linéaire par sous-chaîne
+(ancienne version) contre l'index de tokens de la taxonomie, avec des milliers
+de métiers : intitulés trouvés, puis intitulés sans métier correspondant (le
+cas le plus coûteux pour la recherche linéaire).
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_taxonomy [métiers]
+"""
+import random
+import string
+import sys
+import time
+
+from app.taxonomy import JobTaxonomy
+
+
+def make_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(11)
+    vocabulary = [make_word(rng) for _ in range(3000)]
+    titles = list({" ".join(rng.sample(vocabulary, rng.randint(1, 3))) for _ in range(count)})
+    data = {"jobs": [{"title": title, "market_skills": rng.sample(vocabulary, 6)} for title in titles]}
+    cases = {
+        "trouvés": [f"{rng.choice(titles)} senior" for _ in range(1000)],
+        "non résolus": [f"{make_word(rng)} {make_word(rng)}" for _ in range(1000)],
+    }
+
+    start = time.perf_counter()
+    taxonomy = JobTaxonomy(data)
+    build = time.perf_counter() - start
+    legacy = {job["title"]: job["market_skills"] for job in data["jobs"]}
+
+    def linear(job_title):
+        for job, skills in legacy.items():
+            if job in job_title.lower():
+                return skills
+        return None
+
+    def per_request(resolve, queries) -> float:
+        start = time.perf_counter()
+        for query in queries:
+            resolve(query)
+        return (time.perf_counter() - start) / len(queries) * 1e6
+
+    print(f"{len(titles)} métiers, construction de l'index : {build * 1000:.1f} ms")
+    print(f"{'intitulés (µs/req)':<20}{'linéaire':>12}{'index':>12}")
+    for name, queries in cases.items():
+        print(f"{name:<20}{per_request(linear, queries):>12.1f}{per_request(taxonomy.resolve, queries):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Corpus de CV DOCX synthétiques reproduisant la structure des modèles de CV
+courants (Word, Canva, Europass) et dont le texte attendu est connu :
+- "classique" : en-tête nom/contact, sections en paragraphes ;
+- "deux-colonnes" : mise en page en tableau sans bordures (barre latérale
+  compétences/langues à gauche, expériences à droite) ;
+- "encadre" : barre latérale en zone de texte (mc:AlternateContent, avec sa
+  copie de compatibilité mc:Fallback comme l'enregistre Word) ;
+- "tableau-competences" : compétences et niveaux dans un tableau ;
+- "long-12p" : CV détaillé d'une douzaine de pages.
+Les documents sont générés avec python-docx : aucun fichier binaire n'est versionné.
+"""
+import io
+import random
+from typing import List, NamedTuple, Sequence
+
+import docx
+from docx.oxml import parse_xml
+
+from benchmarks.pdf_corpus import _WORDS
+
+_SKILLS = ["Python", "SQL", "Docker", "Kubernetes", "React", "Java", "Excel", "PowerBI", "Git", "Linux", "AWS", "Azure"]
+_LANGUAGES = ["Français : langue maternelle", "Anglais : courant", "Espagnol : intermédiaire"]
+
+_TEXT_BOX = """
+<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+     xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+     xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+     xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"
+     xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+     xmlns:v="urn:schemas-microsoft-com:vml">
+  <mc:AlternateContent>
+    <mc:Choice Requires="wps">
+      <w:drawing>
+        <wp:anchor distT="0" distB="0" distL="114300" distR="114300" simplePos="0" relativeHeight="1"
+                   behindDoc="0" locked="0" layoutInCell="1" allowOverlap="1">
+          <wp:simplePos x="0" y="0"/>
+          <wp:extent cx="1800000" cy="6000000"/>
+          <wp:docPr id="1" name="Barre latérale"/>
+          <a:graphic>
+            <a:graphicData uri="http://schemas.microsoft.com/office/word/2010/wordprocessingShape">
+              <wps:wsp><wps:txbx><w:txbxContent>{content}</w:txbxContent></wps:txbx><wps:bodyPr/></wps:wsp>
+            </a:graphicData>
+          </a:graphic>
+        </wp:anchor>
+      </w:drawing>
+    </mc:Choice>
+    <mc:Fallback>
+      <w:pict><v:shape><v:textbox><w:txbxContent>{content}</w:txbxContent></v:textbox></v:shape></w:pict>
+    </mc:Fallback>
+  </mc:AlternateContent>
+</w:r>
+"""
+
+
+class Document(NamedTuple):
+    name: str
+    content: bytes
+    text: str
+
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def add_text_box(paragraph, lines: Sequence[str]) -> None:
+    """
+    Ajoute au paragraphe une zone de texte ancrée contenant ces lignes.
+    """
+    content = "".join(f"<w:p><w:r><w:t xml:space=\"preserve\">{_escape(line)}</w:t></w:r></w:p>" for line in lines)
+    paragraph._p.append(parse_xml(_TEXT_BOX.format(content=content)))
+
+
+def _sentence(rng: random.Random, words=(6, 14)) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(*words)))
+
+
+def _experiences(rng: random.Random, count: int) -> List[str]:
+    lines = []
+    for index in range(count):
+        lines.append(f"{2023 - 2 * index}-{2025 - 2 * index} : {rng.choice(_WORDS).capitalize()} chez Société {index}")
+        lines.extend(_sentence(rng) for _ in range(rng.randint(2, 4)))
+    return lines
+
+
+def _save(document) -> bytes:
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _header(document, lines: Sequence[str]) -> None:
+    header = document.sections[0].header
+    header.paragraphs[0].text = lines[0]
+    for line in lines[1:]:
+        header.add_paragraph(line)
+
+
+def classic(rng: random.Random) -> Document:
+    document = docx.Document()
+    contact = ["Camille Martin", "camille.martin@example.fr - 06 12 34 56 78 - Lyon"]
+    _header(document, contact)
+    lines = ["Expérience professionnelle", *_experiences(rng, 4), "Formation", _sentence(rng),
+             "Compétences", ", ".join(_SKILLS[:8]), "Langues", *_LANGUAGES]
+    for line in lines:
+        document.add_paragraph(line)
+    return Document("classique", _save(document), "\n".join(contact + lines))
+
+
+def two_columns(rng: random.Random) -> Document:
+    document = docx.Document()
+    name = "Camille Martin - Développeuse"
+    document.add_paragraph(name)
+    sidebar = ["Compétences", *_SKILLS[:8], "Langues", *_LANGUAGES]
+    main = ["Expérience professionnelle", *_experiences(rng, 4)]
+    table = document.add_table(rows=1, cols=2)
+    left, right = table.rows[0].cells
+    left.text, right.text = sidebar[0], main[0]
+    for line in sidebar[1:]:
+        left.add_paragraph(line)
+    for line in main[1:]:
+        right.add_paragraph(line)
+    return Document("deux-colonnes", _save(document), "\n".join([name] + sidebar + main))
+
+
+def text_box(rng: random.Random) -> Document:
+    document = docx.Document()
+    sidebar = ["Compétences", *_SKILLS, "Langues", *_LANGUAGES]
+    anchor = document.add_paragraph("Camille Martin")
+    add_text_box(anchor, sidebar)
+    lines = ["Expérience professionnelle", *_experiences(rng, 4), "Formation", _sentence(rng)]
+    for line in lines:
+        document.add_paragraph(line)
+    return Document("encadre", _save(document), "\n".join(sidebar + ["Camille Martin"] + lines))
+
+
+def skills_table(rng: random.Random) -> Document:
+    document = docx.Document()
+    lines = ["Camille Martin", "Expérience professionnelle", *_experiences(rng, 3)]
+    for line in lines:
+        document.add_paragraph(line)
+    document.add_paragraph("Compétences techniques")
+    rows = [("Compétence", "Niveau", "Années")] + [(skill, rng.choice(["Expert", "Avancé", "Intermédiaire"]),
+                                                    str(rng.randint(1, 10))) for skill in _SKILLS]
+    table = document.add_table(rows=len(rows), cols=3)
+    for cells, values in zip(table.rows, rows):
+        for cell, value in zip(cells.cells, values):
+            cell.text = value
+    text = lines + ["Compétences techniques"] + ["\t".join(values) for values in rows]
+    return Document("tableau-competences", _save(document), "\n".join(text))
+
+
+def long_cv(rng: random.Random) -> Document:
+    document = docx.Document()
+    contact = ["Camille Martin", "camille.martin@example.fr"]
+    _header(document, contact)
+    lines = ["Expérience professionnelle", *_experiences(rng, 60)]
+    for line in lines:
+        document.add_paragraph(line)
+    rows = [(skill, "Avancé") for skill in _SKILLS]
+    table = document.add_table(rows=len(rows), cols=2)
+    for cells, values in zip(table.rows, rows):
+        for cell, value in zip(cells.cells, values):
+            cell.text = value
+    return Document("long-12p", _save(document), "\n".join(contact + lines + ["\t".join(row) for row in rows]))
+
+
+def corpus(seed: int = 0) -> List[Document]:
+    rng = random.Random(seed)
+    return [build(rng) for build in (classic, two_columns, text_box, skills_table, long_cv)]
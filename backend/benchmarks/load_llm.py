@@ -0,0 +1,177 @@
+"""
+Essai de charge des appels aux modèles de langage, entièrement hors ligne.
+
+Lance le serveur d'inférence factice (scripts.mock_inference_server) et
+l'application (uvicorn, dans ce processus) branchée dessus, puis envoie des
+requêtes à /assistant/chatbot et /nlp/suggest-skills à un débit cible fixe
+(charge ouverte : les requêtes partent à l'heure prévue, même si les
+précédentes ne sont pas terminées). Affiche par endpoint les latences
+p50/p95/p99, les erreurs HTTP et les réponses de repli, puis les métriques du
+cache, des disjoncteurs et du regroupement.
+
+Usage (depuis backend/) :
+    python -m benchmarks.load_llm --rps 20 --duration 15 --delay 0.4 --jitter 0.5 --distribution lognormal --error-rate 0.05
+    python -m benchmarks.load_llm --url http://127.0.0.1:8000 --token <jwt>   # application déjà lancée
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import threading
+import time
+from collections import defaultdict
+
+import httpx
+import numpy as np
+
+from scripts.mock_inference_server import DISTRIBUTIONS, MockInferenceServer
+
+JOB_TITLES = [
+    "Développeur Python", "Data Analyst", "Chef de projet", "Développeur Frontend", "Data Scientist",
+    "Ingénieur DevOps", "Comptable", "Chargé de recrutement", "Designer UX", "Technicien réseau",
+    "Responsable marketing", "Commercial B2B", "Administrateur système", "Infirmier", "Juriste",
+]
+QUESTIONS = [
+    "Comment décrire mon expérience ?", "Quelles compétences mettre en avant ?", "Comment présenter ma formation ?",
+    "Mon CV est-il trop long ?", "Comment rédiger mon profil ?",
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(inference_url: str) -> tuple:
+    """
+    Démarre l'application dans un thread, branchée sur le serveur factice ;
+    l'authentification est remplacée par un utilisateur fictif.
+    """
+    os.environ["HF_INFERENCE_URL"] = inference_url
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    # Une ligne de journal par appel au modèle : seuls les échecs sont affichés
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    import uvicorn
+    from app import models
+    from app.auth import get_current_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_user] = lambda: models.User(id=0, email="charge@smartcv.local")
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("L'application n'a pas démarré")
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+async def drive(url: str, token: str, rps: float, duration: float, mix: float, seed: int) -> dict:
+    """
+    Envoie rps requêtes par seconde pendant duration secondes ; mix est la part
+    des requêtes au chatbot (le reste va aux suggestions de compétences).
+    """
+    from app import nlp_utils
+
+    rng = random.Random(seed)
+    results = defaultdict(list)
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+
+    async def call(http: httpx.AsyncClient, endpoint: str, request: dict) -> None:
+        start = time.perf_counter()
+        try:
+            response = await http.post(url + endpoint, **request)
+            outcome = "ok" if response.status_code == 200 else f"http_{response.status_code}"
+            if outcome == "ok":
+                data = response.json()
+                if data.get("message") == nlp_utils.CHATBOT_FALLBACK["message"] \
+                        or data.get("suggested_skills") == nlp_utils.DEFAULT_SUGGESTED_SKILLS:
+                    outcome = "fallback"
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        results[endpoint].append((time.perf_counter() - start, outcome))
+
+    async with httpx.AsyncClient(headers=headers, timeout=120, limits=limits) as http:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tasks = []
+        for index in range(int(rps * duration)):
+            delay = start + index / rps - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            job_title = rng.choice(JOB_TITLES)
+            if rng.random() < mix:
+                request = ("/assistant/chatbot", {"json": {"text": rng.choice(QUESTIONS), "job_title": job_title}})
+            else:
+                request = ("/nlp/suggest-skills", {"params": {"job_title": job_title}})
+            tasks.append(asyncio.ensure_future(call(http, *request)))
+        await asyncio.gather(*tasks)
+        elapsed = loop.time() - start
+        metrics = {}
+        for path in ("/nlp/llm/metrics", "/nlp/suggest-skills/cache/metrics"):
+            try:
+                metrics[path] = (await http.get(url + path)).json()
+            except httpx.HTTPError:
+                pass
+    return {"results": results, "elapsed": elapsed, "metrics": metrics}
+
+
+def report(results: dict, elapsed: float) -> None:
+    total = sum(len(calls) for calls in results.values())
+    print(f"{total} requêtes en {elapsed:.1f} s ({total / elapsed:.1f} req/s)")
+    print(f"{'endpoint':<22}{'n':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'repli':>7}{'erreurs':>9}")
+    for endpoint, calls in sorted(results.items()):
+        latencies = np.array([latency for latency, _ in calls]) * 1000
+        outcomes = [outcome for _, outcome in calls]
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        errors = [outcome for outcome in outcomes if outcome not in ("ok", "fallback")]
+        print(f"{endpoint:<22}{len(calls):>6}{p50:>9.0f}{p95:>9.0f}{p99:>9.0f}{latencies.max():>9.0f}"
+              f"{outcomes.count('fallback'):>7}{len(errors):>9}")
+        for error in sorted(set(errors)):
+            print(f"    {error}: {errors.count(error)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Essai de charge hors ligne des appels LLM")
+    parser.add_argument("--rps", type=float, default=10.0, help="débit cible (requêtes/s)")
+    parser.add_argument("--duration", type=float, default=10.0, help="durée de l'envoi (s)")
+    parser.add_argument("--mix", type=float, default=0.5, help="part des requêtes au chatbot")
+    parser.add_argument("--url", default="", help="application déjà lancée (sinon démarrée ici)")
+    parser.add_argument("--token", default="", help="jeton JWT pour --url")
+    parser.add_argument("--delay", type=float, default=0.3, help="latence médiane du serveur factice (s)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mock = app_server = None
+    url = args.url
+    if not url:
+        mock = MockInferenceServer(delay=args.delay, jitter=args.jitter, distribution=args.distribution,
+                                   error_rate=args.error_rate, seed=args.seed)
+        app_server, thread, url = start_app(mock.url)
+    try:
+        outcome = asyncio.run(drive(url, args.token, args.rps, args.duration, args.mix, args.seed))
+        report(outcome["results"], outcome["elapsed"])
+        for path, metrics in outcome["metrics"].items():
+            print(f"\n{path}\n{json.dumps(metrics, indent=2, ensure_ascii=False)}")
+        if mock is not None:
+            print(f"\nserveur factice : {mock.requests} requêtes, {mock.errors} erreurs, "
+                  f"{mock.max_active} appels simultanés au maximum")
+    finally:
+        if app_server is not None:
+            app_server.should_exit = True
+            thread.join(timeout=10)
+        if mock is not None:
+            mock.close()
+
+
+if __name__ == "__main__":
+    main()
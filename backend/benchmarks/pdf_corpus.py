@@ -0,0 +1,107 @@
+"""
+Corpus de CV PDF synthétiques dont le texte exact est connu, pour comparer
+les extracteurs (vitesse et fidélité du texte). Les PDF sont générés à la
+volée (polices standard, texte accentué en WinAnsi) : aucun fichier binaire
+n'est versionné.
+"""
+import io
+import random
+from typing import List, NamedTuple, Sequence, Tuple
+
+LINE_HEIGHT = 14
+TOP = 760
+BOTTOM = 60
+
+_SECTIONS = ["Expérience professionnelle", "Formation", "Compétences", "Projets", "Langues"]
+_WORDS = (
+    "développement conception analyse données équipe projet client application gestion réalisation "
+    "optimisation migration déploiement maintenance performance qualité sécurité architecture "
+    "Python SQL Docker Kubernetes React Java Excel PowerBI Git Linux AWS Azure agile Scrum "
+    "responsable stagiaire ingénieur chef consultant analyste développeur senior junior"
+).split()
+
+
+class Document(NamedTuple):
+    name: str
+    content: bytes
+    text: str
+    pages: int
+
+
+def _escape(text: str) -> bytes:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("cp1252")
+
+
+def build_pdf(pages: Sequence[Sequence[str]], padding: int = 0, columns: int = 1) -> bytes:
+    """
+    PDF dont chaque page affiche ses lignes de haut en bas, réparties sur
+    columns colonnes côte à côte ; padding ajoute un flux non référencé de
+    cette taille (fichier volumineux au texte court).
+    """
+    objects: List[bytes] = [b"<< /Type /Catalog /Pages 2 0 R >>", b"",
+                            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    width = 468 // columns
+    for lines in pages:
+        if isinstance(lines, str):
+            lines = [lines]
+        per_column = -(-len(lines) // columns) if lines else 0
+        commands = [b"BT /F1 10 Tf"]
+        for index, line in enumerate(lines):
+            column, row = divmod(index, per_column)
+            commands.append(b"1 0 0 1 %d %d Tm (%s) Tj" % (72 + column * width, TOP - row * LINE_HEIGHT, _escape(line)))
+        commands.append(b"ET")
+        content = b"\n".join(commands)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 3 0 R >> >> >>" % len(objects))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+    if padding:
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (padding, b"\0" * padding))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def cv_pages(page_count: int, seed: int = 0, words: Tuple[int, int] = (6, 12)) -> List[List[str]]:
+    """
+    Pages de CV plausibles (titres de section et lignes de 6 à 12 mots).
+    """
+    rng = random.Random(seed)
+    lines_per_page = (TOP - BOTTOM) // LINE_HEIGHT
+    pages = []
+    for _ in range(page_count):
+        lines = []
+        while len(lines) < lines_per_page:
+            if rng.random() < 0.1:
+                lines.append(rng.choice(_SECTIONS))
+            else:
+                lines.append(" ".join(rng.choice(_WORDS) for _ in range(rng.randint(*words))))
+        pages.append(lines)
+    return pages
+
+
+def corpus() -> List[Document]:
+    """
+    CV d'une et deux pages, CV en deux colonnes, portfolio de 40 pages et
+    document de 200 pages, avec leur texte attendu.
+    """
+    documents = []
+    for name, page_count, columns in (("cv-1p", 1, 1), ("cv-2p", 2, 1), ("cv-2col", 2, 2),
+                                      ("portfolio-40p", 40, 1), ("document-200p", 200, 1)):
+        # Lignes courtes en deux colonnes pour qu'elles ne se chevauchent pas
+        pages = cv_pages(page_count, seed=page_count * 10 + columns, words=(6, 12) if columns == 1 else (2, 4))
+        text = "\n".join("\n".join(lines) for lines in pages)
+        documents.append(Document(name, build_pdf(pages, columns=columns), text, page_count))
+    return documents
@@ -0,0 +1,34 @@
+"""
+Construit app/data/language_profiles.json à partir des textes de
+scripts/language_corpus/<code>.txt (trigrammes les plus fréquents par langue).
+
+Usage (depuis backend/) :
+    python -m scripts.build_language_profiles [taille_du_profil]
+"""
+import json
+import os
+import sys
+from collections import Counter
+
+from app.language_id import extract_trigrams
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "language_corpus")
+OUTPUT = os.path.join(os.path.dirname(__file__), "..", "app", "data", "language_profiles.json")
+LANGUAGES = ["fr", "en", "es", "de", "ar"]
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    profiles = {}
+    for language in LANGUAGES:
+        with open(os.path.join(CORPUS_DIR, f"{language}.txt"), encoding="utf-8") as handle:
+            counts = Counter(extract_trigrams(handle.read()))
+        profiles[language] = dict(counts.most_common(size))
+    with open(OUTPUT, "w", encoding="utf-8") as handle:
+        json.dump({"version": "1", "profile_size": size, "profiles": profiles}, handle, ensure_ascii=False, indent=0)
+        handle.write("\n")
+    print(f"{len(profiles)} profils écrits dans {os.path.normpath(OUTPUT)}")
+
+
+if __name__ == "__main__":
+    main()
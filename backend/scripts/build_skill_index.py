@@ -0,0 +1,25 @@
+"""
+Précalcule l'index vectoriel des compétences (SKILL_INDEX_PATH) à partir de la
+liste commune et de la taxonomie des métiers, par exemple lors du déploiement,
+pour que les workers l'ouvrent directement en mmap.
+
+Usage (depuis backend/) :
+    python -m scripts.build_skill_index
+"""
+import os
+
+from app.config import settings
+from app import nlp_utils
+
+
+def main():
+    # Sans le JSON, l'index est recalculé ; l'enregistrement supprime les anciennes matrices
+    path = f"{settings.SKILL_INDEX_PATH}.json"
+    if os.path.exists(path):
+        os.remove(path)
+    index = nlp_utils.get_skill_index()
+    print(f"{len(index.skills)} compétences, matrice {index.matrix.shape} écrite à côté de {settings.SKILL_INDEX_PATH}")
+
+
+if __name__ == "__main__":
+    main()
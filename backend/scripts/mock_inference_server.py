@@ -0,0 +1,168 @@
+"""
+Serveur local compatible text_generation (TGI) pour les tests et les essais de
+charge sans accès à l'API Hugging Face.
+
+- latence par requête selon une distribution (fixe, uniforme ou log-normale) ;
+- taux d'erreurs (réponses 503) ;
+- streaming SSE token par token avec un délai entre tokens ;
+- lots de prompts ({"inputs": [...]}, voir llm_batcher) ;
+- réponse dépendant du prompt (compétences, suggestions ou conseil du chatbot).
+
+Usage (depuis backend/) :
+    python -m scripts.mock_inference_server --port 8080 --delay 0.4 --jitter 0.5 --distribution lognormal --error-rate 0.02
+puis HF_INFERENCE_URL=http://127.0.0.1:8080 pour l'application.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+
+class MockInferenceServer:
+    """
+    Serveur de génération factice : latence et erreurs configurables, suivi des
+    prompts reçus, des lots et du nombre maximal d'appels simultanés.
+
+    delay est la latence médiane ; jitter l'écart relatif (uniforme : ±jitter × delay,
+    log-normale : écart-type de log(latence)).
+    """
+
+    def __init__(self, delay: float = 0.0, token_delay: float = 0.0, jitter: float = 0.0,
+                 distribution: str = "fixed", error_rate: float = 0.0, seed: int = 0,
+                 host: str = "127.0.0.1", port: int = 0):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Distribution inconnue: {distribution}")
+        self.delay = delay
+        self.token_delay = token_delay
+        self.jitter = jitter
+        self.distribution = distribution
+        self.error_rate = error_rate
+        self.prompts = []
+        self.batches = []
+        self.active = 0
+        self.max_active = 0
+        self.requests = 0
+        self.errors = 0
+        self.fail = False
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        handler = type("Handler", (_MockHandler,), {"mock": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.url = f"http://{host}:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def latency(self) -> float:
+        with self._lock:
+            if self.distribution == "uniform":
+                return max(0.0, self._random.uniform(self.delay * (1 - self.jitter), self.delay * (1 + self.jitter)))
+            if self.distribution == "lognormal" and self.delay > 0:
+                return self._random.lognormvariate(math.log(self.delay), self.jitter)
+            return self.delay
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self.fail or (self.error_rate > 0 and self._random.random() < self.error_rate)
+
+    def reply(self, prompt: str) -> str:
+        if "compétences" in prompt and "poste" in prompt:
+            return "Python\nSQL\nGit\nDocker\nCommunication"
+        if "suggestions" in prompt:
+            return "- Ajoutez vos dates\n- Quantifiez vos résultats\n- Relisez votre CV"
+        return "Mettez en avant vos réalisations chiffrées."
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    mock: MockInferenceServer = None
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        mock = self.mock
+        inputs = payload["inputs"]
+        batched = isinstance(inputs, list)
+        with mock._lock:
+            if batched:
+                mock.prompts.extend(inputs)
+                mock.batches.append(len(inputs))
+            else:
+                mock.prompts.append(inputs)
+            mock.requests += 1
+            mock.active += 1
+            mock.max_active = max(mock.max_active, mock.active)
+        try:
+            time.sleep(mock.latency())
+            failed = mock.should_fail()
+            if payload.get("stream") and not failed:
+                return self._stream(mock.reply(inputs))
+            if failed:
+                with mock._lock:
+                    mock.errors += 1
+                body, status = b'{"error": "model overloaded"}', 503
+            elif batched:
+                body, status = json.dumps([{"generated_text": mock.reply(prompt)} for prompt in inputs]).encode(), 200
+            else:
+                body, status = json.dumps([{"generated_text": mock.reply(inputs)}]).encode(), 200
+        finally:
+            with mock._lock:
+                mock.active -= 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, text: str):
+        # Un événement SSE par mot, au format des flux TGI
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = text.split(" ")
+        for index, word in enumerate(words):
+            token = word if index == 0 else " " + word
+            event = {"index": index, "token": {"id": index, "text": token, "logprob": 0.0, "special": False},
+                     "generated_text": text if index == len(words) - 1 else None, "details": None}
+            data = f"data:{json.dumps(event)}\n\n".encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+            time.sleep(self.mock.token_delay)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur text_generation factice (compatible TGI)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--delay", type=float, default=0.3, help="latence médiane par requête (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="dispersion de la latence")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="proportion de réponses 503")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="délai entre tokens en streaming (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockInferenceServer(delay=args.delay, token_delay=args.token_delay, jitter=args.jitter,
+                                 distribution=args.distribution, error_rate=args.error_rate, seed=args.seed,
+                                 host=args.host, port=args.port)
+    print(f"Serveur d'inférence factice sur {server.url} (Ctrl+C pour arrêter)")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import os
+from collections import Counter
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Traitements NLP dans le processus de test (les monkeypatch de nlp_utils s'y appliquent)
+os.environ.setdefault("NLP_POOL_WORKERS", "0")
+
+from app.main import app
+from app.database import get_db
+from app.auth import get_current_user
+from app import models
+from scripts.mock_inference_server import MockInferenceServer
+
+
+@pytest.fixture
+def db():
+    """Session SQLite en mémoire avec toutes les tables créées."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def user(db):
+    db_user = models.User(email="test@smartcv.fr", full_name="Test", hashed_password="x")
+    db.add(db_user)
+    db.commit()
+    return db_user
+
+
+@pytest.fixture
+def user_client(db, user):
+    """Client de test authentifié, branché sur la session SQLite."""
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def mock_llm(monkeypatch):
+    """Serveur d'inférence local branché sur le client LLM partagé."""
+    from app import llm_client, nlp_utils
+
+    server = MockInferenceServer()
+    client = llm_client.LLMClient(base_url=server.url, timeout=5, max_concurrency=4)
+    monkeypatch.setattr(llm_client, "llm_client", client)
+    monkeypatch.setattr(nlp_utils, "llm_client", client)
+    monkeypatch.setattr(nlp_utils, "llm_requests", Counter())
+    monkeypatch.setattr(nlp_utils, "llm_fallbacks", Counter())
+    nlp_utils.skill_suggestions_cache.clear()
+    try:
+        yield server
+    finally:
+        server.close()
@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app import analysis_cache, models, nlp_utils
+
+client = TestClient(app)
+
+TEXT = "Data scientist : Python, SQL et Docker.\nMaster en statistiques."
+
+def test_repeated_analysis_does_not_parse_again():
+    analysis_cache.cache.clear()
+    before = nlp_utils.parse_counter["nlp"]
+    first = client.post("/nlp/analyze", json={"text": TEXT}).json()
+    # Même contenu, aux fins de ligne et espaces en bordure près
+    second = client.post("/nlp/analyze", json={"text": "  " + TEXT.replace("\n", "\r\n")}).json()
+    assert first == second
+    assert nlp_utils.parse_counter["nlp"] - before == 1
+
+def test_cv_row_layer_and_version_invalidation(monkeypatch):
+    calls = []
+
+    async def compute(text):
+        calls.append(text)
+        return nlp_utils.analyze_cv(text)
+
+    cv = models.CV(data=TEXT)
+    analysis_cache.cache.clear()
+    analysis = asyncio.run(analysis_cache.get_analysis(cv.data, compute, cv=cv))
+    assert json.loads(cv.skills) == analysis["skills"]
+    assert json.loads(cv.evaluation)["analysis"] == analysis
+
+    # Cache mémoire vidé : le résultat est relu depuis la ligne CV
+    analysis_cache.cache.clear()
+    assert asyncio.run(analysis_cache.get_analysis(cv.data, compute, cv=cv)) == analysis
+    assert len(calls) == 1
+
+    monkeypatch.setattr(analysis_cache.settings, "ANALYZER_VERSION", "test-2")
+    asyncio.run(analysis_cache.get_analysis(cv.data, compute, cv=cv))
+    assert len(calls) == 2
+    assert json.loads(cv.evaluation)["analyzer_version"] == "test-2"
+
+def test_lru_eviction():
+    lru = analysis_cache.LRUCache(maxsize=2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    lru.get("a")
+    lru.put("c", 3)
+    assert lru.get("b") is None and lru.get("a") == 1
+    assert lru.metrics()["evictions"] == 1
+
+def test_cv_analyze_endpoint_persists_result(user_client, db, user):
+    cv = models.CV(user_id=user.id, data="Designer : Figma, Photoshop et Illustrator.")
+    db.add(cv)
+    db.commit()
+    before = nlp_utils.parse_counter["nlp"]
+    first = user_client.post(f"/cv/{cv.id}/analyze")
+    assert first.status_code == 200
+    db.refresh(cv)
+    assert set(json.loads(cv.skills)) >= {"figma", "photoshop", "illustrator"}
+
+    analysis_cache.cache.clear()
+    second = user_client.post(f"/cv/{cv.id}/analyze")
+    assert second.json() == first.json()
+    assert nlp_utils.parse_counter["nlp"] - before == 1
@@ -0,0 +1,109 @@
+import asyncio
+import io
+import zipfile
+
+import docx
+import pytest
+
+from app import bulk_import, file_blobs, models
+from app.bulk_import import BulkImporter, bulk_importer
+from benchmarks.pdf_corpus import build_pdf
+
+
+def docx_bytes(text):
+    document = docx.Document()
+    document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def archive(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in members:
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def importer(monkeypatch):
+    # Un thread dans le processus de test, lots de 2 CV
+    monkeypatch.setattr(bulk_importer, "workers", 0)
+    monkeypatch.setattr(bulk_importer, "batch_size", 2)
+    yield bulk_importer
+    bulk_importer.shutdown()
+
+
+def test_bulk_import_reports_each_file(user_client, importer, db):
+    content = archive([
+        ("cvs/", b""),
+        ("cvs/alice.pdf", build_pdf(["Alice Martin", "Développeuse Python"])),
+        ("cvs/bob.docx", docx_bytes("Bob Durand, analyste SQL")),
+        ("cvs/notes.txt", b"texte"),
+        ("cvs/casse.pdf", b"pas un pdf"),
+        ("cvs/claire.docx", docx_bytes("Claire Petit, cheffe de projet")),
+        ("__MACOSX/cvs/._alice.pdf", b"\0"),
+    ])
+    response = user_client.post("/cv/import/bulk", files={"file": ("cvs.zip", content, "application/zip")})
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total"], report["imported"], report["failed"], report["skipped"]) == (5, 3, 1, 1)
+    statuses = {result["filename"]: result["status"] for result in report["files"]}
+    assert statuses == {"cvs/alice.pdf": "imported", "cvs/bob.docx": "imported", "cvs/notes.txt": "skipped",
+                        "cvs/casse.pdf": "failed", "cvs/claire.docx": "imported"}
+
+    cv_ids = [result["cv_id"] for result in report["files"] if result["status"] == "imported"]
+    texts = [db.get(models.CV, cv_id).data for cv_id in cv_ids]
+    assert texts == ["Alice Martin\nDéveloppeuse Python", "Bob Durand, analyste SQL", "Claire Petit, cheffe de projet"]
+
+
+def test_duplicate_members_share_one_blob(user_client, importer, db):
+    cv = docx_bytes("Bob Durand, analyste SQL")
+    content = archive([("a.docx", cv), ("b.docx", cv), ("c.docx", cv)])
+    report = user_client.post("/cv/import/bulk", files={"file": ("cvs.zip", content)}).json()
+    assert report["imported"] == 3
+    blob = db.query(models.FileBlob).one()
+    assert blob.uploads == 3 and blob.size == len(cv)
+    assert db.query(models.CV).filter(models.CV.blob_sha256 == blob.sha256).count() == 3
+
+
+def test_known_content_is_not_extracted_again(user_client, importer, db, monkeypatch):
+    cv = docx_bytes("Bob Durand, analyste SQL")
+    user_client.post("/cv/import/bulk", files={"file": ("cvs.zip", archive([("a.docx", cv)]))})
+
+    def extract_member(path, name, max_bytes):
+        raise AssertionError("contenu déjà importé extrait à nouveau")
+
+    monkeypatch.setattr(bulk_import, "extract_member", extract_member)
+    before = file_blobs.stats["extractions_skipped"]
+    report = user_client.post("/cv/import/bulk", files={"file": ("cvs.zip", archive([("b.docx", cv), ("c.docx", cv)]))}).json()
+    assert report["imported"] == 2
+    assert file_blobs.stats["extractions_skipped"] - before == 2
+    assert {cv.data for cv in db.query(models.CV)} == {"Bob Durand, analyste SQL"}
+
+
+def test_invalid_archive_is_rejected(user_client, importer):
+    response = user_client.post("/cv/import/bulk", files={"file": ("cvs.zip", b"pas un zip")})
+    assert response.status_code == 400
+    response = user_client.post("/cv/import/bulk", files={"file": ("cv.pdf", b"%PDF")})
+    assert response.status_code == 400
+
+
+def test_archive_members_are_extracted_by_worker_processes(tmp_path):
+    path = tmp_path / "cvs.zip"
+    members = [(f"cv-{index}.pdf", build_pdf([f"CV numéro {index}"])) for index in range(6)]
+    path.write_bytes(archive(members + [("gros.docx", b"\0" * 5000)]))
+
+    async def extract():
+        return [item async for item in importer.extract_archive(str(path))]
+
+    importer = BulkImporter(workers=2, max_member_bytes=4000)
+    try:
+        results = asyncio.run(extract())
+    finally:
+        importer.shutdown()
+    # Résultats dans l'ordre de l'archive, fichiers trop volumineux refusés sans être lus
+    assert [(name, member.text) for name, member, _ in results[:6]] == [(f"cv-{index}.pdf", f"CV numéro {index}")
+                                                               for index in range(6)]
+    assert results[6][1] is None and "trop volumineux" in results[6][2]
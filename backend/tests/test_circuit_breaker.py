@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from app.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+from app.llm_client import LLMClient
+from app import nlp_utils
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_after_threshold_and_probes_after_recovery():
+    clock = FakeClock()
+    breaker = CircuitBreaker("m", failure_threshold=3, recovery_time=10, clock=clock)
+    for _ in range(3):
+        breaker.acquire()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.acquire()
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    breaker.acquire()
+    # Un seul appel d'essai à la fois
+    with pytest.raises(CircuitOpen):
+        breaker.acquire()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 20
+    breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    metrics = breaker.metrics()
+    assert metrics["opened"] == 2 and metrics["rejected"] == 2 and metrics["probes"] == 2
+
+
+def test_cancelled_probe_releases_its_slot():
+    clock = FakeClock()
+    breaker = CircuitBreaker("m", failure_threshold=1, recovery_time=5, clock=clock)
+    breaker.acquire()
+    breaker.record_failure()
+    clock.now = 5
+    breaker.acquire()
+    breaker.record_cancelled()
+    breaker.acquire()
+    assert breaker.state == HALF_OPEN
+
+
+def test_open_breaker_falls_back_without_network(user_client, mock_llm):
+    mock_llm.fail = True
+    client = nlp_utils.llm_client
+    client.breaker_failures = 2
+    # Réponse et suggestions échouent : deux échecs consécutifs pour le modèle
+    user_client.post("/assistant/chatbot", json={"text": "Bonjour"})
+    assert client.breaker(nlp_utils.CHATBOT_MODEL).state == OPEN
+
+    received = len(mock_llm.prompts)
+    data = user_client.post("/assistant/chatbot", json={"text": "Bonjour"}).json()
+    assert data["message"] == nlp_utils.CHATBOT_FALLBACK["message"]
+    assert len(mock_llm.prompts) == received
+
+    metrics = user_client.get("/nlp/llm/metrics").json()
+    assert metrics["breakers"][nlp_utils.CHATBOT_MODEL]["state"] == OPEN
+    chatbot = metrics["operations"]["chatbot"]
+    assert chatbot["requests"] == 2 and chatbot["fallback_rate"] == 1.0
+    assert chatbot["reasons"] == {"circuit_open": 1, "error": 1}
+
+
+def test_deadline_covers_the_wait_for_a_slot(mock_llm):
+    mock_llm.delay = 0.5
+    client = LLMClient(base_url=mock_llm.url, timeout=0.2, max_concurrency=1)
+
+    async def scenario():
+        results = await asyncio.gather(client.text_generation("a", model="m"),
+                                       client.text_generation("b", model="m"), return_exceptions=True)
+        await client.aclose()
+        return results
+
+    loop = asyncio.new_event_loop()
+    try:
+        start = loop.time()
+        results = loop.run_until_complete(scenario())
+        elapsed = loop.time() - start
+    finally:
+        loop.close()
+    assert all(isinstance(result, asyncio.TimeoutError) for result in results)
+    # Le second appel n'attend pas la fin du premier au-delà de son propre délai
+    assert elapsed < 0.45
@@ -0,0 +1,49 @@
+import types
+
+from app import cv_sections, nlp_utils
+from app.cv_sections import SectionSegmenter, SECTION_HEADINGS, SECTION_KEYWORDS
+
+CV_TEXT = (
+    "Jean Dupont\n"
+    "Email : jean.dupont@example.com\n"
+    "EXPÉRIENCE PROFESSIONNELLE\n"
+    "- Développeur backend chez Acme (2019-2023)\n"
+    "Formation :\n"
+    "Master en informatique, Université de Lyon.\n"
+    "Langues\n"
+    "Anglais courant\n"
+    "Berufserfahrung\n"
+    "Entwickler bei Siemens"
+)
+
+segmenter = SectionSegmenter(SECTION_HEADINGS, SECTION_KEYWORDS)
+
+def test_spans_are_typed_with_offsets():
+    spans = list(segmenter.iter_spans(CV_TEXT))
+    assert [(span.kind, span.source) for span in spans] == [
+        ("contact", "keyword"),
+        ("experience", "heading"),
+        ("experience", "section"),
+        ("education", "heading"),
+        ("education", "section"),
+        ("experience", "heading"),
+        ("experience", "section"),
+    ]
+    for span in spans:
+        assert CV_TEXT[span.start:span.end] == span.text
+    assert spans[2].text == "Développeur backend chez Acme (2019-2023)"
+
+def test_sections_stop_at_unrelated_headings():
+    sections = list(segmenter.iter_sections(CV_TEXT))
+    assert [section.kind for section in sections] == ["experience", "education", "experience"]
+    assert CV_TEXT[sections[1].start:sections[1].end] == "Formation :\nMaster en informatique, Université de Lyon."
+
+def test_keywords_respect_word_boundaries():
+    assert nlp_utils.extract_degrees("Développeur backend senior") == []
+    assert nlp_utils.extract_degrees("Bac+5 en informatique") == ["Bac+5 en informatique"]
+    assert nlp_utils.extract_experiences("Cinco años de experiencia en ventas\nOtros datos") == ["Cinco años de experiencia en ventas"]
+
+def test_iter_spans_is_lazy():
+    spans = segmenter.iter_spans("Expérience\nDéveloppeur\n" * 50000)
+    assert isinstance(spans, types.GeneratorType)
+    assert next(spans).source == cv_sections.HEADING
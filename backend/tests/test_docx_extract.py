@@ -0,0 +1,50 @@
+import io
+import zipfile
+
+import docx
+import pytest
+
+from app import docx_extract, nlp_utils
+from benchmarks.docx_corpus import add_text_box, corpus
+
+
+@pytest.mark.parametrize("document", corpus(), ids=lambda document: document.name)
+def test_cv_templates_are_extracted_in_full(document):
+    assert docx_extract.extract(io.BytesIO(document.content)) == document.text
+
+
+def test_text_boxes_tables_and_repeated_headers():
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Camille Martin"
+    anchor = document.add_paragraph("Profil")
+    add_text_box(anchor, ["Compétences", "Python"])
+    paragraph = document.add_paragraph("Lyon")
+    paragraph.add_run("\tRemote")
+    paragraph.add_run().add_break()
+    paragraph.add_run("Disponible")
+    table = document.add_table(rows=1, cols=2)
+    table.rows[0].cells[0].text = "SQL"
+    nested = table.rows[0].cells[1].add_table(rows=1, cols=2)
+    nested.rows[0].cells[0].text, nested.rows[0].cells[1].text = "Docker", "Expert"
+    # Deuxième section avec le même en-tête
+    document.add_section()
+    document.sections[1].header.is_linked_to_previous = False
+    document.sections[1].header.paragraphs[0].text = "Camille Martin"
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    # Zone de texte lue une seule fois (mc:Fallback ignoré), avant son paragraphe d'ancrage
+    assert nlp_utils.docx_text(buffer) == (
+        "Camille Martin\nCompétences\nPython\nProfil\nLyon\tRemote\nDisponible\nSQL\tDocker\tExpert"
+    )
+
+
+def test_stop_chars_and_invalid_files():
+    long_cv = corpus()[-1]
+    text = docx_extract.extract(io.BytesIO(long_cv.content), stop_chars=500)
+    assert 500 <= len(text) < 700 and long_cv.text.startswith(text)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("autre.xml", "<a/>")
+    with pytest.raises(ValueError):
+        docx_extract.extract(buffer)
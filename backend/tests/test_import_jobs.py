@@ -0,0 +1,163 @@
+import asyncio
+import io
+import json
+import time
+from datetime import datetime, timedelta
+
+import docx
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app import import_jobs as import_jobs_module, models
+from app.import_jobs import import_jobs
+
+TEXT = "Développeur Python : Django, SQL et Docker. Master en informatique."
+
+
+def docx_bytes(text=TEXT):
+    document = docx.Document()
+    document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def queue(db, tmp_path, monkeypatch):
+    """File d'import branchée sur la base de test, sans workers en arrière-plan."""
+    monkeypatch.setattr(import_jobs, "session_factory", sessionmaker(autoflush=False, bind=db.get_bind()))
+    monkeypatch.setattr(import_jobs, "storage_dir", str(tmp_path))
+    monkeypatch.setattr(import_jobs, "retry_delay", 0)
+    return import_jobs
+
+
+def upload(client, content=None, key=None):
+    headers = {"Idempotency-Key": key} if key else {}
+    return client.post("/cv/import", headers=headers, files={"file": ("cv.docx", content or docx_bytes())})
+
+
+def test_import_returns_job_then_worker_creates_cv(user_client, queue, db, tmp_path):
+    response = upload(user_client)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued" and job["cv_id"] is None
+    assert response.headers["Location"] == f"/cv/import/jobs/{job['id']}"
+
+    assert asyncio.run(queue.run_pending()) == 1
+    job = user_client.get(f"/cv/import/jobs/{job['id']}").json()
+    assert job["status"] == "succeeded" and job["attempts"] == 1
+    cv = db.get(models.CV, job["cv_id"])
+    assert cv.data == TEXT
+    assert json.loads(cv.evaluation)["analysis"]["skills"]
+    # Le fichier reçu est supprimé une fois le job terminé
+    assert not list(tmp_path.iterdir())
+
+    events = user_client.get(f"/cv/import/jobs/{job['id']}/events").text
+    assert events.startswith("event: status\n") and '"succeeded"' in events
+
+
+def test_unsupported_format_and_unknown_job(user_client, queue):
+    response = user_client.post("/cv/import", files={"file": ("cv.txt", b"texte")})
+    assert response.status_code == 400
+    assert user_client.get("/cv/import/jobs/inconnu").status_code == 404
+
+
+def test_idempotency_key_returns_the_same_job(user_client, queue, db):
+    first = upload(user_client, key="import-1").json()
+    second = upload(user_client, key="import-1").json()
+    assert first["id"] == second["id"]
+    assert upload(user_client, key="import-2").json()["id"] != first["id"]
+    assert db.query(models.ImportJob).count() == 2
+
+
+def test_job_of_a_stopped_worker_is_resumed_after_its_lease(user_client, queue, db):
+    job_id = upload(user_client).json()["id"]
+    # Worker arrêté en plein traitement : job pris, jamais terminé
+    assert queue.claim() is not None
+    assert queue.claim() is None
+
+    job = db.get(models.ImportJob, job_id)
+    job.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    assert asyncio.run(queue.run_pending()) == 1
+    db.refresh(job)
+    assert job.status == "succeeded" and job.attempts == 2
+    assert db.query(models.CV).count() == 1
+
+
+def test_lease_is_renewed_while_the_job_runs(user_client, queue, db, monkeypatch):
+    job_id = upload(user_client).json()["id"]
+    monkeypatch.setattr(queue, "lease_seconds", 0.3)
+
+    def slow_extract(path):
+        time.sleep(1)
+        return TEXT
+
+    monkeypatch.setattr(import_jobs_module, "extract_file_text", slow_extract)
+
+    async def scenario():
+        running = asyncio.create_task(queue.run_job(*queue.claim()))
+        await asyncio.sleep(0.6)
+        # Bail initial dépassé, mais renouvelé : aucun autre worker ne prend le job
+        stolen = queue.claim()
+        await running
+        return stolen
+
+    assert asyncio.run(scenario()) is None
+    job = db.get(models.ImportJob, job_id)
+    assert job.status == "succeeded" and job.attempts == 1
+
+def test_failed_attempt_is_retried_without_duplicate_cv(user_client, queue, db, monkeypatch):
+    job_id = upload(user_client).json()["id"]
+    analyze = import_jobs_module.analyze_text
+    calls = []
+
+    async def flaky(text):
+        calls.append(text)
+        if len(calls) == 1:
+            raise RuntimeError("worker NLP indisponible")
+        return await analyze(text)
+
+    monkeypatch.setattr(import_jobs_module, "analyze_text", flaky)
+    assert asyncio.run(queue.run_pending()) == 2
+    job = db.get(models.ImportJob, job_id)
+    assert job.status == "succeeded" and job.attempts == 2 and job.error is None
+    assert db.query(models.CV).count() == 1
+
+    # Un worker dont le bail a été repris ne peut plus terminer le job
+    assert not queue._complete(job_id, "ancien-bail", TEXT, {})
+    assert db.query(models.CV).count() == 1
+
+
+def test_job_fails_after_max_attempts(user_client, queue, db, monkeypatch):
+    job_id = upload(user_client, content=b"pas un docx").json()["id"]
+    monkeypatch.setattr(queue, "max_attempts", 2)
+    assert asyncio.run(queue.run_pending()) == 2
+    job = db.get(models.ImportJob, job_id)
+    assert job.status == "failed" and job.error and job.finished_at
+    assert db.query(models.CV).count() == 0
+
+
+def test_repeat_upload_reuses_the_extracted_text(user_client, queue, db, tmp_path, monkeypatch):
+    content = docx_bytes()
+    upload(user_client, content)
+    asyncio.run(queue.run_pending())
+
+    extracted = []
+    monkeypatch.setattr(import_jobs_module, "extract_file_text", lambda path: extracted.append(path))
+    job = upload(user_client, content).json()
+    # Fichier identique : rien n'est conservé sur disque
+    assert not list(tmp_path.iterdir())
+    asyncio.run(queue.run_pending())
+    job = user_client.get(f"/cv/import/jobs/{job['id']}").json()
+    assert job["status"] == "succeeded" and extracted == []
+
+    blob = db.query(models.FileBlob).one()
+    assert blob.uploads == 2
+    assert {cv.blob_sha256 for cv in db.query(models.CV)} == {blob.sha256}
+    assert db.get(models.CV, job["cv_id"]).data == TEXT
+
+    metrics = user_client.get("/cv/import/metrics").json()
+    assert (metrics["blobs"], metrics["duplicate_uploads"]) == (1, 1)
+    assert metrics["bytes_deduplicated"] == len(content)
+    assert metrics["text_bytes_stored"] == len(TEXT)
@@ -0,0 +1,23 @@
+from app.job_scoring import JobSkillMatrix
+
+JOBS = {
+    "développeur": ["Python", "SQL", "Git", "JavaScript"],
+    "data scientist": ["Python", "R", "SQL", "Machine Learning"],
+    "designer": ["Figma", "Photoshop"],
+}
+
+def test_inverted_index():
+    matrix = JobSkillMatrix(JOBS)
+    assert matrix.jobs_for_skill("SQL") == ["développeur", "data scientist"]
+    assert matrix.jobs_for_skill("cobol") == []
+
+def test_score_counts_whole_words_only():
+    matrix = JobSkillMatrix(JOBS)
+    # "r" ne doit pas être trouvé dans "react", ni "java" dans "javascript"
+    scores = matrix.score(["python", "react", "sql server"])
+    assert scores == {"développeur": 0.5, "data scientist": 0.5, "designer": 0.0}
+
+def test_batch_scores_follow_input_and_job_order():
+    matrix = JobSkillMatrix(JOBS)
+    scores = matrix.score_batch([["figma"], [], ["python", "machine learning", "r"]], ["designer", "data scientist"])
+    assert scores.tolist() == [[0.5, 0.0], [0.0, 0.0], [0.0, 0.75]]
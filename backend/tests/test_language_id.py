@@ -0,0 +1,29 @@
+import json
+import os
+
+from app.language_id import LanguageIdentifier, extract_trigrams, trigram_bucket, trigram_buckets, char_ids
+from app import nlp_utils
+
+SAMPLES = os.path.join(os.path.dirname(__file__), "fixtures", "language_samples.json")
+
+def test_profile_trigrams_map_to_text_buckets():
+    text = "l'équipe  d'été"
+    trigrams = list(extract_trigrams(text))
+    assert trigrams[0] == " l "
+    assert [trigram_bucket(trigram) for trigram in trigrams] == trigram_buckets(char_ids(text)).tolist()
+
+def test_accuracy_on_labeled_samples():
+    with open(SAMPLES, encoding="utf-8") as handle:
+        samples = json.load(handle)
+    correct = sum(nlp_utils.detect_language(sample["text"]) == sample["language"] for sample in samples)
+    assert correct / len(samples) >= 0.95
+
+def test_short_text_is_unknown():
+    assert nlp_utils.identify_language("CV") == ("unknown", 0.0)
+    assert nlp_utils.identify_language("") == ("unknown", 0.0)
+
+def test_confidence_and_custom_profiles():
+    identifier = LanguageIdentifier({"aa": {" ab": 5, "aba": 5, "ba ": 5}, "zz": {" zy": 5, "zyz": 5, "yz ": 5}}, min_trigrams=2)
+    language, confidence = identifier.identify("ababa ababa")
+    assert language == "aa"
+    assert 0.5 < confidence <= 1.0
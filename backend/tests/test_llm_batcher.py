@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from app.llm_batcher import MicroBatcher
+from app.llm_client import LLMClient
+
+
+def test_prompts_within_the_window_share_one_request(mock_llm):
+    client = LLMClient(base_url=mock_llm.url, timeout=5, batch_window=0.05, batch_max_size=8)
+
+    async def scenario():
+        prompts = ["quelles compétences pour le poste de développeur", "donne des suggestions", "bonjour"]
+        results = await asyncio.gather(*(client.text_generation(prompt, model="m", max_new_tokens=10)
+                                         for prompt in prompts))
+        await client.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+    assert results == [
+        "Python\nSQL\nGit\nDocker\nCommunication",
+        "- Ajoutez vos dates\n- Quantifiez vos résultats\n- Relisez votre CV",
+        "Mettez en avant vos réalisations chiffrées.",
+    ]
+    assert mock_llm.batches == [3]
+    assert client.batch_metrics()["mean_batch_size"] == 3
+
+
+def test_full_batches_are_sent_without_waiting_and_parameters_split_batches(mock_llm):
+    client = LLMClient(base_url=mock_llm.url, timeout=5, batch_window=10, batch_max_size=2)
+
+    async def scenario():
+        await asyncio.gather(
+            client.text_generation("a", model="m", temperature=0.5),
+            client.text_generation("b", model="m", temperature=0.5),
+        )
+        await asyncio.wait_for(asyncio.gather(
+            client.text_generation("c", model="m", temperature=0.5),
+            client.text_generation("d", model="m", temperature=0.7),
+        ), 0.3)
+
+    # Le lot plein part immédiatement ; deux paramètres différents attendent la fenêtre
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(scenario())
+    assert mock_llm.batches == [2]
+
+
+def test_batch_failure_reaches_every_caller():
+    async def dispatch(key, prompts):
+        raise RuntimeError("endpoint indisponible")
+
+    async def scenario():
+        batcher = MicroBatcher(dispatch, window=0.01)
+        return await asyncio.gather(batcher.submit("k", "a"), batcher.submit("k", "b"), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert [str(result) for result in results] == ["endpoint indisponible"] * 2
+
+
+def test_failed_batch_counts_once_in_the_breaker(mock_llm):
+    mock_llm.fail = True
+    client = LLMClient(base_url=mock_llm.url, timeout=5, batch_window=10, batch_max_size=8, breaker_failures=5)
+
+    async def scenario():
+        results = await asyncio.gather(*(client.text_generation(f"prompt {index}", model="m") for index in range(8)),
+                                       return_exceptions=True)
+        await client.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, Exception) for result in results)
+    assert mock_llm.batches == [8]
+    metrics = client.breaker("m").metrics()
+    assert (metrics["state"], metrics["failures"]) == ("closed", 1)
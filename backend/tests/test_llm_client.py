@@ -0,0 +1,131 @@
+import json
+import asyncio
+import time
+
+from app.llm_client import LLMClient
+from app import nlp_utils
+
+def test_chatbot_endpoint_runs_both_generations_concurrently(user_client, mock_llm):
+    mock_llm.delay = 0.3
+    start = time.perf_counter()
+    response = user_client.post("/assistant/chatbot", json={"text": "Comment décrire mon expérience ?", "job_title": "développeur"})
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200
+    data = response.json()
+    assert data["message"] == "Mettez en avant vos réalisations chiffrées."
+    assert data["suggestions"] == ["Ajoutez vos dates", "Quantifiez vos résultats", "Relisez votre CV"]
+    assert data["next_step"] == "experience"
+    assert len(mock_llm.prompts) == 2
+    # Deux générations de 0,3 s en parallèle, pas l'une après l'autre
+    assert elapsed < 0.55
+
+def test_concurrency_is_bounded(mock_llm):
+    mock_llm.delay = 0.05
+    client = LLMClient(base_url=mock_llm.url, timeout=5, max_concurrency=3)
+
+    async def scenario():
+        results = await asyncio.gather(*(client.text_generation(f"question {i}", model="m") for i in range(12)))
+        await client.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+    assert len(results) == 12
+    assert mock_llm.max_active <= 3
+
+def test_timeout_and_server_errors_fall_back(user_client, mock_llm):
+    mock_llm.fail = True
+    data = user_client.post("/assistant/chatbot", json={"text": "Bonjour"}).json()
+    assert data["message"] == nlp_utils.CHATBOT_FALLBACK["message"]
+
+    mock_llm.fail = False
+    mock_llm.delay = 0.5
+    client = LLMClient(base_url=mock_llm.url, timeout=0.1)
+    start = time.perf_counter()
+    try:
+        asyncio.run(client.text_generation("question", model="m"))
+        raised = False
+    except asyncio.TimeoutError:
+        raised = True
+    assert raised and time.perf_counter() - start < 0.4
+
+def test_suggest_skills_endpoint(mock_llm):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    response = TestClient(app).post("/nlp/suggest-skills", params={"job_title": "Data Analyst"})
+    assert response.json() == {"suggested_skills": ["Python", "SQL", "Git", "Docker", "Communication"]}
+
+def _read_events(response):
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_chatbot_stream_sends_tokens_then_suggestions(user_client, mock_llm):
+    response = user_client.post("/assistant/chatbot/stream", json={"text": "Comment présenter mes diplômes ?"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _read_events(response)
+    tokens = [data["text"] for event, data in events if event == "token"]
+    assert len(tokens) == 6
+    assert "".join(tokens) == "Mettez en avant vos réalisations chiffrées."
+    assert events[-1] == ("suggestions", {
+        "message": "Mettez en avant vos réalisations chiffrées.",
+        "suggestions": ["Ajoutez vos dates", "Quantifiez vos résultats", "Relisez votre CV"],
+        "next_step": "education",
+    })
+
+def test_first_token_arrives_before_generation_ends(mock_llm):
+    mock_llm.token_delay = 0.1
+
+    async def scenario():
+        start = time.perf_counter()
+        first = None
+        async for event, _ in nlp_utils.stream_chatbot_response("Bonjour"):
+            if first is None:
+                first = time.perf_counter() - start
+        return first, time.perf_counter() - start
+
+    time_to_first_token, total = asyncio.run(scenario())
+    # 6 tokens espacés de 0,1 s : le premier est transmis sans attendre les suivants
+    assert time_to_first_token < 0.2 < total
+
+def test_chatbot_stream_falls_back_on_error(user_client, mock_llm):
+    mock_llm.fail = True
+    response = user_client.post("/assistant/chatbot/stream", json={"text": "Bonjour"})
+    events = _read_events(response)
+    assert [event for event, _ in events] == ["error", "suggestions"]
+    assert events[-1][1]["message"] == nlp_utils.CHATBOT_FALLBACK["message"]
+
+def test_streams_release_their_connection(mock_llm):
+    client = LLMClient(base_url=mock_llm.url, timeout=5, max_concurrency=4)
+
+    async def scenario():
+        for _ in range(5):
+            tokens = [token async for token in client.stream_text_generation("Bonjour", model="m")]
+            assert "".join(tokens) == mock_llm.reply("Bonjour")
+        # 6 tokens espacés de 0,3 s : un flux complet dure 1,8 s
+        mock_llm.token_delay = 0.3
+        released = []
+        for _ in range(3):
+            # Client déconnecté après le premier token
+            stream = client.stream_text_generation("Bonjour", model="m")
+            await stream.__anext__()
+            await stream.aclose()
+            start = time.perf_counter()
+            while mock_llm.active and time.perf_counter() - start < 2:
+                await asyncio.sleep(0.01)
+            released.append(time.perf_counter() - start)
+        inference, _, http, _ = client._resources()
+        busy = [connection for connection in http._transport._pool.connections
+                if not (connection.is_idle() or connection.is_closed())]
+        # Aucun contexte de réponse conservé par le client partagé jusqu'à sa fermeture
+        retained = len(inference.exit_stack._exit_callbacks)
+        await client.aclose()
+        return released, busy, retained
+
+    released, busy, retained = asyncio.run(scenario())
+    # La connexion d'un flux interrompu est fermée : le serveur arrête d'écrire
+    # au token suivant au lieu d'envoyer toute la réponse
+    assert max(released) < 1
+    assert busy == [] and retained == 0
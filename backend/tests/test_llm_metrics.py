@@ -0,0 +1,57 @@
+import json
+import logging
+
+from app.llm_metrics import Histogram, LLMMetrics, count_tokens
+from app import nlp_utils
+
+
+def test_histogram_quantiles_are_interpolated_within_buckets():
+    histogram = Histogram((1, 2, 4))
+    for value in (0.5, 1.5, 1.5, 3, 10):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5 and snapshot["max"] == 10
+    assert snapshot["buckets"] == {"le_1": 1, "le_2": 2, "le_4": 1, "inf": 1}
+    assert 1 < snapshot["p50"] <= 2 and snapshot["p99"] > 4
+
+
+def test_quantiles_stay_within_observed_values():
+    histogram = Histogram((0.1, 0.25, 0.5, 1))
+    for _ in range(20):
+        histogram.observe(0.3)
+    snapshot = histogram.snapshot()
+    assert snapshot["p50"] == snapshot["p95"] == snapshot["p99"] == snapshot["min"] == snapshot["max"] == 0.3
+    histogram = Histogram((10, 20))
+    for value in (4, 5, 5):
+        histogram.observe(value)
+    assert 4 <= histogram.quantile(0.5) <= histogram.quantile(0.99) <= 5
+
+
+def test_calls_are_recorded_per_model_and_template(user_client, mock_llm, caplog):
+    mock_llm.delay = 0.05
+    with caplog.at_level(logging.INFO, logger="smartcv.llm"):
+        user_client.post("/assistant/chatbot", json={"text": "Comment décrire mon expérience ?"})
+        for _ in range(2):
+            user_client.post("/nlp/suggest-skills", params={"job_title": "Data Analyst"})
+
+    metrics = user_client.get("/nlp/llm/metrics").json()
+    calls = {call["template"]: call for call in metrics["calls"]}
+    assert set(calls) == {nlp_utils.CHATBOT_ANSWER_TEMPLATE, nlp_utils.CHATBOT_SUGGESTIONS_TEMPLATE,
+                          nlp_utils.SKILL_SUGGESTION_TEMPLATE}
+    answer = calls[nlp_utils.CHATBOT_ANSWER_TEMPLATE]
+    assert answer["model"] == nlp_utils.CHATBOT_MODEL and answer["outcomes"] == {"ok": 1}
+    assert answer["latency_seconds"]["count"] == 1 and answer["latency_seconds"]["sum"] >= 0.05
+    assert answer["generated_tokens"]["sum"] == count_tokens("Mettez en avant vos réalisations chiffrées.")
+    assert metrics["cache"][nlp_utils.SKILL_SUGGESTION_TEMPLATE] == {"hits": 1, "misses": 1}
+
+    records = [json.loads(record.message) for record in caplog.records]
+    assert [record["template"] for record in records if record["event"] == "llm_call"].count("chatbot_answer") == 1
+    assert all(record["outcome"] == "ok" for record in records if record["event"] == "llm_call")
+
+
+def test_failures_are_logged_with_their_outcome(caplog):
+    metrics = LLMMetrics()
+    with caplog.at_level(logging.WARNING, logger="smartcv.llm"):
+        metrics.record_call("m", "t", 0.2, 0, TimeoutError())
+    assert json.loads(caplog.records[0].message)["outcome"] == "timeout"
+    assert metrics.snapshot()["calls"][0]["outcomes"] == {"timeout": 1}
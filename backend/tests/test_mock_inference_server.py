@@ -0,0 +1,25 @@
+import statistics
+
+import httpx
+
+from scripts.mock_inference_server import MockInferenceServer
+
+
+def test_latency_distributions_and_error_rate():
+    server = MockInferenceServer(delay=0.1, jitter=0.5, distribution="lognormal", error_rate=0.25, seed=3)
+    try:
+        latencies = [server.latency() for _ in range(2000)]
+        assert 0.09 < statistics.median(latencies) < 0.11
+        assert max(latencies) > 0.2
+
+        failures = [server.should_fail() for _ in range(2000)]
+        assert 400 < failures.count(True) < 600
+
+        server.delay, server.fail = 0.0, True
+        assert httpx.post(server.url, json={"inputs": "bonjour"}).status_code == 503
+        server.fail, server.error_rate = False, 0.0
+        response = httpx.post(server.url, json={"inputs": ["bonjour", "quelles suggestions ?"]})
+        assert [item["generated_text"] for item in response.json()][0] == server.reply("bonjour")
+        assert server.errors == 1 and server.requests == 2
+    finally:
+        server.close()
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app import nlp_utils, analysis_cache
+from app.config import settings
+
+client = TestClient(app)
+
+CV_TEXT = (
+    "Développeur Python chez Capgemini depuis 2019.\n"
+    "Experience : création d'API avec FastAPI, Docker et PostgreSQL.\n"
+    "Master en informatique, Université de Lyon."
+)
+
+def test_analyze_parses_text_once():
+    analysis_cache.cache.clear()
+    before = nlp_utils.parse_counter["nlp"]
+    response = client.post("/nlp/analyze", json={"text": CV_TEXT})
+    assert response.status_code == 200
+    assert nlp_utils.parse_counter["nlp"] - before == 1
+    data = response.json()
+    assert {"python", "fastapi", "docker", "postgresql"} <= set(data["skills"])
+    assert data["degrees"] == ["Master en informatique, Université de Lyon."]
+
+def test_context_memoizes_derived_results():
+    context = nlp_utils.AnalysisContext(CV_TEXT)
+    before = nlp_utils.parse_counter["nlp"]
+    nlp_utils.extract_skills(CV_TEXT, context)
+    nlp_utils.summarize_text(CV_TEXT, context)
+    nlp_utils.evaluate_cv(CV_TEXT, context)
+    assert nlp_utils.parse_counter["nlp"] - before == 1
+
+def test_analyze_batch_keeps_order_and_isolates_errors():
+    texts = ["Développeur Python.", "", "Designer Figma et Photoshop."]
+    response = client.post("/nlp/analyze/batch", json={"texts": texts, "batch_size": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 3 and data["errors"] == 1
+    assert [item["index"] for item in data["results"]] == [0, 1, 2]
+    assert data["results"][0]["result"]["skills"] == ["python"]
+    assert "error" in data["results"][1]
+    assert set(data["results"][2]["result"]["skills"]) >= {"figma", "photoshop"}
+
+def test_analyze_batch_rejects_out_of_range_parameters():
+    for params in ({"batch_size": 0}, {"n_process": 0}, {"n_process": settings.NLP_MAX_N_PROCESS + 1}):
+        response = client.post("/nlp/analyze/batch", json={"texts": ["Développeur Python."], **params})
+        assert response.status_code == 422
+
+def test_task_pipelines_skip_unused_components():
+    before = nlp_utils.parse_counter.copy()
+    nlp_utils.suggest_cv_improvements(CV_TEXT)
+    nlp_utils.summarize_text(CV_TEXT)
+    assert nlp_utils.parse_counter["sentences"] - before["sentences"] == 2
+    assert nlp_utils.parse_counter["full"] == before["full"]
+    assert "parser" not in nlp_utils.pipelines["sentences"].pipe_names
+
+def test_summary_keeps_document_order():
+    text = "Python est utile. Le chat dort. Python, Docker et Python. Rien. Docker et Python."
+    assert nlp_utils.summarize_text(text) == "Python est utile. Python, Docker et Python. Docker et Python."
+    assert nlp_utils.summarize_text(text, max_sentences=1) == "Python, Docker et Python."
+    assert nlp_utils.summarize_text(text, max_sentences=0) == ""
+    assert nlp_utils.summarize_text("") == ""
@@ -0,0 +1,46 @@
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app import nlp_utils
+from app.nlp_pool import NLPPool, pool
+
+client = TestClient(app)
+
+def test_saturated_pool_returns_503(monkeypatch):
+    monkeypatch.setattr(pool, "_in_flight", pool.capacity)
+    response = client.post("/nlp/skills", json={"text": "Python et Docker"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert client.get("/nlp/pool/metrics").json()["queue_depth"] == pool.max_pending
+
+def test_process_pool_runs_nlp_utils():
+    process_pool = NLPPool(workers=1, max_pending=2)
+    try:
+        future = process_pool.submit("extract_skills", "Python, Docker et Google Analytics")
+        assert sorted(future.result(timeout=60)) == ["docker", "google analytics", "python"]
+        # Le compteur est mis à jour par le callback de fin de tâche
+        deadline = time.monotonic() + 5
+        while process_pool.metrics()["in_flight"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        metrics = process_pool.metrics()
+        assert metrics["mode"] == "process"
+        assert metrics["completed"] == 1 and metrics["in_flight"] == 0
+    finally:
+        process_pool.shutdown()
+
+def test_broken_process_pool_is_rebuilt(monkeypatch):
+    # Les workers sont créés par fork : ils héritent de cette fonction
+    monkeypatch.setattr(nlp_utils, "crash_worker", lambda: os._exit(1), raising=False)
+    process_pool = NLPPool(workers=1, max_pending=2)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            asyncio.run(process_pool.run("crash_worker"))
+        assert asyncio.run(process_pool.run("extract_skills", "Python")) == ["python"]
+        assert process_pool.metrics()["restarts"] == 1
+    finally:
+        process_pool.shutdown()
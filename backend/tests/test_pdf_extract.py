@@ -0,0 +1,83 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.pdf_extract import BACKENDS, PDFExtractor, extract_pages
+from benchmarks.pdf_corpus import build_pdf, cv_pages
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def document():
+    pages = cv_pages(6, seed=3)
+    return build_pdf(pages), pages
+
+
+def test_backends_extract_the_same_lines(document):
+    content, pages = document
+    for backend in BACKENDS:
+        texts = extract_pages(io.BytesIO(content), backend, 1, 3)
+        assert [text.split("\n") for text in texts] == pages[1:3], backend
+
+
+def test_parallel_extraction_keeps_page_order(document):
+    content, pages = document
+    extractor = PDFExtractor(workers=2, parallel_min_pages=2)
+    try:
+        assert extractor.extract(io.BytesIO(content)) == "\n".join("\n".join(lines) for lines in pages)
+    finally:
+        extractor.shutdown()
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_page_cap_and_early_stop(document, workers):
+    content, pages = document
+    extractor = PDFExtractor(max_pages=4, workers=workers, parallel_min_pages=2)
+    try:
+        assert extractor.extract(io.BytesIO(content)).count("\n") == sum(len(lines) for lines in pages[:4]) - 1
+        first_page = len("\n".join(pages[0]))
+        text = extractor.extract(io.BytesIO(content), stop_chars=first_page + 1)
+        assert text == "\n".join("\n".join(lines) for lines in pages[:2])
+    finally:
+        extractor.shutdown()
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        PDFExtractor(backend="ocr")
+
+
+CONCURRENT_EXTRACTION = """
+import io
+import threading
+from app.pdf_extract import PDFExtractor
+from benchmarks.pdf_corpus import build_pdf, cv_pages
+
+content = build_pdf(cv_pages(40, seed=1))
+expected = PDFExtractor().extract(io.BytesIO(content))
+mismatches = []
+
+def extract():
+    for _ in range(5):
+        if PDFExtractor().extract(io.BytesIO(content)) != expected:
+            mismatches.append(1)
+
+threads = [threading.Thread(target=extract) for _ in range(8)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+assert not mismatches
+"""
+
+
+def test_concurrent_extractions_from_threads_do_not_crash():
+    # Dans un sous-processus : un accès concurrent à PDFium termine l'interpréteur (segfault)
+    for _ in range(3):
+        result = subprocess.run([sys.executable, "-c", CONCURRENT_EXTRACTION], cwd=BACKEND_DIR,
+                                env={**os.environ, "PYTHONPATH": BACKEND_DIR}, capture_output=True, timeout=120)
+        assert result.returncode == 0, result.stderr.decode()[-2000:]
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import logging
+
+import pytest
+
+from app.response_cache import ResponseCache
+from app import nlp_utils
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_concurrent_requests_share_one_call():
+    cache = ResponseCache(maxsize=10, ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return ["HTML", "CSS"]
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_compute_async("développeur web", compute) for _ in range(50)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(result == ["HTML", "CSS"] for result in results)
+    assert cache.metrics()["coalesced"] + cache.metrics()["misses"] == 50
+
+def test_lru_eviction_and_errors_not_cached():
+    cache = ResponseCache(maxsize=2, ttl=60)
+
+    async def value(result):
+        return result
+
+    async def failing():
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        for key in "abc":
+            await cache.get_or_compute_async(key, lambda key=key: value(key.upper()))
+        assert len(cache) == 2 and cache.metrics()["evictions"] == 1
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute_async("d", failing)
+        assert await cache.get_or_compute_async("d", lambda: value("D")) == "D"
+
+    asyncio.run(scenario())
+
+def test_suggest_skills_uses_normalized_title(monkeypatch):
+    calls = []
+
+    async def generate(job_title):
+        calls.append(job_title)
+        await asyncio.sleep(0.05)
+        return ["HTML", "CSS"]
+
+    async def scenario():
+        titles = ["Développeur Web", "  developpeur   web "] * 25
+        return await asyncio.gather(*(nlp_utils.suggest_skills_for_job(title) for title in titles))
+
+    nlp_utils.skill_suggestions_cache.clear()
+    monkeypatch.setattr(nlp_utils, "_generate_job_skills", generate)
+    assert all(skills == ["HTML", "CSS"] for skills in asyncio.run(scenario()))
+    assert len(calls) == 1
+
+def test_async_stale_refresh_and_errors(caplog):
+    clock = FakeClock()
+    cache = ResponseCache(maxsize=10, ttl=10, stale_ttl=100, clock=clock)
+
+    async def value(result):
+        return result
+
+    async def failing():
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        assert await cache.get_or_compute_async("key", lambda: value("v1")) == "v1"
+        clock.now = 50
+        assert await cache.get_or_compute_async("key", lambda: value("v2")) == "v1"
+        await asyncio.sleep(0.01)
+        clock.now = 60
+        with caplog.at_level(logging.WARNING, logger="smartcv.llm"):
+            assert await cache.get_or_compute_async("key", failing) == "v2"
+            await asyncio.sleep(0.01)
+        assert json.loads(caplog.records[-1].getMessage())["event"] == "llm_cache_refresh_error"
+        # Au-delà de la période de grâce, la valeur est recalculée immédiatement
+        clock.now = 500
+        assert await cache.get_or_compute_async("key", lambda: value("v4")) == "v4"
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute_async("other", failing)
+
+    asyncio.run(scenario())
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.skill_index import SkillEmbedder, SkillIndex
+from app import nlp_utils
+
+SKILLS = ["React", "SQL", "Project Management", "Photoshop", "Java"]
+embedder = SkillEmbedder(nlp_utils.nlp.vocab)
+
+def test_nearest_is_batched_and_thresholded():
+    index = SkillIndex.build(SKILLS, embedder)
+    results = index.nearest(["ReactJS", "PostgreSQL", "management", "JavaScript"], k=2, threshold=0.6)
+    assert results[0][0][0] == "react"
+    assert results[1][0][0] == "sql"
+    # Un mot seul ne correspond pas à une compétence de plusieurs mots
+    assert results[2] == []
+    assert "java" not in [skill for skill, _ in results[3]]
+
+def test_load_uses_mmap_and_rebuilds_on_change(tmp_path):
+    path = str(tmp_path / "skills.npy")
+    built = SkillIndex.load(path, SKILLS, embedder)
+    loaded = SkillIndex.load(path, SKILLS, embedder)
+    assert isinstance(loaded.matrix, np.memmap)
+    assert np.allclose(loaded.matrix, built.matrix)
+
+    changed = SkillIndex.load(path, SKILLS + ["Figma"], embedder)
+    assert not isinstance(changed.matrix, np.memmap)
+    assert changed.skills[-1] == "figma"
+
+def test_similar_skills_in_matching():
+    result = nlp_utils.compare_with_job_offers(["ReactJS", "Python"], "Développeur web")
+    assert result["similar_skills"] == {"ReactJS": "React"}
+    assert "React" not in result["missing_skills"]
+
+def test_extracted_skills_stay_exact():
+    # Les variantes proches sont indiquées à part et ne comptent pas comme compétences
+    context = nlp_utils.AnalysisContext("Expert ReactJS depuis 2018.")
+    assert "react" not in nlp_utils.extract_skills(context.text, context)
+    assert context.similar_skills.get("reactjs") == "react"
+    text = "Pythonista passionné, illustrations, marketplace SQLite, dockerfile, figmatic."
+    assert not {"python", "illustrator", "marketing", "sql", "docker", "figma"} & set(nlp_utils.extract_skills(text))
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    path = str(tmp_path / "skills.npy")
+    index = SkillIndex.build(SKILLS, embedder)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: index.save(path), range(8)))
+    assert np.allclose(SkillIndex.load(path, SKILLS, embedder).matrix, index.matrix)
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_load_never_pairs_a_matrix_with_another_fingerprint(tmp_path):
+    path = str(tmp_path / "skills.npy")
+    first = SkillIndex.load(path, SKILLS, embedder)
+    old_json = (tmp_path / "skills.npy.json").read_text(encoding="utf-8")
+    # Un autre worker enregistre des compétences en même nombre pendant qu'un
+    # troisième lit encore l'ancien JSON
+    SkillIndex.load(path, ["Figma", "Excel", "Docker", "Python", "Scrum"], embedder)
+    (tmp_path / "skills.npy.json").write_text(old_json, encoding="utf-8")
+    loaded = SkillIndex.load(path, SKILLS, embedder)
+    assert np.allclose(loaded.matrix, first.matrix)
+    assert len(list(tmp_path.glob("skills.*.npy"))) == 1
@@ -0,0 +1,26 @@
+import re
+
+from app.skill_matcher import SkillMatcher
+
+SKILLS = ["python", "java", "javascript", "node.js", "sql", "nosql", "google analytics", "adobe xd"]
+
+def regex_find(text):
+    text_lower = text.lower()
+    return [skill for skill in SKILLS if re.search(r'\b' + re.escape(skill) + r'\b', text_lower)]
+
+def test_multi_word_skills():
+    matcher = SkillMatcher(SKILLS)
+    assert matcher.find("Suivi Google Analytics et maquettes Adobe XD") == ["google analytics", "adobe xd"]
+
+def test_word_boundaries():
+    matcher = SkillMatcher(SKILLS)
+    # "java" ne doit pas être trouvé dans "javascript", ni "sql" dans "nosql"
+    assert matcher.find("JavaScript, NoSQL") == ["javascript", "nosql"]
+    assert matcher.find("pythonista") == []
+    # Sans frontières de mot : toute sous-chaîne
+    assert SkillMatcher(SKILLS, word_boundaries=False).find("pythonista") == ["python"]
+
+def test_same_results_as_regex():
+    matcher = SkillMatcher(SKILLS)
+    for text in ["Node.js/SQL", "python3 java_8 sql,", "google analyticsx adobe xd.", ""]:
+        assert matcher.find(text) == regex_find(text)
@@ -0,0 +1,55 @@
+import json
+import os
+
+from app.taxonomy import JobTaxonomy, TaxonomyStore, fold_text
+from app import nlp_utils
+
+DATA = {
+    "version": "test-1",
+    "generic": {"market_skills": ["Communication"], "core_skills": ["Organisation"]},
+    "jobs": [
+        {"title": "développeur", "market_skills": ["Python", "Git"], "core_skills": ["Python"]},
+        {"title": "développeur web", "market_skills": ["HTML", "CSS"], "core_skills": ["HTML"]},
+    ],
+}
+
+def test_fold_text():
+    assert fold_text("  Développeur   Équipe ") == "developpeur equipe"
+
+def test_resolve_prefers_most_specific_title():
+    taxonomy = JobTaxonomy(DATA)
+    assert taxonomy.resolve("Développeur Web senior").title == "développeur web"
+    assert taxonomy.resolve("developpeur backend").title == "développeur"
+    assert taxonomy.resolve("comptable") is None
+    assert taxonomy.core_skills("comptable") == ["Organisation"]
+
+def test_resolve_handles_plurals_and_compound_titles():
+    taxonomy = JobTaxonomy(dict(DATA, jobs=DATA["jobs"] + [
+        {"title": "designer", "core_skills": ["Figma"]},
+        {"title": "data scientist", "core_skills": ["Statistiques"]},
+    ]))
+    assert taxonomy.resolve("Designers").title == "designer"
+    assert taxonomy.resolve("Webdesigner freelance").title == "designer"
+    assert taxonomy.resolve("Data Scientists").title == "data scientist"
+    assert taxonomy.resolve("Développeurs Web").title == "développeur web"
+
+def test_compare_with_job_offers_ignores_case_and_accents():
+    result = nlp_utils.compare_with_job_offers(["python", "DOCKER", "Statistiques"], "Data Scientist")
+    assert result["matching_skills"] == ["python", "Statistiques"]
+    assert "Python" not in result["missing_skills"]
+    assert result["match_score"] == 2 / 7
+
+def test_store_reloads_changed_file(tmp_path):
+    path = tmp_path / "taxonomy.json"
+    path.write_text(json.dumps(DATA), encoding="utf-8")
+    store = TaxonomyStore(str(path), check_interval=0)
+    assert store.get().version == "test-1"
+
+    path.write_text(json.dumps(dict(DATA, version="test-2")), encoding="utf-8")
+    os.utime(path, (1, 1))
+    assert store.get().version == "test-2"
+
+    # Un fichier invalide ne remplace pas la version en service
+    path.write_text("{", encoding="utf-8")
+    os.utime(path, (2, 2))
+    assert store.get().version == "test-2"
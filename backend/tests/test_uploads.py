@@ -0,0 +1,168 @@
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import docx
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app import nlp_utils
+from app.config import settings
+from app.uploads import UploadLimitMiddleware
+from benchmarks.pdf_corpus import build_pdf
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def spooled_upload(content: bytes, filename: str) -> UploadFile:
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(content)
+    spool.seek(0)
+    return UploadFile(spool, filename=filename, headers=Headers({"content-type": "application/octet-stream"}))
+
+
+def test_pdf_pages_are_joined_once():
+    upload = spooled_upload(build_pdf(["Experience Python", "Formation Master"]), "cv.pdf")
+    text = asyncio.run(nlp_utils.extract_text_from_pdf(upload))
+    assert text == "Experience Python\nFormation Master"
+
+
+def test_docx_is_read_from_the_spooled_file():
+    document = docx.Document()
+    document.add_paragraph("Compétences")
+    document.add_paragraph("Python, SQL")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    upload = spooled_upload(buffer.getvalue(), "cv.docx")
+    assert asyncio.run(nlp_utils.extract_text_from_docx(upload)) == "Compétences\nPython, SQL"
+
+
+# Envoie un PDF en multipart à POST /cv/import (application ASGI complète, corps
+# lu par morceaux depuis le disque), exécute le job d'import puis affiche
+# l'augmentation du pic de mémoire résidente du processus, mémoire native de
+# PDFium comprise
+UPLOAD_RSS = r"""
+import asyncio, json, os, resource, sys
+from types import SimpleNamespace
+
+from app import models
+from app.auth import get_current_user
+from app.database import engine
+from app.import_jobs import import_jobs
+from app.main import app
+
+BOUNDARY = b"smartcv-test-boundary"
+
+
+def peak_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def reset_peak_rss():
+    # Le pic repart de la mémoire résidente actuelle (Linux) : le chargement
+    # des modèles ne masque pas la mémoire utilisée par l'import
+    with open("/proc/self/clear_refs", "w") as handle:
+        handle.write("5")
+
+
+def multipart(path):
+    yield (b"--" + BOUNDARY + b'\r\nContent-Disposition: form-data; name="file"; filename="cv.pdf"\r\n'
+           b"Content-Type: application/pdf\r\n\r\n")
+    with open(path, "rb") as source:
+        yield from iter(lambda: source.read(256 * 1024), b"")
+    yield b"\r\n--" + BOUNDARY + b"--\r\n"
+
+
+async def upload(path):
+    length = sum(len(chunk) for chunk in multipart(path))
+    parts, response = multipart(path), {}
+
+    async def receive():
+        chunk = next(parts, b"")
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunk)}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] = response.get("body", b"") + message.get("body", b"")
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "scheme": "http", "path": "/cv/import", "raw_path": b"/cv/import", "root_path": "",
+             "query_string": b"", "client": ("127.0.0.1", 1), "server": ("testserver", 80),
+             "headers": [(b"host", b"testserver"), (b"content-length", str(length).encode()),
+                         (b"content-type", b"multipart/form-data; boundary=" + BOUNDARY)]}
+    await app(scope, receive, send)
+    await import_jobs.run_pending()
+    return response["status"], json.loads(response["body"])["id"]
+
+
+models.Base.metadata.create_all(engine)
+app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+# Premier import (petit fichier) : modèles et bibliothèques chargés avant la mesure
+asyncio.run(upload(sys.argv[1]))
+reset_peak_rss()
+before = peak_rss()
+status, job_id = asyncio.run(upload(sys.argv[2]))
+growth = peak_rss() - before
+with import_jobs.session_factory() as db:
+    imported = db.get(models.ImportJob, job_id)
+    text = db.get(models.CV, imported.cv_id).data if imported.cv_id else None
+    print(json.dumps({"status": status, "job": imported.status, "text": text, "growth": growth}))
+"""
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/clear_refs"), reason="remise à zéro du pic de mémoire (Linux)")
+def test_peak_memory_of_a_50mb_upload_stays_bounded(tmp_path):
+    small, large = tmp_path / "small.pdf", tmp_path / "large.pdf"
+    small.write_bytes(build_pdf(["Experience Python"]))
+    large.write_bytes(build_pdf(["Experience Python"], padding=50 * 1024 * 1024))
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR, DATABASE_URL=f"sqlite:///{tmp_path / 'smartcv.db'}",
+               IMPORT_DIR=str(tmp_path / "imports"), UPLOAD_MAX_BYTES=str(100 * 1024 * 1024), NLP_POOL_WORKERS="0")
+    completed = subprocess.run([sys.executable, "-c", UPLOAD_RSS, str(small), str(large)], env=env, cwd=str(tmp_path),
+                               capture_output=True, text=True, timeout=300)
+    assert completed.returncode == 0, completed.stderr
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    assert (result["status"], result["job"], result["text"]) == (202, "succeeded", "Experience Python")
+    # Le fichier reste sur disque de la réception à l'extraction : ni lecture
+    # complète, ni copie en mémoire (le fichier fait 50 Mo)
+    assert result["growth"] < 15 * 1024 * 1024
+
+
+def test_oversized_upload_is_rejected_from_content_length(user_client):
+    body = b"\0" * (settings.UPLOAD_MAX_BYTES + 1)
+    response = user_client.post("/cv/import", files={"file": ("cv.pdf", body, "application/pdf")})
+    assert response.status_code == 413
+
+
+def test_chunked_upload_is_interrupted_once_over_the_limit():
+    received = []
+
+    async def endpoint(scope, receive, send):
+        while (await receive()).get("more_body"):
+            pass
+
+    async def scenario():
+        chunks = [{"type": "http.request", "body": b"x" * 1000, "more_body": True} for _ in range(100)]
+
+        async def receive():
+            received.append(True)
+            return chunks.pop(0)
+
+        async def send(message):
+            pass
+
+        scope = {"type": "http", "path": "/cv/import", "headers": []}
+        try:
+            await UploadLimitMiddleware(endpoint, {"/cv/import": 5000})(scope, receive, send)
+        except Exception as e:
+            return e
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 413
+    assert len(received) == 6